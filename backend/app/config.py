@@ -14,10 +14,20 @@ def _split_csv(value: str | None) -> list[str]:
     return [item.strip() for item in value.split(",") if item.strip()]
 
 
+def _int_map(value: str | None, defaults: dict[str, int]) -> dict[str, int]:
+    mapping = dict(defaults)
+    for item in _split_csv(value):
+        key, _, number = item.partition("=")
+        if key.strip() and number.strip().isdigit():
+            mapping[key.strip()] = int(number)
+    return mapping
+
+
 @dataclass(frozen=True)
 class Settings:
     app_name: str = "Quilr Onboarding"
     database_path: str = os.environ.get("DATABASE_PATH", "backend/app.db")
+    sqlite_busy_timeout_ms: int = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
     cors_origins: list[str] = field(
         default_factory=lambda: _split_csv(os.environ.get("CORS_ORIGINS"))
     )
@@ -48,16 +58,81 @@ class Settings:
     tenant_cache_ttl_seconds: int = int(
         os.environ.get("TENANT_CACHE_TTL_SECONDS", "900")
     )
+    tenant_updated_at_column: str = os.environ.get("TENANT_UPDATED_AT_COLUMN", "")
+    tenant_incremental_sync: bool = _as_bool(os.environ.get("TENANT_INCREMENTAL_SYNC", "true"))
+    tenant_full_sync_seconds: int = int(os.environ.get("TENANT_FULL_SYNC_SECONDS", "86400"))
+    tenant_scan_partitions: int = int(os.environ.get("TENANT_SCAN_PARTITIONS", "1"))
+    tenant_staging_stale_seconds: int = int(
+        os.environ.get("TENANT_STAGING_STALE_SECONDS", "3600")
+    )
+    tenant_notify_channel: str = os.environ.get("TENANT_NOTIFY_CHANNEL", "")
+    tenant_notify_reconnect_seconds: int = int(
+        os.environ.get("TENANT_NOTIFY_RECONNECT_SECONDS", "30")
+    )
     internal_user_cache_ttl_seconds: int = int(
         os.environ.get("INTERNAL_USER_CACHE_TTL_SECONDS", "300")
     )
+    internal_user_defaults_cache_ttl_seconds: int = int(
+        os.environ.get("INTERNAL_USER_DEFAULTS_CACHE_TTL_SECONDS", "900")
+    )
+    pg_pool_size: int = int(os.environ.get("PG_POOL_SIZE", "5"))
+    pg_prepared_statements: bool = _as_bool(os.environ.get("PG_PREPARED_STATEMENTS", "true"))
+    # per query class, in milliseconds; 0 disables the timeout
+    pg_statement_timeouts_ms: dict[str, int] = field(
+        default_factory=lambda: _int_map(
+            os.environ.get("PG_STATEMENT_TIMEOUTS_MS"),
+            {"tenant_scan": 120000, "user_list": 15000, "defaults": 5000, "write": 15000},
+        )
+    )
+    pg_lock_timeouts_ms: dict[str, int] = field(
+        default_factory=lambda: _int_map(
+            os.environ.get("PG_LOCK_TIMEOUTS_MS"),
+            {"tenant_scan": 5000, "user_list": 5000, "defaults": 5000, "write": 5000},
+        )
+    )
+    pg_replica_lag_tolerance_seconds: int = int(
+        os.environ.get("PG_REPLICA_LAG_TOLERANCE_SECONDS", "30")
+    )
+    pg_replica_retry_seconds: int = int(os.environ.get("PG_REPLICA_RETRY_SECONDS", "60"))
+    pg_fetch_itersize: int = int(os.environ.get("PG_FETCH_ITERSIZE", "2000"))
+    schema_cache_ttl_seconds: int = int(os.environ.get("SCHEMA_CACHE_TTL_SECONDS", "3600"))
     connection_timeout_seconds: int = int(
         os.environ.get("CONNECTION_TIMEOUT_SECONDS", "30")
     )
+    neo4j_pool_size: int = int(os.environ.get("NEO4J_POOL_SIZE", "10"))
+    neo4j_acquisition_timeout_seconds: int = int(
+        os.environ.get("NEO4J_ACQUISITION_TIMEOUT_SECONDS", "30")
+    )
+    neo4j_liveness_check_seconds: int = int(
+        os.environ.get("NEO4J_LIVENESS_CHECK_SECONDS", "60")
+    )
+    neo4j_batch_size: int = int(os.environ.get("NEO4J_BATCH_SIZE", "500"))
+    neo4j_outbox_enabled: bool = _as_bool(os.environ.get("NEO4J_OUTBOX_ENABLED", "true"))
+    neo4j_outbox_poll_seconds: int = int(os.environ.get("NEO4J_OUTBOX_POLL_SECONDS", "5"))
+    neo4j_outbox_max_attempts: int = int(
+        os.environ.get("NEO4J_OUTBOX_MAX_ATTEMPTS", "8")
+    )
+    neo4j_outbox_backoff_seconds: int = int(
+        os.environ.get("NEO4J_OUTBOX_BACKOFF_SECONDS", "5")
+    )
+    neo4j_outbox_backoff_max_seconds: int = int(
+        os.environ.get("NEO4J_OUTBOX_BACKOFF_MAX_SECONDS", "900")
+    )
+    neo4j_outbox_lease_seconds: int = int(
+        os.environ.get("NEO4J_OUTBOX_LEASE_SECONDS", "300")
+    )
+    neo4j_outbox_retention_hours: int = int(
+        os.environ.get("NEO4J_OUTBOX_RETENTION_HOURS", "24")
+    )
+    bcrypt_workers: int = int(
+        os.environ.get("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+    bcrypt_rounds: int = int(os.environ.get("BCRYPT_ROUNDS", "12"))
     bff_timeout_seconds: int = int(os.environ.get("BFF_TIMEOUT_SECONDS", "30"))
     bff_verify_ssl: bool = _as_bool(os.environ.get("BFF_VERIFY_SSL", "true"))
     bff_ca_bundle: str | None = os.environ.get("BFF_CA_BUNDLE")
     bff_tls_version: str | None = os.environ.get("BFF_TLS_VERSION")
+    bff_health_window: int = int(os.environ.get("BFF_HEALTH_WINDOW", "200"))
     default_role_names: list[str] = field(
         default_factory=lambda: _split_csv(os.environ.get("DEFAULT_ROLE_NAMES"))
     )
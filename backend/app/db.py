@@ -1,12 +1,17 @@
 import sqlite3
+from datetime import datetime, timedelta, timezone
 from typing import Iterator
 
 from .config import settings
 
 
 def init_db() -> None:
-    conn = sqlite3.connect(settings.database_path)
+    conn = sqlite3.connect(
+        settings.database_path, timeout=settings.sqlite_busy_timeout_ms / 1000
+    )
     try:
+        # readers keep working while a sync writes; the mode is stored in the file
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS instances (
@@ -23,6 +28,9 @@ def init_db() -> None:
                 neo4j_port TEXT,
                 neo4j_user TEXT,
                 neo4j_password TEXT,
+                pg_scan_partitions INTEGER,
+                pg_replica_host TEXT,
+                pg_replica_port TEXT,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL
             )
@@ -59,6 +67,34 @@ def init_db() -> None:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tenant_cache_staging (
+                sync_id TEXT NOT NULL,
+                instance_id TEXT NOT NULL,
+                match_value TEXT NOT NULL,
+                tenant_id TEXT,
+                tenant_name TEXT,
+                subscriber TEXT,
+                fetched_at TEXT NOT NULL,
+                staged_at TEXT NOT NULL,
+                PRIMARY KEY (sync_id, match_value)
+            )
+            """
+        )
+        # syncs that died with their process; another worker may still be filling its own
+        stale = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.tenant_staging_stale_seconds
+        )
+        conn.execute(
+            """
+            DELETE FROM tenant_cache_staging WHERE sync_id IN (
+                SELECT sync_id FROM tenant_cache_staging
+                GROUP BY sync_id HAVING MAX(staged_at) < ?
+            )
+            """,
+            (stale.isoformat(),),
+        )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS internal_user_cache (
@@ -74,6 +110,32 @@ def init_db() -> None:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tenant_sync_state (
+                instance_id TEXT PRIMARY KEY,
+                watermark TEXT,
+                watermark_column TEXT NOT NULL DEFAULT '',
+                last_full_sync_at TEXT,
+                last_sync_at TEXT,
+                changed INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS internal_user_defaults_cache (
+                instance_id TEXT NOT NULL,
+                tenant_id TEXT NOT NULL,
+                subscriber TEXT NOT NULL,
+                account_type TEXT NOT NULL,
+                names_key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (instance_id, tenant_id, subscriber, account_type)
+            )
+            """
+        )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS customer_comments (
@@ -99,6 +161,41 @@ def init_db() -> None:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS neo4j_push_state (
+                instance_id TEXT NOT NULL,
+                customer_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                pushed_at TEXT NOT NULL,
+                PRIMARY KEY (instance_id, customer_id)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS neo4j_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                instance_id TEXT NOT NULL,
+                customer_id TEXT NOT NULL,
+                action TEXT NOT NULL,
+                force INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at TEXT NOT NULL,
+                lease_until TEXT,
+                last_error TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_neo4j_outbox_pending
+            ON neo4j_outbox (status, instance_id, next_attempt_at)
+            """
+        )
         _ensure_instance_columns(conn)
         _ensure_customer_columns(conn)
         _ensure_customer_comment_columns(conn)
@@ -119,6 +216,9 @@ def _ensure_instance_columns(conn: sqlite3.Connection) -> None:
         "neo4j_port": "neo4j_port TEXT",
         "neo4j_user": "neo4j_user TEXT",
         "neo4j_password": "neo4j_password TEXT",
+        "pg_scan_partitions": "pg_scan_partitions INTEGER",
+        "pg_replica_host": "pg_replica_host TEXT",
+        "pg_replica_port": "pg_replica_port TEXT",
     }
     for name, ddl in columns.items():
         if name not in existing:
@@ -163,9 +263,18 @@ def _ensure_internal_user_cache_columns(conn: sqlite3.Connection) -> None:
         )
 
 
-def get_db() -> Iterator[sqlite3.Connection]:
-    conn = sqlite3.connect(settings.database_path, check_same_thread=False)
+def connect_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        settings.database_path,
+        check_same_thread=False,
+        timeout=settings.sqlite_busy_timeout_ms / 1000,
+    )
     conn.row_factory = sqlite3.Row
+    return conn
+
+
+def get_db() -> Iterator[sqlite3.Connection]:
+    conn = connect_db()
     try:
         yield conn
     finally:
@@ -0,0 +1,91 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+
+def hash_password(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode(
+        "utf-8"
+    )
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded process pool so hashing stays off request workers."""
+
+    def __init__(self, workers: int, rounds: int) -> None:
+        self._workers = workers
+        self._rounds = rounds
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | ThreadPoolExecutor | None = None
+        self._queued = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_ms = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor | ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                if self._workers > 0:
+                    # spawn keeps forked children from inheriting server threads and locks
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self._workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="bcrypt"
+                    )
+            return self._executor
+
+    def submit(self, password: str, rounds: int | None = None) -> Future:
+        started = time.perf_counter()
+        future = self._get_executor().submit(
+            hash_password, password, rounds or self._rounds
+        )
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        def _done(done: Future) -> None:
+            with self._lock:
+                self._queued -= 1
+                if done.cancelled() or done.exception() is not None:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+                    self._total_ms += (time.perf_counter() - started) * 1000
+
+        future.add_done_callback(_done)
+        return future
+
+    async def hash_async(self, password: str, rounds: int | None = None) -> str:
+        return await asyncio.wrap_future(self.submit(password, rounds))
+
+    def hash(self, password: str, rounds: int | None = None) -> str:
+        return self.submit(password, rounds).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self._workers,
+                "rounds": self._rounds,
+                "mode": "process" if self._workers > 0 else "thread",
+                "queue_depth": self._queued,
+                "peak_queue_depth": self._peak_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_ms": round(self._total_ms / self._completed, 2)
+                if self._completed
+                else None,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
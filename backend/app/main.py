@@ -1,24 +1,39 @@
-from datetime import datetime, timezone
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+import hashlib
 import json
+import logging
+import re
+import select
+import threading
+import time
+from typing import Callable, Iterator
 from uuid import uuid4
 
 from fastapi import Depends, FastAPI, HTTPException, status, Query
-import bcrypt
 import psycopg2
-from psycopg2 import sql
+import psycopg2.extensions
+from psycopg2 import pool, sql
+from psycopg2.extras import execute_values
 import socket
 import requests
 import ssl
 from requests.adapters import HTTPAdapter
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 from neo4j import GraphDatabase
+from neo4j.exceptions import AuthError, DriverError, Neo4jError
 
 from .auth import callback, create_session_from_id_token, login, require_user
 from .config import settings
-from .db import get_db, init_db
+from .db import connect_db, get_db, init_db
+from .hashing import PasswordHasher
 from .schemas import (
     CustomerCommentCreate,
     CustomerCommentOut,
@@ -26,6 +41,10 @@ from .schemas import (
     CustomerCreate,
     CustomerOut,
     CustomerUpdate,
+    InternalUserBulkCreate,
+    InternalUserBulkItem,
+    InternalUserBulkOut,
+    InternalUserBulkResult,
     InternalUserOut,
     InternalUserCreate,
     InternalUserPasswordUpdate,
@@ -43,7 +62,78 @@ from .schemas import (
 )
 
 app = FastAPI(title=settings.app_name)
-LAST_BFF_ERROR: dict | None = None
+logger = logging.getLogger(__name__)
+
+
+class BffHealthTracker:
+    """Per-instance ring buffer of recent BFF call outcomes."""
+
+    def __init__(self, window: int) -> None:
+        self._window = max(window, 1)
+        self._lock = threading.Lock()
+        self._calls: dict[str, deque] = {}
+        self._totals: dict[str, dict] = {}
+        self._last_error: dict[str, dict] = {}
+        self._last_instance_id: str | None = None
+
+    def record(
+        self, instance_id: str | None, ok: bool, latency_ms: float, detail: str | None = None
+    ) -> None:
+        key = instance_id or "unknown"
+        at = utc_now()
+        with self._lock:
+            calls = self._calls.setdefault(key, deque(maxlen=self._window))
+            calls.append({"ok": ok, "latency_ms": latency_ms, "at": at})
+            totals = self._totals.setdefault(key, {"calls": 0, "errors": 0})
+            totals["calls"] += 1
+            if not ok:
+                totals["errors"] += 1
+                self._last_error[key] = {"detail": detail, "at": at}
+            self._last_instance_id = key
+
+    def latest_error(self, instance_id: str | None = None) -> dict | None:
+        with self._lock:
+            key = instance_id or self._last_instance_id
+            calls = self._calls.get(key or "")
+            if not calls or calls[-1]["ok"]:
+                return None
+            return dict(self._last_error.get(key) or {})
+
+    def snapshot(self, instance_id: str | None = None) -> dict[str, dict]:
+        with self._lock:
+            keys = [instance_id] if instance_id else list(self._calls.keys())
+            return {
+                key: self._summarize(key)
+                for key in keys
+                if key in self._calls
+            }
+
+    def _summarize(self, key: str) -> dict:
+        calls = list(self._calls[key])
+        latencies = sorted(call["latency_ms"] for call in calls)
+        errors = sum(1 for call in calls if not call["ok"])
+        return {
+            "window": len(calls),
+            "error_rate": round(errors / len(calls), 4) if calls else 0.0,
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "total_calls": self._totals[key]["calls"],
+            "total_errors": self._totals[key]["errors"],
+            "last_call_at": calls[-1]["at"] if calls else None,
+            "last_error": self._last_error.get(key),
+        }
+
+
+def _percentile(sorted_values: list[float], pct: int) -> float | None:
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return round(sorted_values[min(rank, len(sorted_values) - 1)], 2)
+
+
+bff_health = BffHealthTracker(settings.bff_health_window)
+password_hasher = PasswordHasher(settings.bcrypt_workers, settings.bcrypt_rounds)
 
 
 class TLSAdapter(HTTPAdapter):
@@ -101,10 +191,35 @@ def utc_now() -> str:
 
 
 @app.get("/api/bff-error")
-def get_bff_error(user: dict = Depends(require_user)) -> dict:
-    if not LAST_BFF_ERROR:
+def get_bff_error(
+    instance_id: str | None = Query(None), user: dict = Depends(require_user)
+) -> dict:
+    error = bff_health.latest_error(instance_id)
+    if not error:
         return {"detail": None, "at": None}
-    return LAST_BFF_ERROR
+    return error
+
+
+@app.get("/api/bff-health")
+def get_bff_health(
+    instance_id: str | None = Query(None), user: dict = Depends(require_user)
+) -> dict:
+    return {"instances": bff_health.snapshot(instance_id)}
+
+
+@app.get("/api/postgres/queries")
+def get_postgres_query_stats(user: dict = Depends(require_user)) -> dict:
+    return {
+        "prepared_statements": settings.pg_prepared_statements,
+        "templates": queries.stats(),
+        "timeouts": postgres_timeouts.stats(),
+        "routing": postgres_pools.stats(),
+    }
+
+
+@app.get("/api/password-hasher")
+def get_password_hasher_stats(user: dict = Depends(require_user)) -> dict:
+    return password_hasher.stats()
 
 
 def _row_to_dict(row) -> dict:
@@ -234,15 +349,163 @@ def _auto_save_tenant_as_customer(tenant: dict, instance_id: str, db) -> dict:
     }
 
 
-def _push_customer_to_neo4j(
+class Neo4jDriverRegistry:
+    """Long-lived Neo4j drivers keyed by instance id."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._drivers: dict[str, tuple[tuple, object]] = {}
+        self._schema_ready: set[str] = set()
+
+    def get(self, instance: dict):
+        host = instance.get("neo4j_host")
+        user = instance.get("neo4j_user")
+        password = instance.get("neo4j_password")
+        port = instance.get("neo4j_port") or 7687
+        if not host or not user or not password:
+            raise HTTPException(status_code=400, detail="Neo4j credentials are missing.")
+        fingerprint = (host, str(port), user, password)
+        key = instance.get("id") or f"{host}:{port}"
+        with self._lock:
+            entry = self._drivers.get(key)
+            if entry and entry[0] == fingerprint:
+                return entry[1]
+            if entry:
+                entry[1].close()
+            driver = GraphDatabase.driver(
+                f"bolt://{host}:{port}",
+                auth=(user, password),
+                max_connection_pool_size=settings.neo4j_pool_size,
+                connection_acquisition_timeout=float(
+                    settings.neo4j_acquisition_timeout_seconds
+                ),
+                connection_timeout=float(settings.connection_timeout_seconds),
+                liveness_check_timeout=float(settings.neo4j_liveness_check_seconds),
+            )
+            self._drivers[key] = (fingerprint, driver)
+            return driver
+
+    def discard(self, instance_id: str) -> None:
+        with self._lock:
+            entry = self._drivers.pop(instance_id, None)
+            self._schema_ready.discard(instance_id)
+        if entry:
+            entry[1].close()
+
+    def is_schema_ready(self, instance_id: str) -> bool:
+        with self._lock:
+            return instance_id in self._schema_ready
+
+    def mark_schema_ready(self, instance_id: str) -> None:
+        with self._lock:
+            self._schema_ready.add(instance_id)
+
+    def close_all(self) -> None:
+        with self._lock:
+            entries = list(self._drivers.values())
+            self._drivers.clear()
+            self._schema_ready.clear()
+        for _, driver in entries:
+            driver.close()
+
+
+neo4j_drivers = Neo4jDriverRegistry()
+
+
+NEO4J_CUSTOMER_MERGE = """
+UNWIND $rows AS row
+MERGE (t:TENANT {id: row.tenant_id, subscriber: row.subscriber, tenant: row.tenant_name})
+ON CREATE SET t.creationTime = $now, t.internalId = randomUUID(), t.new = true, t.timestamp = timestamp()
+ON MATCH SET t.new = false, t.timestamp = timestamp()
+MERGE (i:INSTANCE {id: row.instance_id, subscriber: row.subscriber, tenant: row.tenant_name})
+ON CREATE SET i.creationTime = $now, i.internalId = randomUUID(), i.new = true, i.timestamp = timestamp()
+ON MATCH SET i.new = false, i.timestamp = timestamp()
+MERGE (u:USER {id: row.user_id, subscriber: row.subscriber, tenant: row.tenant_name})
+ON CREATE SET u.displayName = row.display_name, u.givenName = row.first_name, u.surname = row.last_name,
+              u.mail = row.email, u.userPrincipalName = row.email, u.internalId = randomUUID(),
+              u.new = true, u.timestamp = timestamp()
+ON MATCH SET u.displayName = row.display_name, u.givenName = row.first_name, u.surname = row.last_name,
+             u.mail = row.email, u.userPrincipalName = row.email, u.new = false, u.timestamp = timestamp()
+MERGE (e:EMAIL {id: row.email, subscriber: row.subscriber, tenant: row.tenant_name})
+ON CREATE SET e.internalId = randomUUID(), e.new = true, e.timestamp = timestamp()
+ON MATCH SET e.new = false, e.timestamp = timestamp()
+MERGE (d:DEPARTMENT {id: row.department, subscriber: row.subscriber, tenant: row.tenant_name})
+ON CREATE SET d.name = row.department, d.internalId = randomUUID(), d.new = true, d.timestamp = timestamp()
+ON MATCH SET d.name = row.department, d.new = false, d.timestamp = timestamp()
+MERGE (t)-[:HAS_INSTANCE]->(i)
+MERGE (i)-[:HAS_USER]->(u)
+MERGE (u)-[:HAS_EMAIL]->(e)
+MERGE (u)-[:HAS_DEPARTMENT]->(d)
+"""
+
+
+# userdata.SCHEMA_KEYS repeats this list for the standalone ingest script; keep both in step
+NEO4J_SCHEMA_KEYS = [
+    ("onboard_tenant_key", "TENANT", ("id", "subscriber", "tenant")),
+    ("onboard_instance_key", "INSTANCE", ("id", "subscriber", "tenant")),
+    ("onboard_user_key", "USER", ("id", "subscriber", "tenant")),
+    ("onboard_email_key", "EMAIL", ("id", "subscriber", "tenant")),
+    ("onboard_department_key", "DEPARTMENT", ("id", "subscriber", "tenant")),
+    ("onboard_account_key", "ACCOUNT", ("id", "subscriber", "tenant")),
+    ("onboard_application_key", "APPLICATION", ("id_",)),
+]
+
+
+def _bootstrap_neo4j_schema(instance: dict) -> dict:
+    driver = neo4j_drivers.get(instance)
+    try:
+        records, _, _ = driver.execute_query(
+            "SHOW INDEXES YIELD labelsOrTypes, properties", routing_="r"
+        )
+    except AuthError as exc:
+        neo4j_drivers.discard(instance.get("id") or "")
+        raise HTTPException(status_code=400, detail=f"Neo4j schema lookup failed: {exc}")
+    except (Neo4jError, DriverError) as exc:
+        raise HTTPException(status_code=400, detail=f"Neo4j schema lookup failed: {exc}")
+    existing = {
+        (record["labelsOrTypes"][0], tuple(record["properties"]))
+        for record in records
+        if record["labelsOrTypes"] and record["properties"]
+    }
+    missing: list[str] = []
+    created: list[dict] = []
+    failed: list[dict] = []
+    for name, label, properties in NEO4J_SCHEMA_KEYS:
+        if (label, properties) in existing:
+            continue
+        missing.append(name)
+        columns = ", ".join(f"n.{prop}" for prop in properties)
+        statements = [
+            (
+                "constraint",
+                f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+                f"FOR (n:{label}) REQUIRE ({columns}) IS UNIQUE",
+            ),
+            (
+                "index",
+                f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON ({columns})",
+            ),
+        ]
+        last_error: str | None = None
+        for kind, statement in statements:
+            try:
+                driver.execute_query(statement)
+            except (Neo4jError, DriverError) as exc:
+                last_error = str(exc)
+                continue
+            created.append({"name": name, "kind": kind})
+            last_error = None
+            break
+        if last_error:
+            failed.append({"name": name, "detail": last_error})
+    if instance.get("id"):
+        neo4j_drivers.mark_schema_ready(instance["id"])
+    return {"missing": missing, "created": created, "failed": failed}
+
+
+def _neo4j_customer_row(
     instance: dict, customer: dict, tenant_id: str, subscriber: str | None, tenant_name: str
-) -> None:
-    host = instance.get("neo4j_host")
-    user = instance.get("neo4j_user")
-    password = instance.get("neo4j_password")
-    port = instance.get("neo4j_port") or 7687
-    if not host or not user or not password:
-        raise HTTPException(status_code=400, detail="Neo4j credentials are missing.")
+) -> dict:
     department = (customer.get("department") or "Cybersecurity").strip()
     first_name = (customer.get("first_name") or "").strip()
     last_name = (customer.get("last_name") or "").strip()
@@ -255,31 +518,7 @@ def _push_customer_to_neo4j(
     user_id = email or (display_name.replace(" ", ".").lower() if display_name else "")
     if not user_id:
         raise HTTPException(status_code=400, detail="User id could not be derived.")
-    cypher = """
-    MERGE (t:TENANT {id: $tenant_id, subscriber: $subscriber, tenant: $tenant_name})
-    ON CREATE SET t.creationTime = $now, t.internalId = randomUUID(), t.new = true, t.timestamp = timestamp()
-    ON MATCH SET t.new = false, t.timestamp = timestamp()
-    MERGE (i:INSTANCE {id: $instance_id, subscriber: $subscriber, tenant: $tenant_name})
-    ON CREATE SET i.creationTime = $now, i.internalId = randomUUID(), i.new = true, i.timestamp = timestamp()
-    ON MATCH SET i.new = false, i.timestamp = timestamp()
-    MERGE (u:USER {id: $user_id, subscriber: $subscriber, tenant: $tenant_name})
-    ON CREATE SET u.displayName = $display_name, u.givenName = $first_name, u.surname = $last_name,
-                  u.mail = $email, u.userPrincipalName = $email, u.internalId = randomUUID(),
-                  u.new = true, u.timestamp = timestamp()
-    ON MATCH SET u.displayName = $display_name, u.givenName = $first_name, u.surname = $last_name,
-                 u.mail = $email, u.userPrincipalName = $email, u.new = false, u.timestamp = timestamp()
-    MERGE (e:EMAIL {id: $email, subscriber: $subscriber, tenant: $tenant_name})
-    ON CREATE SET e.internalId = randomUUID(), e.new = true, e.timestamp = timestamp()
-    ON MATCH SET e.new = false, e.timestamp = timestamp()
-    MERGE (d:DEPARTMENT {id: $department, subscriber: $subscriber, tenant: $tenant_name})
-    ON CREATE SET d.name = $department, d.internalId = randomUUID(), d.new = true, d.timestamp = timestamp()
-    ON MATCH SET d.name = $department, d.new = false, d.timestamp = timestamp()
-    MERGE (t)-[:HAS_INSTANCE]->(i)
-    MERGE (i)-[:HAS_USER]->(u)
-    MERGE (u)-[:HAS_EMAIL]->(e)
-    MERGE (u)-[:HAS_DEPARTMENT]->(d)
-    """
-    params = {
+    return {
         "tenant_id": tenant_id,
         "tenant_name": tenant_name,
         "subscriber": subscriber or "",
@@ -290,14 +529,457 @@ def _push_customer_to_neo4j(
         "last_name": last_name,
         "email": email,
         "department": department,
-        "now": utc_now(),
     }
-    driver = GraphDatabase.driver(f"bolt://{host}:{port}", auth=(user, password))
+
+
+def _write_neo4j_customer_rows(instance: dict, rows: list[dict]) -> dict:
+    if instance.get("id") and not neo4j_drivers.is_schema_ready(instance["id"]):
+        try:
+            _bootstrap_neo4j_schema(instance)
+        except HTTPException as exc:
+            # the MERGE works without the keys, only slower; the explicit
+            # schema endpoint is where a failed bootstrap should surface
+            logger.warning(
+                "Neo4j schema bootstrap failed for instance %s: %s", instance["id"], exc.detail
+            )
+            neo4j_drivers.mark_schema_ready(instance["id"])
+    driver = neo4j_drivers.get(instance)
+    started = time.perf_counter()
     try:
-        with driver.session() as session:
-            session.run(cypher, params)
-    finally:
-        driver.close()
+        _, summary, _ = driver.execute_query(
+            NEO4J_CUSTOMER_MERGE, {"rows": rows, "now": utc_now()}
+        )
+    except AuthError as exc:
+        neo4j_drivers.discard(instance.get("id") or "")
+        raise HTTPException(status_code=400, detail=f"Neo4j push failed: {exc}")
+    except Neo4jError as exc:
+        raise HTTPException(status_code=400, detail=f"Neo4j push failed: {exc}")
+    except DriverError as exc:
+        raise HTTPException(status_code=503, detail=f"Neo4j push failed: {exc}")
+    # rows share TENANT/INSTANCE/DEPARTMENT nodes, so only created counts are meaningful
+    return {
+        "rows": len(rows),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "nodes_created": summary.counters.nodes_created,
+        "relationships_created": summary.counters.relationships_created,
+    }
+
+
+def _neo4j_row_hash(row: dict) -> str:
+    payload = json.dumps(row, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_neo4j_push_hashes(db, instance_id: str, customer_ids: list[str]) -> dict[str, str]:
+    hashes: dict[str, str] = {}
+    # stays under SQLite's bound-parameter limit
+    for offset in range(0, len(customer_ids), 500):
+        chunk = customer_ids[offset : offset + 500]
+        placeholders = ", ".join(["?"] * len(chunk))
+        rows = db.execute(
+            f"""
+            SELECT customer_id, content_hash FROM neo4j_push_state
+            WHERE instance_id = ? AND customer_id IN ({placeholders})
+            """,
+            (instance_id, *chunk),
+        ).fetchall()
+        hashes.update({row["customer_id"]: row["content_hash"] for row in rows})
+    return hashes
+
+
+def _save_neo4j_push_hashes(db, instance_id: str, hashes: dict[str, str]) -> None:
+    if not hashes:
+        return
+    pushed_at = utc_now()
+    db.executemany(
+        """
+        INSERT INTO neo4j_push_state (instance_id, customer_id, content_hash, pushed_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(instance_id, customer_id)
+        DO UPDATE SET content_hash = excluded.content_hash, pushed_at = excluded.pushed_at
+        """,
+        [
+            (instance_id, customer_id, content_hash, pushed_at)
+            for customer_id, content_hash in hashes.items()
+        ],
+    )
+    db.commit()
+
+
+def _clear_neo4j_push_state(
+    db, instance_id: str | None = None, customer_id: str | None = None
+) -> None:
+    if customer_id:
+        db.execute("DELETE FROM neo4j_push_state WHERE customer_id = ?", (customer_id,))
+    elif instance_id:
+        db.execute("DELETE FROM neo4j_push_state WHERE instance_id = ?", (instance_id,))
+
+
+def _push_customer_to_neo4j(
+    instance: dict,
+    customer: dict,
+    tenant_id: str,
+    subscriber: str | None,
+    tenant_name: str,
+    db=None,
+    force: bool = False,
+) -> dict | None:
+    row = _neo4j_customer_row(instance, customer, tenant_id, subscriber, tenant_name)
+    instance_id = instance.get("id")
+    content_hash = _neo4j_row_hash(row)
+    if db is not None and instance_id and not force:
+        previous = _load_neo4j_push_hashes(db, instance_id, [customer["id"]]).get(
+            customer["id"]
+        )
+        if previous == content_hash:
+            return None
+    result = _write_neo4j_customer_rows(instance, [row])
+    if db is not None and instance_id:
+        _save_neo4j_push_hashes(db, instance_id, {customer["id"]: content_hash})
+    return result
+
+
+def _push_customers_batch(
+    db,
+    instance: dict,
+    customers: list[dict],
+    chunk_size: int | None = None,
+    force_ids: set[str] | None = None,
+) -> dict:
+    instance_id = instance["id"]
+    force_ids = force_ids or set()
+    previous_hashes = _load_neo4j_push_hashes(
+        db, instance_id, [customer["id"] for customer in customers]
+    )
+    pending: list[tuple[str, str, dict]] = []
+    skipped: list[dict] = []
+    unchanged: list[str] = []
+    for customer in customers:
+        if not customer.get("tenant_id"):
+            skipped.append({"customer_id": customer["id"], "reason": "Tenant details are missing."})
+            continue
+        try:
+            row = _neo4j_customer_row(
+                instance,
+                customer,
+                customer["tenant_id"],
+                customer.get("subscriber"),
+                customer.get("tenant_name") or customer["tenant_id"],
+            )
+        except HTTPException as exc:
+            skipped.append({"customer_id": customer["id"], "reason": exc.detail})
+            continue
+        content_hash = _neo4j_row_hash(row)
+        if (
+            customer["id"] not in force_ids
+            and previous_hashes.get(customer["id"]) == content_hash
+        ):
+            unchanged.append(customer["id"])
+            continue
+        pending.append((customer["id"], content_hash, row))
+    size = chunk_size or settings.neo4j_batch_size
+    chunks: list[dict] = []
+    pushed = 0
+    error: dict | None = None
+    for offset in range(0, len(pending), size):
+        chunk = pending[offset : offset + size]
+        try:
+            chunks.append(_write_neo4j_customer_rows(instance, [row for _, _, row in chunk]))
+        except HTTPException as exc:
+            if not chunks:
+                raise
+            # earlier chunks are committed; report them with the error instead of dropping them
+            error = {"status_code": exc.status_code, "detail": exc.detail}
+            break
+        _save_neo4j_push_hashes(
+            db, instance_id, {customer_id: content_hash for customer_id, content_hash, _ in chunk}
+        )
+        pushed += len(chunk)
+    return {
+        "pushed": pushed,
+        "pushed_ids": [customer_id for customer_id, _, _ in pending[:pushed]],
+        "failed_ids": [customer_id for customer_id, _, _ in pending[pushed:]],
+        "error": error,
+        "skipped": skipped,
+        "unchanged": unchanged,
+        "chunks": chunks,
+        "nodes_created": sum(chunk["nodes_created"] for chunk in chunks),
+        "relationships_created": sum(chunk["relationships_created"] for chunk in chunks),
+    }
+
+
+def _enqueue_neo4j_push(
+    db, instance_id: str | None, customer_id: str, action: str, force: bool = False
+) -> int | None:
+    if not instance_id or not settings.neo4j_outbox_enabled:
+        # nothing drains the outbox while the worker is off
+        return None
+    row = db.execute(
+        "SELECT neo4j_host FROM instances WHERE id = ?", (instance_id,)
+    ).fetchone()
+    if not row or not row["neo4j_host"]:
+        return None
+    now = utc_now()
+    cursor = db.execute(
+        """
+        INSERT INTO neo4j_outbox (
+            instance_id, customer_id, action, force, status, attempts,
+            next_attempt_at, created_at, updated_at
+        )
+        VALUES (?, ?, ?, ?, 'pending', 0, ?, ?, ?)
+        """,
+        (instance_id, customer_id, action, 1 if force else 0, now, now, now),
+    )
+    return cursor.lastrowid
+
+
+def _mark_outbox_entries(
+    db, entry_ids: list[int], status_value: str, error: str | None = None
+) -> None:
+    if not entry_ids:
+        return
+    placeholders = ", ".join(["?"] * len(entry_ids))
+    db.execute(
+        f"""
+        UPDATE neo4j_outbox SET status = ?, last_error = ?, updated_at = ?
+        WHERE id IN ({placeholders})
+        """,
+        (status_value, error, utc_now(), *entry_ids),
+    )
+
+
+def _backoff_outbox_entries(db, entries: list[dict], error: str) -> None:
+    now = datetime.now(timezone.utc)
+    for entry in entries:
+        attempts = entry["attempts"] + 1
+        if attempts >= settings.neo4j_outbox_max_attempts:
+            status_value = "dead"
+            next_attempt = now
+        else:
+            status_value = "pending"
+            delay = min(
+                settings.neo4j_outbox_backoff_seconds * (2 ** (attempts - 1)),
+                settings.neo4j_outbox_backoff_max_seconds,
+            )
+            next_attempt = now + timedelta(seconds=delay)
+        db.execute(
+            """
+            UPDATE neo4j_outbox
+            SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (
+                status_value,
+                attempts,
+                next_attempt.isoformat(),
+                error,
+                now.isoformat(),
+                entry["id"],
+            ),
+        )
+
+
+def _claim_outbox_entries(db, instance_id: str, now: str) -> list[dict]:
+    # one UPDATE claims the rows, so two drainers never push the same entries; a claim
+    # whose lease ran out (drainer died mid-push) is up for grabs again
+    lease_until = (
+        datetime.now(timezone.utc) + timedelta(seconds=settings.neo4j_outbox_lease_seconds)
+    ).isoformat()
+    rows = db.execute(
+        """
+        UPDATE neo4j_outbox SET status = 'claimed', lease_until = ?, updated_at = ?
+        WHERE id IN (
+            SELECT id FROM neo4j_outbox
+            WHERE instance_id = ?
+              AND (
+                  (status = 'pending' AND next_attempt_at <= ?)
+                  OR (status = 'claimed' AND lease_until <= ?)
+              )
+              AND customer_id NOT IN (
+                  SELECT customer_id FROM neo4j_outbox
+                  WHERE (status = 'pending' AND next_attempt_at > ?)
+                     OR (status = 'claimed' AND lease_until > ?)
+              )
+            ORDER BY id
+            LIMIT ?
+        )
+        RETURNING id, customer_id, force, attempts
+        """,
+        (lease_until, now, instance_id, now, now, now, now, settings.neo4j_batch_size),
+    ).fetchall()
+    db.commit()
+    return sorted((_row_to_dict(row) for row in rows), key=lambda entry: entry["id"])
+
+
+def _push_outbox_customers(
+    db, instance: dict, customers: list[dict], force_ids: set[str]
+) -> tuple[dict, dict[str, str]]:
+    """Push customers for the outbox, returning the batch result and per-customer failures.
+
+    A failed batch is split in half until the failing rows are isolated, so one bad
+    customer does not hold back the rest. Connection failures are not split.
+    """
+    keys = ("pushed_ids", "unchanged", "skipped")
+    done = {key: [] for key in keys}
+    try:
+        result = _push_customers_batch(db, instance, customers, force_ids=force_ids)
+    except Exception as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        unreachable = isinstance(exc, HTTPException) and exc.status_code == 503
+    else:
+        if not result["failed_ids"]:
+            return result, {}
+        # a later chunk failed after earlier ones were committed; only the rest is retried
+        done = {key: result[key] for key in keys}
+        failed_ids = set(result["failed_ids"])
+        customers = [customer for customer in customers if customer["id"] in failed_ids]
+        detail = result["error"]["detail"]
+        unreachable = result["error"]["status_code"] == 503
+    if len(customers) <= 1 or unreachable:
+        return done, {customer["id"]: detail for customer in customers}
+    middle = len(customers) // 2
+    left, left_failed = _push_outbox_customers(db, instance, customers[:middle], force_ids)
+    right, right_failed = _push_outbox_customers(db, instance, customers[middle:], force_ids)
+    merged = {key: done[key] + left[key] + right[key] for key in keys}
+    return merged, {**left_failed, **right_failed}
+
+
+def _drain_neo4j_outbox_instance(db, instance_id: str, now: str) -> int:
+    entries = _claim_outbox_entries(db, instance_id, now)
+    if not entries:
+        return 0
+    by_customer: dict[str, list[dict]] = {}
+    for entry in entries:
+        by_customer.setdefault(entry["customer_id"], []).append(entry)
+    instance_row = db.execute(
+        """
+        SELECT id, name, neo4j_host, neo4j_port, neo4j_user, neo4j_password
+        FROM instances WHERE id = ?
+        """,
+        (instance_id,),
+    ).fetchone()
+    if not instance_row:
+        _mark_outbox_entries(db, [entry["id"] for entry in entries], "dead", "Instance not found.")
+        db.commit()
+        return len(entries)
+    placeholders = ", ".join(["?"] * len(by_customer))
+    customers = [
+        _row_to_dict(row)
+        for row in db.execute(
+            f"""
+            SELECT id, name, first_name, last_name, department, vendor,
+                   contact_email, instance_id
+            FROM customers WHERE id IN ({placeholders}) AND instance_id = ?
+            """,
+            (*by_customer.keys(), instance_id),
+        ).fetchall()
+    ]
+    live_ids = {customer["id"] for customer in customers}
+    superseded = [
+        entry["id"]
+        for customer_id, group in by_customer.items()
+        if customer_id not in live_ids
+        for entry in group
+    ]
+    _mark_outbox_entries(db, superseded, "done", "Customer no longer assigned to instance.")
+    _attach_tenant_info(customers, _load_instances(db, {instance_id}))
+    force_ids = {
+        customer_id
+        for customer_id, group in by_customer.items()
+        if any(entry["force"] for entry in group)
+    }
+    result, failed = _push_outbox_customers(
+        db, _row_to_dict(instance_row), customers, force_ids
+    )
+    for customer_id, detail in failed.items():
+        _backoff_outbox_entries(db, by_customer[customer_id], detail)
+    if failed:
+        logger.warning(
+            "Neo4j outbox push failed for %s customer(s) on instance %s: %s",
+            len(failed),
+            instance_id,
+            next(iter(failed.values())),
+        )
+    for customer_id in result["pushed_ids"]:
+        _mark_outbox_entries(db, [entry["id"] for entry in by_customer[customer_id]], "done")
+    for customer_id in result["unchanged"]:
+        _mark_outbox_entries(
+            db, [entry["id"] for entry in by_customer[customer_id]], "skipped"
+        )
+    for item in result["skipped"]:
+        _mark_outbox_entries(
+            db,
+            [entry["id"] for entry in by_customer[item["customer_id"]]],
+            "dead",
+            str(item["reason"]),
+        )
+    db.commit()
+    return len(entries)
+
+
+def _drain_neo4j_outbox(db) -> int:
+    now = utc_now()
+    instance_ids = [
+        row["instance_id"]
+        for row in db.execute(
+            """
+            SELECT DISTINCT instance_id FROM neo4j_outbox
+            WHERE (status = 'pending' AND next_attempt_at <= ?)
+               OR (status = 'claimed' AND lease_until <= ?)
+            """,
+            (now, now),
+        ).fetchall()
+    ]
+    processed = 0
+    for instance_id in instance_ids:
+        processed += _drain_neo4j_outbox_instance(db, instance_id, now)
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        hours=settings.neo4j_outbox_retention_hours
+    )
+    db.execute(
+        "DELETE FROM neo4j_outbox WHERE status IN ('done', 'skipped') AND updated_at < ?",
+        (cutoff.isoformat(),),
+    )
+    db.commit()
+    return processed
+
+
+class Neo4jOutboxWorker:
+    """Background thread that drains the Neo4j push outbox."""
+
+    def __init__(self) -> None:
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="neo4j-outbox", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=settings.connection_timeout_seconds)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn = connect_db()
+                try:
+                    _drain_neo4j_outbox(conn)
+                finally:
+                    conn.close()
+            except Exception:
+                logger.exception("Neo4j outbox drain failed")
+            self._stop.wait(settings.neo4j_outbox_poll_seconds)
+
+
+neo4j_outbox_worker = Neo4jOutboxWorker()
 
 
 def _build_customer_name(payload: CustomerCreate) -> str | None:
@@ -330,7 +1012,9 @@ def _build_bff_payload(payload: CustomerCreate) -> dict:
     }
 
 
-def _notify_bff_onboard(bff_url: str | None, payload: dict) -> None:
+def _notify_bff_onboard(
+    bff_url: str | None, payload: dict, instance_id: str | None = None
+) -> None:
     if not bff_url:
         raise HTTPException(
             status_code=400, detail="Instance BFF URL is required for onboarding."
@@ -339,8 +1023,8 @@ def _notify_bff_onboard(bff_url: str | None, payload: dict) -> None:
     verify_setting: bool | str = settings.bff_verify_ssl
     if settings.bff_ca_bundle:
         verify_setting = settings.bff_ca_bundle
+    started = time.perf_counter()
     try:
-        global LAST_BFF_ERROR
         tls_context = _build_tls_context()
         if tls_context:
             adapter = TLSAdapter(tls_context)
@@ -360,23 +1044,17 @@ def _notify_bff_onboard(bff_url: str | None, payload: dict) -> None:
                 verify=verify_setting,
             )
     except requests.RequestException as exc:
-        LAST_BFF_ERROR = {
-            "detail": f"BFF onboarding request failed: {exc}",
-            "at": utc_now(),
-        }
-        raise HTTPException(
-            status_code=502, detail=f"BFF onboarding request failed: {exc}"
+        detail = f"BFF onboarding request failed: {exc}"
+        bff_health.record(
+            instance_id, False, (time.perf_counter() - started) * 1000, detail
         )
+        raise HTTPException(status_code=502, detail=detail)
+    latency_ms = (time.perf_counter() - started) * 1000
     if response.status_code >= 400:
-        LAST_BFF_ERROR = {
-            "detail": f"BFF onboarding failed: {response.status_code} {response.text}",
-            "at": utc_now(),
-        }
-        raise HTTPException(
-            status_code=502,
-            detail=f"BFF onboarding failed: {response.status_code} {response.text}",
-        )
-    LAST_BFF_ERROR = None
+        detail = f"BFF onboarding failed: {response.status_code} {response.text}"
+        bff_health.record(instance_id, False, latency_ms, detail)
+        raise HTTPException(status_code=502, detail=detail)
+    bff_health.record(instance_id, True, latency_ms)
 
 
 def _email_domain(email: str | None) -> str | None:
@@ -416,6 +1094,7 @@ def _update_tenant_subscriber_flags(instance: dict, email: str | None) -> None:
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Postgres connection failed: {exc}")
     try:
+        postgres_timeouts.apply(conn, "write")
         with conn.cursor() as cursor:
             cursor.execute(
                 """
@@ -436,11 +1115,13 @@ def _update_tenant_subscriber_flags(instance: dict, email: str | None) -> None:
                 (json.dumps({"ai_axis_enabled": True}), domain),
             )
             conn.commit()
+        postgres_pools.note_write(instance)
     except psycopg2.Error as exc:
         conn.rollback()
-        detail = exc.pgerror or str(exc)
+        timeout = postgres_timeouts.describe(exc)
+        detail = timeout or exc.pgerror or str(exc)
         raise HTTPException(
-            status_code=400,
+            status_code=504 if timeout else 400,
             detail=f"Tenant/subscriber update failed: {detail}",
         )
     finally:
@@ -456,200 +1137,853 @@ def _table_identifier(table: str) -> sql.Identifier:
     return sql.Identifier(*parts)
 
 
-def _fetch_tenant_rows(instance: dict, keys: list[str]) -> dict[str, dict[str, str]]:
-    if not keys:
-        return {}
-    required = [instance.get("pg_host"), instance.get("pg_user"), instance.get("pg_password")]
-    if not all(required):
-        return {}
-    try:
-        conn = psycopg2.connect(
-            host=instance.get("pg_host"),
-            port=instance.get("pg_port") or 5432,
-            user=instance.get("pg_user"),
-            password=instance.get("pg_password"),
-            dbname=settings.pg_database,
-            sslmode=settings.pg_sslmode,
-            connect_timeout=settings.connection_timeout_seconds,
+class PreparedConnection(psycopg2.extensions.connection):
+    """Connection that remembers which statements were prepared on its session."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+
+
+def _replica_instance(instance: dict) -> dict | None:
+    if not instance.get("pg_replica_host"):
+        return None
+    return {
+        **instance,
+        "id": f"{instance['id']}:replica" if instance.get("id") else None,
+        "pg_host": instance["pg_replica_host"],
+        "pg_port": instance.get("pg_replica_port") or instance.get("pg_port"),
+    }
+
+
+class PostgresPoolRegistry:
+    """Pooled Postgres connections keyed by instance id, with read routing to replicas."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: dict[str, tuple[tuple, pool.ThreadedConnectionPool]] = {}
+        self._last_write: dict[str, float] = {}
+        self._replica_down_until: dict[str, float] = {}
+        self._reads = {"replica": 0, "primary": 0, "fallbacks": 0}
+
+    @staticmethod
+    def _key(instance: dict) -> str:
+        return instance.get("id") or (
+            f"{instance.get('pg_host')}:{instance.get('pg_port') or 5432}"
         )
-    except Exception:
-        return {}
 
-    try:
-        with conn.cursor() as cursor:
-            query = sql.SQL(
-                "SELECT {tenant_id}, {subscriber}, {name}, {match} FROM {table} "
-                "WHERE lower({match}) = ANY(%s)"
-            ).format(
-                tenant_id=sql.Identifier(settings.tenant_id_column),
-                subscriber=sql.Identifier(settings.tenant_subscriber_column),
-                name=sql.Identifier(settings.tenant_name_column),
-                match=sql.Identifier(settings.tenant_match_column),
-                table=_table_identifier(settings.tenant_table),
+    def _get_pool(self, instance: dict) -> pool.ThreadedConnectionPool:
+        fingerprint = (
+            instance.get("pg_host"),
+            str(instance.get("pg_port") or 5432),
+            instance.get("pg_user"),
+            instance.get("pg_password"),
+        )
+        key = self._key(instance)
+        with self._lock:
+            entry = self._pools.get(key)
+            if entry and entry[0] == fingerprint:
+                return entry[1]
+            if entry:
+                entry[1].closeall()
+            connection_pool = pool.ThreadedConnectionPool(
+                0,
+                max(settings.pg_pool_size, 1),
+                host=instance.get("pg_host"),
+                port=instance.get("pg_port") or 5432,
+                user=instance.get("pg_user"),
+                password=instance.get("pg_password"),
+                dbname=settings.pg_database,
+                sslmode=settings.pg_sslmode,
+                connect_timeout=settings.connection_timeout_seconds,
+                connection_factory=PreparedConnection,
             )
-            cursor.execute(query, (keys,))
-            rows = cursor.fetchall()
+            self._pools[key] = (fingerprint, connection_pool)
+            return connection_pool
+
+    @contextmanager
+    def connection(self, instance: dict):
+        connection_pool: pool.ThreadedConnectionPool | None = self._get_pool(instance)
+        try:
+            conn = connection_pool.getconn()
+        except pool.PoolError:
+            # pool exhausted: fall back to a one-off connection rather than failing
+            connection_pool = None
+            conn = _connect_instance_postgres(instance)
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail=f"Postgres connection failed: {exc}")
+        try:
+            yield conn
+        finally:
+            if connection_pool is None:
+                conn.close()
+            else:
+                broken = bool(conn.closed)
+                if not broken and (
+                    conn.get_transaction_status()
+                    != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+                ):
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        broken = True
+                connection_pool.putconn(conn, close=broken)
+
+    def note_write(self, instance: dict) -> None:
+        with self._lock:
+            self._last_write[self._key(instance)] = time.monotonic()
+
+    def _use_replica(self, instance: dict) -> bool:
+        if not instance.get("pg_replica_host"):
+            return False
+        key = self._key(instance)
+        now = time.monotonic()
+        with self._lock:
+            # the replica may not have replayed our own recent writes yet
+            last_write = self._last_write.get(key)
+            if (
+                last_write is not None
+                and now - last_write < settings.pg_replica_lag_tolerance_seconds
+            ):
+                return False
+            return now >= self._replica_down_until.get(key, 0.0)
+
+    @contextmanager
+    def read_connection(self, instance: dict):
+        """Borrow a connection for reads, preferring the instance's replica.
+
+        Yields the connection and the instance dict it was opened for, so related
+        work (such as snapshot-sharing scans) can target the same server.
+        """
+        replica = _replica_instance(instance) if self._use_replica(instance) else None
+        with ExitStack() as stack:
+            target = instance
+            if replica is not None:
+                try:
+                    conn = stack.enter_context(self.connection(replica))
+                    target = replica
+                except HTTPException as exc:
+                    logger.warning(
+                        "Replica for instance %s unavailable, reading from primary: %s",
+                        instance.get("id"),
+                        exc.detail,
+                    )
+                    with self._lock:
+                        self._replica_down_until[self._key(instance)] = (
+                            time.monotonic() + settings.pg_replica_retry_seconds
+                        )
+                        self._reads["fallbacks"] += 1
+            if target is instance:
+                conn = stack.enter_context(self.connection(instance))
+            with self._lock:
+                self._reads["replica" if target is replica else "primary"] += 1
+            yield conn, target
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
             return {
-                row[3]: {
-                    "tenant_id": str(row[0]),
-                    "subscriber": str(row[1]),
-                    "tenant_name": str(row[2]) if row[2] is not None else None,
-                }
-                for row in rows
-                if row[3]
+                "reads": dict(self._reads),
+                "replicas_down": sorted(
+                    key for key, until in self._replica_down_until.items() if until > now
+                ),
             }
-    except Exception:
-        return {}
-    finally:
-        conn.close()
 
+    def discard(self, instance_id: str) -> None:
+        with self._lock:
+            entries = [
+                self._pools.pop(key, None) for key in (instance_id, f"{instance_id}:replica")
+            ]
+            self._last_write.pop(instance_id, None)
+            self._replica_down_until.pop(instance_id, None)
+        for entry in entries:
+            if entry:
+                entry[1].closeall()
 
-def _fetch_all_tenants(instance: dict) -> list[dict]:
-    required = [instance.get("pg_host"), instance.get("pg_user"), instance.get("pg_password")]
-    if not all(required):
-        return []
-    try:
-        conn = psycopg2.connect(
-            host=instance.get("pg_host"),
-            port=instance.get("pg_port") or 5432,
-            user=instance.get("pg_user"),
-            password=instance.get("pg_password"),
-            dbname=settings.pg_database,
-            sslmode=settings.pg_sslmode,
-            connect_timeout=settings.connection_timeout_seconds,
-        )
-    except Exception:
-        return []
+    def close_all(self) -> None:
+        with self._lock:
+            entries = list(self._pools.values())
+            self._pools.clear()
+        for _, connection_pool in entries:
+            connection_pool.closeall()
 
-    try:
+
+postgres_pools = PostgresPoolRegistry()
+
+
+class QueryRegistry:
+    """Renders each query template variant once and reuses it as a prepared statement."""
+
+    def __init__(self, prepare: bool) -> None:
+        self._prepare = prepare
+        self._lock = threading.Lock()
+        self._rendered: dict[tuple, tuple[str, str, str]] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def _count(self, name: str, counter: str) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                name, {"variants": 0, "executions": 0, "prepares": 0, "prepared_executions": 0}
+            )
+            stats[counter] += 1
+
+    def render(self, conn, builder, args: tuple) -> str:
+        return self._rendered_entry(conn, builder, args)[0]
+
+    def _rendered_entry(self, conn, builder, args: tuple) -> tuple[str, str, str]:
+        key = (builder.__name__, args)
+        entry = self._rendered.get(key)
+        if entry is None:
+            text = builder(*args).as_string(conn)
+            statement = "q_" + hashlib.sha1(text.encode("utf-8")).hexdigest()[:20]
+            counter = iter(range(1, text.count("%s") + 1))
+            prepared = re.sub(r"%s", lambda _: f"${next(counter)}", text)
+            entry = (text, statement, f"PREPARE {statement} AS {prepared}")
+            with self._lock:
+                self._rendered[key] = entry
+            self._count(builder.__name__, "variants")
+        return entry
+
+    def execute(self, cursor, builder, args: tuple, params: list[object] | tuple = ()) -> None:
+        name = builder.__name__.strip("_")
+        text, statement, prepare_sql = self._rendered_entry(cursor.connection, builder, args)
+        self._count(builder.__name__, "executions")
+        prepared = getattr(cursor.connection, "prepared", None)
+        # DECLARE only accepts a plain query, so named cursors never use EXECUTE
+        if not self._prepare or prepared is None or getattr(cursor, "name", None):
+            cursor.execute(text, params)
+            return
+        if statement not in prepared:
+            cursor.execute(prepare_sql)
+            prepared.add(statement)
+            self._count(builder.__name__, "prepares")
+        self._count(builder.__name__, "prepared_executions")
+        if params:
+            cursor.execute(f"EXECUTE {statement} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {statement}")
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                name.strip("_"): dict(counters) for name, counters in sorted(self._stats.items())
+            }
+
+
+queries = QueryRegistry(settings.pg_prepared_statements)
+
+
+class PostgresTimeouts:
+    """Statement and lock timeouts per query class, and how often each one fired."""
+
+    def __init__(self, statement_ms: dict[str, int], lock_ms: dict[str, int]) -> None:
+        self._statement_ms = statement_ms
+        self._lock_ms = lock_ms
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._fired: dict[str, dict[str, int]] = {}
+
+    def apply(
+        self, conn, query_class: str, read_only: bool = False, isolation: str | None = None
+    ) -> None:
+        """Set the class's timeouts for the current transaction.
+
+        Transaction modes only apply when no transaction is open yet on `conn`.
+        """
+        statements = []
+        modes = ([f"ISOLATION LEVEL {isolation}"] if isolation else []) + (
+            ["READ ONLY"] if read_only else []
+        )
+        idle = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        if modes and getattr(conn, "get_transaction_status", lambda: idle)() == idle:
+            statements.append(f"SET TRANSACTION {', '.join(modes)}")
+        statements.append(
+            f"SET LOCAL statement_timeout = {int(self._statement_ms.get(query_class, 0))}"
+        )
+        statements.append(f"SET LOCAL lock_timeout = {int(self._lock_ms.get(query_class, 0))}")
+        self._local.query_class = query_class
+        self._local.applied = (query_class, read_only, isolation)
         with conn.cursor() as cursor:
-            query = sql.SQL(
-                "SELECT {tenant_id}, {subscriber}, {name}, lower({match}) FROM {table}"
-            ).format(
-                tenant_id=sql.Identifier(settings.tenant_id_column),
-                subscriber=sql.Identifier(settings.tenant_subscriber_column),
-                name=sql.Identifier(settings.tenant_name_column),
-                match=sql.Identifier(settings.tenant_match_column),
-                table=_table_identifier(settings.tenant_table),
+            cursor.execute("; ".join(statements))
+
+    def rollback(self, conn) -> None:
+        """Roll back and re-apply what this thread last applied; SET LOCAL ends with the transaction."""
+        conn.rollback()
+        applied = getattr(self._local, "applied", None)
+        if applied:
+            self.apply(conn, *applied)
+
+    @staticmethod
+    def is_timeout(exc: Exception) -> bool:
+        return getattr(exc, "pgcode", None) in {"57014", "55P03"}
+
+    def describe(self, exc: Exception) -> str | None:
+        """Name the timeout behind `exc`, if it was one, and count it."""
+        if not self.is_timeout(exc):
+            return None
+        if exc.pgcode == "57014":
+            kind, limits = "statement_timeout", self._statement_ms
+        else:
+            kind, limits = "lock_timeout", self._lock_ms
+        query_class = getattr(self._local, "query_class", None) or "unknown"
+        with self._lock:
+            counters = self._fired.setdefault(
+                query_class, {"statement_timeout": 0, "lock_timeout": 0}
+            )
+            counters[kind] += 1
+        return f"{query_class} {kind} ({limits.get(query_class, 0)} ms) exceeded"
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "statement_timeouts_ms": dict(self._statement_ms),
+                "lock_timeouts_ms": dict(self._lock_ms),
+                "fired": {name: dict(counters) for name, counters in self._fired.items()},
+            }
+
+
+postgres_timeouts = PostgresTimeouts(
+    settings.pg_statement_timeouts_ms, settings.pg_lock_timeouts_ms
+)
+
+
+def _postgres_failure(action: str, exc: Exception) -> HTTPException:
+    timeout = postgres_timeouts.describe(exc)
+    if timeout:
+        return HTTPException(status_code=504, detail=f"{action} failed: {timeout}")
+    return HTTPException(status_code=400, detail=f"{action} failed: {exc}")
+
+
+class PostgresSchemaCache:
+    """Column names and types of the configured Postgres tables, per instance."""
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._schemas: dict[str, tuple[tuple, float, dict[str, dict[str, str]]]] = {}
+
+    def get(self, instance: dict, conn) -> dict[str, dict[str, str]]:
+        fingerprint = (
+            instance.get("pg_host"),
+            str(instance.get("pg_port") or 5432),
+            instance.get("pg_user"),
+        )
+        key = instance.get("id") or f"{fingerprint[0]}:{fingerprint[1]}"
+        with self._lock:
+            entry = self._schemas.get(key)
+            if entry and entry[0] == fingerprint and time.monotonic() - entry[1] < self._ttl:
+                return entry[2]
+        idle = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        standalone = getattr(conn, "get_transaction_status", lambda: idle)() == idle
+        try:
+            if standalone:
+                # its own bounded transaction, ended below, so the caller's
+                # SET TRANSACTION and SET LOCAL apply to what it runs next
+                postgres_timeouts.apply(conn, "defaults", read_only=True)
+            tables = _introspect_tables(conn, _configured_tables())
+        except Exception as exc:
+            logger.warning("Postgres schema introspection failed: %s", exc)
+            if standalone:
+                conn.rollback()
+            else:
+                postgres_timeouts.rollback(conn)
+            return {}
+        if standalone:
+            conn.rollback()
+        with self._lock:
+            self._schemas[key] = (fingerprint, time.monotonic(), tables)
+        return tables
+
+    def discard(self, instance_id: str) -> None:
+        with self._lock:
+            self._schemas.pop(instance_id, None)
+
+
+postgres_schemas = PostgresSchemaCache(settings.schema_cache_ttl_seconds)
+
+
+def _table_key(table: str) -> str:
+    parts = [part for part in table.split(".") if part]
+    if len(parts) == 1:
+        parts.insert(0, "public")
+    return ".".join(parts)
+
+
+def _configured_tables() -> list[str]:
+    return sorted(
+        {
+            _table_key(table)
+            for table in (
+                settings.tenant_table,
+                settings.user_table,
+                settings.role_table,
+                settings.group_table,
             )
-            cursor.execute(query)
+            if table
+        }
+    )
+
+
+def _introspect_tables(conn, tables: list[str]) -> dict[str, dict[str, str]]:
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT table_schema, table_name, column_name, data_type "
+            "FROM information_schema.columns "
+            "WHERE table_schema || '.' || table_name = ANY(%s)",
+            (tables,),
+        )
+        rows = cursor.fetchall()
+    schema: dict[str, dict[str, str]] = {}
+    for table_schema, table_name, column_name, data_type in rows:
+        schema.setdefault(f"{table_schema}.{table_name}", {})[column_name] = data_type
+    return schema
+
+
+def _resolve_tenant_column(
+    schema: dict[str, dict[str, str]] | None,
+    table: str,
+    tenant_column: str,
+    tenant_match_mode: str,
+) -> tuple[str, str] | None:
+    """Pick the tenant column that exists and match it by its type.
+
+    Returns None when the table was not introspected, so callers keep probing.
+    """
+    columns = (schema or {}).get(_table_key(table)) if table else None
+    if not columns:
+        return None
+    for candidate in (tenant_column, "tenantId", "tenantIds"):
+        if candidate and candidate in columns:
+            return candidate, "any" if columns[candidate] == "ARRAY" else "eq"
+    return None
+
+
+def _describe_configured_columns(schema: dict[str, dict[str, str]]) -> dict[str, dict]:
+    mappings = {
+        "TENANT": (
+            settings.tenant_table,
+            {
+                "MATCH": settings.tenant_match_column,
+                "NAME": settings.tenant_name_column,
+                "ID": settings.tenant_id_column,
+                "SUBSCRIBER": settings.tenant_subscriber_column,
+            },
+        ),
+        "USER": (
+            settings.user_table,
+            {
+                "ID": settings.user_id_column,
+                "TENANT": settings.user_tenant_column,
+                "SUBSCRIBER": settings.user_subscriber_column,
+                "ACCOUNT_TYPE": settings.user_account_type_column,
+                "ROLE_IDS": settings.user_role_ids_column,
+                "GROUP_IDS": settings.user_group_ids_column,
+                "EMAIL": settings.user_email_column,
+                "PASSWORD": settings.user_password_column,
+            },
+        ),
+        "ROLE": (
+            settings.role_table,
+            {
+                "ID": settings.role_id_column,
+                "NAME": settings.role_name_column,
+                "TENANT": settings.role_tenant_column,
+                "SUBSCRIBER": settings.role_subscriber_column,
+            },
+        ),
+        "GROUP": (
+            settings.group_table,
+            {
+                "ID": settings.group_id_column,
+                "NAME": settings.group_name_column,
+                "TENANT": settings.group_tenant_column,
+                "SUBSCRIBER": settings.group_subscriber_column,
+            },
+        ),
+    }
+    described: dict[str, dict] = {}
+    for prefix, (table, columns) in mappings.items():
+        table_columns = schema.get(_table_key(table)) if table else None
+        described[prefix] = {
+            "table": table,
+            "exists": table_columns is not None,
+            "columns": {
+                f"{prefix}_{name}_COLUMN": {
+                    "column": column,
+                    "type": (table_columns or {}).get(column),
+                    "exists": bool(column) and column in (table_columns or {}),
+                }
+                for name, column in columns.items()
+            },
+        }
+    return described
+
+
+def _tenant_rows_sql() -> sql.Composed:
+    return sql.SQL(
+        "SELECT {tenant_id}, {subscriber}, {name}, {match} FROM {table} "
+        "WHERE lower({match}) = ANY(%s)"
+    ).format(
+        tenant_id=sql.Identifier(settings.tenant_id_column),
+        subscriber=sql.Identifier(settings.tenant_subscriber_column),
+        name=sql.Identifier(settings.tenant_name_column),
+        match=sql.Identifier(settings.tenant_match_column),
+        table=_table_identifier(settings.tenant_table),
+    )
+
+
+def _fetch_tenant_rows(instance: dict, keys: list[str]) -> dict[str, dict[str, str]]:
+    if not keys:
+        return {}
+    required = [instance.get("pg_host"), instance.get("pg_user"), instance.get("pg_password")]
+    if not all(required):
+        return {}
+    try:
+        with postgres_pools.read_connection(instance) as (conn, _), conn.cursor() as cursor:
+            postgres_timeouts.apply(conn, "tenant_scan", read_only=True)
+            queries.execute(cursor, _tenant_rows_sql, (), (keys,))
             rows = cursor.fetchall()
-            return [
-                {
+            return {
+                row[3]: {
                     "tenant_id": str(row[0]),
                     "subscriber": str(row[1]),
                     "tenant_name": str(row[2]) if row[2] is not None else None,
-                    "match_value": (row[3] or "").lower(),
                 }
                 for row in rows
-            ]
-    except Exception:
-        return []
-    finally:
-        conn.close()
+                if row[3]
+            }
+    except Exception as exc:
+        timeout = postgres_timeouts.describe(exc)
+        if timeout:
+            logger.warning("Tenant lookup for instance %s hit %s", instance.get("id"), timeout)
+        return {}
 
 
-def _fetch_internal_users(
-    instance: dict, tenant_id: str, subscriber: str | None, account_type_value: str
-) -> list[dict]:
+def _all_tenants_sql(
+    watermark_column: str | None, incremental: bool, partitioned: bool = False
+) -> sql.Composed:
+    query = sql.SQL("SELECT {tenant_id}, {subscriber}, {name}, lower({match})").format(
+        tenant_id=sql.Identifier(settings.tenant_id_column),
+        subscriber=sql.Identifier(settings.tenant_subscriber_column),
+        name=sql.Identifier(settings.tenant_name_column),
+        match=sql.Identifier(settings.tenant_match_column),
+    )
+    if watermark_column:
+        query += sql.SQL(", {updated}").format(updated=sql.Identifier(watermark_column))
+    query += sql.SQL(" FROM {table}").format(table=_table_identifier(settings.tenant_table))
+    conditions: list[sql.Composable] = []
+    if incremental:
+        if watermark_column:
+            conditions.append(
+                sql.SQL("{updated} >= {watermark}").format(
+                    updated=sql.Identifier(watermark_column), watermark=sql.Placeholder()
+                )
+            )
+        else:
+            # xmin has no index: Postgres still reads every row, only fewer are sent back
+            conditions.append(
+                sql.SQL("xmin::text::bigint >= {watermark}").format(
+                    watermark=sql.Placeholder()
+                )
+            )
+    if partitioned:
+        # the mask keeps hashtext() non-negative so the modulo picks exactly one range
+        conditions.append(
+            sql.SQL("mod(hashtext({tenant_id}::text) & 2147483647, {count}) = {index}").format(
+                tenant_id=sql.Identifier(settings.tenant_id_column),
+                count=sql.Placeholder(),
+                index=sql.Placeholder(),
+            )
+        )
+    if conditions:
+        query += sql.SQL(" WHERE ") + sql.SQL(" AND ").join(conditions)
+    return query
+
+
+def _stream_cursor(conn):
+    cursor = conn.cursor(name=f"stream_{uuid4().hex[:16]}")
+    cursor.itersize = settings.pg_fetch_itersize
+    return cursor
+
+
+def _fetch_chunks(cursor) -> Iterator[list[tuple]]:
+    while True:
+        rows = cursor.fetchmany(cursor.itersize)
+        if not rows:
+            return
+        yield rows
+
+
+def _tenant_scan_partitions(instance: dict) -> int:
+    return max(1, int(instance.get("pg_scan_partitions") or settings.tenant_scan_partitions))
+
+
+def _scan_tenants(
+    conn, args: tuple, params: tuple, consume: Callable[[list[tuple]], None]
+) -> None:
+    with _stream_cursor(conn) as cursor:
+        queries.execute(cursor, _all_tenants_sql, args, params)
+        for rows in _fetch_chunks(cursor):
+            consume(rows)
+
+
+def _scan_tenant_partition(
+    instance: dict,
+    snapshot: str,
+    partitions: int,
+    index: int,
+    consume: Callable[[list[tuple]], None],
+) -> None:
+    with postgres_pools.connection(instance) as conn:
+        postgres_timeouts.apply(conn, "tenant_scan", read_only=True, isolation="REPEATABLE READ")
+        with conn.cursor() as cursor:
+            cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+        _scan_tenants(
+            conn,
+            (settings.tenant_updated_at_column or None, False, True),
+            (partitions, index),
+            consume,
+        )
+        conn.commit()
+
+
+def _fetch_all_tenants(
+    instance: dict,
+    on_chunk: Callable[[list[dict]], None],
+    watermark: str | None = None,
+) -> tuple[int, str | None] | None:
+    """Stream tenants changed since `watermark` (all tenants when it is None) to `on_chunk`.
+
+    Full scans are split across the instance's scan partitions, each on its own
+    pooled connection reading one exported snapshot; `on_chunk` is never called
+    concurrently. Returns the row count and the watermark to use next time, or
+    None on failure.
+    """
     required = [instance.get("pg_host"), instance.get("pg_user"), instance.get("pg_password")]
     if not all(required):
-        return []
-    try:
-        conn = psycopg2.connect(
-            host=instance.get("pg_host"),
-            port=instance.get("pg_port") or 5432,
-            user=instance.get("pg_user"),
-            password=instance.get("pg_password"),
-            dbname=settings.pg_database,
-            sslmode=settings.pg_sslmode,
-            connect_timeout=settings.connection_timeout_seconds,
-        )
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Postgres connection failed: {exc}")
+        return None
+    watermark_column = settings.tenant_updated_at_column or None
+    partitions = _tenant_scan_partitions(instance) if watermark is None else 1
+    lock = threading.Lock()
+    count = 0
+    latest = None
+
+    def consume(rows: list[tuple]) -> None:
+        nonlocal count, latest
+        tenants = [
+            {
+                "tenant_id": str(row[0]),
+                "subscriber": str(row[1]),
+                "tenant_name": str(row[2]) if row[2] is not None else None,
+                "match_value": (row[3] or "").lower(),
+            }
+            for row in rows
+        ]
+        with lock:
+            if watermark_column:
+                for row in rows:
+                    if row[4] is not None and (latest is None or row[4] > latest):
+                        latest = row[4]
+            count += len(rows)
+            on_chunk(tenants)
 
     try:
-        with conn.cursor() as cursor:
-            base = sql.SQL(
-                "SELECT {user_id}, {first_name}, {last_name}, {username}, {email}, {account_type} "
-                "FROM {table} WHERE {account_type} = {account_val} AND "
-            ).format(
-                user_id=sql.Identifier(settings.user_id_column),
-                first_name=sql.Identifier(settings.user_first_name_column),
-                last_name=sql.Identifier(settings.user_last_name_column),
-                username=sql.Identifier(settings.user_username_column),
-                email=sql.Identifier(settings.user_email_column),
-                account_type=sql.Identifier(settings.user_account_type_column),
-                account_val=sql.Placeholder(),
-                table=_table_identifier(settings.user_table),
+        with postgres_pools.read_connection(instance) as (conn, source):
+            next_watermark = watermark
+            postgres_timeouts.apply(
+                conn,
+                "tenant_scan",
+                read_only=True,
+                isolation="REPEATABLE READ" if partitions > 1 else None,
             )
-            if settings.user_tenant_match_mode.lower() == "any":
-                tenant_clause = sql.SQL("{} = ANY({})").format(
-                    sql.Placeholder(), sql.Identifier(settings.user_tenant_column)
-                )
+            with conn.cursor() as cursor:
+                if not watermark_column:
+                    # transactions older than the snapshot xmin are finished, so anything
+                    # committed after this point has xmin >= it (mod 2^32, like xmin itself)
+                    cursor.execute(
+                        "SELECT txid_snapshot_xmin(txid_current_snapshot()) % 4294967296"
+                    )
+                    next_watermark = str(cursor.fetchone()[0])
+                if partitions > 1:
+                    cursor.execute("SELECT pg_export_snapshot()")
+                    snapshot = cursor.fetchone()[0]
+            if partitions > 1:
+                # the exporting transaction stays open until every partition has imported it
+                with ThreadPoolExecutor(
+                    max_workers=partitions, thread_name_prefix="tenant-scan"
+                ) as executor:
+                    futures = [
+                        executor.submit(
+                            _scan_tenant_partition, source, snapshot, partitions, index, consume
+                        )
+                        for index in range(partitions)
+                    ]
+                    for future in futures:
+                        future.result()
             else:
-                tenant_clause = sql.SQL("{tenant_col} = {tenant_val}").format(
-                    tenant_col=sql.Identifier(settings.user_tenant_column),
-                    tenant_val=sql.Placeholder(),
+                _scan_tenants(
+                    conn,
+                    (watermark_column, watermark is not None, False),
+                    (int(watermark) if not watermark_column else watermark,)
+                    if watermark is not None
+                    else (),
+                    consume,
                 )
-            def run_query(with_subscriber: bool) -> list[tuple]:
-                query = base + tenant_clause
+            conn.commit()
+    except Exception as exc:
+        logger.warning(
+            "Tenant fetch failed for instance %s: %s",
+            instance.get("id"),
+            postgres_timeouts.describe(exc) or exc,
+        )
+        return None
+    if latest is not None:
+        next_watermark = latest.isoformat() if hasattr(latest, "isoformat") else str(latest)
+    return count, next_watermark
+
+
+def _internal_users_sql(
+    tenant_column: str, tenant_match_mode: str, with_subscriber: bool
+) -> sql.Composed:
+    query = sql.SQL(
+        "SELECT {user_id}, {first_name}, {last_name}, {username}, {email}, {account_type} "
+        "FROM {table} WHERE {account_type} = {account_val} AND "
+    ).format(
+        user_id=sql.Identifier(settings.user_id_column),
+        first_name=sql.Identifier(settings.user_first_name_column),
+        last_name=sql.Identifier(settings.user_last_name_column),
+        username=sql.Identifier(settings.user_username_column),
+        email=sql.Identifier(settings.user_email_column),
+        account_type=sql.Identifier(settings.user_account_type_column),
+        account_val=sql.Placeholder(),
+        table=_table_identifier(settings.user_table),
+    ) + _match_sql(tenant_column, tenant_match_mode)
+    if with_subscriber:
+        query += sql.SQL(" AND {subscriber_col} = {subscriber_val}").format(
+            subscriber_col=sql.Identifier(settings.user_subscriber_column),
+            subscriber_val=sql.Placeholder(),
+        )
+    return query
+
+
+def _fetch_internal_users(
+    instance: dict, tenant_id: str, subscriber: str | None, account_type_value: str
+) -> list[dict]:
+    required = [instance.get("pg_host"), instance.get("pg_user"), instance.get("pg_password")]
+    if not all(required):
+        return []
+    with postgres_pools.read_connection(instance) as (conn, _):
+        try:
+            tenant_column = _user_tenant_column(postgres_schemas.get(instance, conn))
+            postgres_timeouts.apply(conn, "user_list", read_only=True)
+
+            def run_query(with_subscriber: bool) -> list[dict]:
                 params: list[object] = [account_type_value, tenant_id]
                 if with_subscriber and subscriber:
-                    query += sql.SQL(" AND {subscriber_col} = {subscriber_val}").format(
-                        subscriber_col=sql.Identifier(settings.user_subscriber_column),
-                        subscriber_val=sql.Placeholder(),
-                    )
                     params.append(subscriber)
-                cursor.execute(query, params)
-                return cursor.fetchall()
+                users: list[dict] = []
+                with _stream_cursor(conn) as cursor:
+                    queries.execute(
+                        cursor,
+                        _internal_users_sql,
+                        (*tenant_column, bool(with_subscriber and subscriber)),
+                        params,
+                    )
+                    for rows in _fetch_chunks(cursor):
+                        users.extend(
+                            {
+                                "id": str(row[0]) if row[0] is not None else None,
+                                "name": (
+                                    _compose_name(
+                                        str(row[1]) if row[1] is not None else None,
+                                        str(row[2]) if row[2] is not None else None,
+                                    )
+                                    or (str(row[3]) if row[3] is not None else None)
+                                    or (str(row[4]) if row[4] is not None else None)
+                                ),
+                                "email": str(row[4]) if row[4] is not None else None,
+                                "account_type": str(row[5]) if row[5] is not None else None,
+                            }
+                            for row in rows
+                        )
+                return users
 
-            rows = run_query(with_subscriber=True)
+            users = run_query(with_subscriber=True)
             if (
                 subscriber
-                and not rows
+                and not users
                 and account_type_value == settings.user_account_type_oauth_value
             ):
-                rows = run_query(with_subscriber=False)
-            return [
-                {
-                    "id": str(row[0]) if row[0] is not None else None,
-                    "name": (
-                        _compose_name(
-                            str(row[1]) if row[1] is not None else None,
-                            str(row[2]) if row[2] is not None else None,
-                        )
-                        or (str(row[3]) if row[3] is not None else None)
-                        or (str(row[4]) if row[4] is not None else None)
-                    ),
-                    "email": str(row[4]) if row[4] is not None else None,
-                    "account_type": str(row[5]) if row[5] is not None else None,
-                }
-                for row in rows
-            ]
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"User lookup failed: {exc}")
-    finally:
-        conn.close()
+                users = run_query(with_subscriber=False)
+            conn.commit()
+            return users
+        except Exception as exc:
+            raise _postgres_failure("User lookup", exc)
 
 
-def _match_clause(column: str, match_mode: str, value: str) -> tuple[sql.SQL, list[object]]:
+def _match_sql(column: str, match_mode: str) -> sql.Composed:
     if match_mode.lower() == "any":
-        clause = sql.SQL("{} = ANY({})").format(
-            sql.Placeholder(), sql.Identifier(column)
+        return sql.SQL("{} = ANY({})").format(sql.Placeholder(), sql.Identifier(column))
+    return sql.SQL("{tenant_col} = {tenant_val}").format(
+        tenant_col=sql.Identifier(column),
+        tenant_val=sql.Placeholder(),
+    )
+
+
+def _user_tenant_column(schema: dict[str, dict[str, str]] | None = None) -> tuple[str, str]:
+    return _resolve_tenant_column(
+        schema, settings.user_table, settings.user_tenant_column, settings.user_tenant_match_mode
+    ) or (settings.user_tenant_column, settings.user_tenant_match_mode)
+
+
+def _ids_sql(
+    table: str,
+    id_column: str,
+    name_column: str | None,
+    tenant_column: str,
+    tenant_match_mode: str,
+    subscriber_column: str | None,
+    with_subscriber: bool,
+    with_names: bool,
+) -> sql.Composed:
+    clauses: list[sql.Composable] = [_match_sql(tenant_column, tenant_match_mode)]
+    if subscriber_column and with_subscriber:
+        clauses.append(
+            sql.SQL("{subscriber_col} = {subscriber_val}").format(
+                subscriber_col=sql.Identifier(subscriber_column),
+                subscriber_val=sql.Placeholder(),
+            )
         )
-    else:
-        clause = sql.SQL("{tenant_col} = {tenant_val}").format(
-            tenant_col=sql.Identifier(column),
-            tenant_val=sql.Placeholder(),
+    if with_names:
+        if not name_column:
+            raise ValueError("Name column is required for role/group filters.")
+        clauses.append(
+            sql.SQL("{name_col} = ANY({name_val})").format(
+                name_col=sql.Identifier(name_column),
+                name_val=sql.Placeholder(),
+            )
         )
-    return clause, [value]
+    query = sql.SQL("SELECT {id_col} FROM {table} WHERE ").format(
+        id_col=sql.Identifier(id_column),
+        table=_table_identifier(table),
+    ) + sql.SQL(" AND ").join(clauses)
+    if name_column:
+        query += sql.SQL(" ORDER BY {name_col}").format(name_col=sql.Identifier(name_column))
+    return query
 
 
-def _tenant_match_clause(tenant_id: str) -> tuple[sql.SQL, list[object]]:
-    return _match_clause(
-        settings.user_tenant_column, settings.user_tenant_match_mode, tenant_id
-    )
+def _ids_params(
+    tenant_id: str,
+    subscriber_column: str | None,
+    subscriber: str | None,
+    names: list[str] | None,
+) -> list[object]:
+    params: list[object] = [tenant_id]
+    if subscriber_column and subscriber:
+        params.append(subscriber)
+    if names:
+        params.append(names)
+    return params
 
 
 def _fetch_ids_from_table(
@@ -663,54 +1997,39 @@ def _fetch_ids_from_table(
     subscriber_column: str | None,
     subscriber: str | None,
     names: list[str] | None,
+    schema: dict[str, dict[str, str]] | None = None,
 ) -> list[str]:
     if not table or not id_column or not tenant_column:
         return []
-    columns_to_try = [tenant_column] + [
-        candidate
-        for candidate in ("tenantId", "tenantIds")
-        if candidate and candidate != tenant_column
-    ]
+    resolved = _resolve_tenant_column(schema, table, tenant_column, tenant_match_mode)
+    if resolved:
+        columns_to_try = [resolved[0]]
+        tenant_match_mode = resolved[1]
+    else:
+        columns_to_try = [tenant_column] + [
+            candidate
+            for candidate in ("tenantId", "tenantIds")
+            if candidate and candidate != tenant_column
+        ]
     last_exc: Exception | None = None
     for candidate in columns_to_try:
         try:
-            clauses: list[sql.SQL] = []
-            params: list[object] = []
-            tenant_clause, tenant_params = _match_clause(
-                candidate, tenant_match_mode, tenant_id
-            )
-            clauses.append(tenant_clause)
-            params.extend(tenant_params)
-            if subscriber_column and subscriber:
-                clauses.append(
-                    sql.SQL("{subscriber_col} = {subscriber_val}").format(
-                        subscriber_col=sql.Identifier(subscriber_column),
-                        subscriber_val=sql.Placeholder(),
-                    )
-                )
-                params.append(subscriber)
-            if names:
-                if not name_column:
-                    raise ValueError("Name column is required for role/group filters.")
-                clauses.append(
-                    sql.SQL("{name_col} = ANY({name_val})").format(
-                        name_col=sql.Identifier(name_column),
-                        name_val=sql.Placeholder(),
-                    )
-                )
-                params.append(names)
-            query = sql.SQL("SELECT {id_col} FROM {table}").format(
-                id_col=sql.Identifier(id_column),
-                table=_table_identifier(table),
-            )
-            if clauses:
-                query += sql.SQL(" WHERE ") + sql.SQL(" AND ").join(clauses)
-            if name_column:
-                query += sql.SQL(" ORDER BY {name_col}").format(
-                    name_col=sql.Identifier(name_column)
-                )
             with conn.cursor() as cursor:
-                cursor.execute(query, params)
+                queries.execute(
+                    cursor,
+                    _ids_sql,
+                    (
+                        table,
+                        id_column,
+                        name_column,
+                        candidate,
+                        tenant_match_mode,
+                        subscriber_column,
+                        bool(subscriber),
+                        bool(names),
+                    ),
+                    _ids_params(tenant_id, subscriber_column, subscriber, names),
+                )
                 rows = cursor.fetchall()
             return [
                 str(row[0])
@@ -719,6 +2038,7 @@ def _fetch_ids_from_table(
             ]
         except Exception as exc:
             last_exc = exc
+            postgres_timeouts.rollback(conn)
             message = str(exc).lower()
             if "does not exist" in message and "column" in message:
                 continue
@@ -729,7 +2049,12 @@ def _fetch_ids_from_table(
     return []
 
 
-def _fetch_role_ids(conn, tenant_id: str, subscriber: str | None) -> list[str]:
+def _fetch_role_ids(
+    conn,
+    tenant_id: str,
+    subscriber: str | None,
+    schema: dict[str, dict[str, str]] | None = None,
+) -> list[str]:
     return _fetch_ids_from_table(
         conn,
         settings.role_table,
@@ -741,10 +2066,16 @@ def _fetch_role_ids(conn, tenant_id: str, subscriber: str | None) -> list[str]:
         settings.role_subscriber_column,
         subscriber,
         settings.default_role_names,
+        schema,
     )
 
 
-def _fetch_group_ids(conn, tenant_id: str, subscriber: str | None) -> list[str]:
+def _fetch_group_ids(
+    conn,
+    tenant_id: str,
+    subscriber: str | None,
+    schema: dict[str, dict[str, str]] | None = None,
+) -> list[str]:
     return _fetch_ids_from_table(
         conn,
         settings.group_table,
@@ -756,6 +2087,7 @@ def _fetch_group_ids(conn, tenant_id: str, subscriber: str | None) -> list[str]:
         settings.group_subscriber_column,
         subscriber,
         settings.default_group_names,
+        schema,
     )
 
 
@@ -765,7 +2097,8 @@ def _load_instances(db, instance_ids: set[str] | None = None) -> dict[str, dict]
     if instance_ids is None:
         rows = db.execute(
             """
-            SELECT id, name, pg_host, pg_port, pg_user, pg_password
+            SELECT id, name, pg_host, pg_port, pg_user, pg_password, pg_scan_partitions,
+                   pg_replica_host, pg_replica_port
             FROM instances
             """
         ).fetchall()
@@ -773,7 +2106,8 @@ def _load_instances(db, instance_ids: set[str] | None = None) -> dict[str, dict]
     placeholders = ", ".join(["?"] * len(instance_ids))
     rows = db.execute(
         f"""
-        SELECT id, name, pg_host, pg_port, pg_user, pg_password
+        SELECT id, name, pg_host, pg_port, pg_user, pg_password, pg_scan_partitions,
+               pg_replica_host, pg_replica_port
         FROM instances WHERE id IN ({placeholders})
         """,
         tuple(instance_ids),
@@ -803,27 +2137,28 @@ def _load_cached_tenants(db, instance_id: str) -> tuple[list[dict], str | None]:
     ], fetched_at
 
 
-def _save_cached_tenants(db, instance_id: str, tenants: list[dict]) -> None:
-    if not tenants:
-        return
-    fetched_at = utc_now()
-    unique: dict[str, dict] = {}
+def _write_cached_tenants(
+    db,
+    instance_id: str,
+    tenants: list[dict],
+    fetched_at: str,
+    overwrite: bool,
+    sync_id: str | None = None,
+) -> None:
+    """Write one chunk of fetched tenants; the caller owns the transaction.
+
+    A full pass keeps the first row per match value, an incremental one the latest
+    and drops the tenant's rows under any previous match value (a rename).
+    With a sync_id the rows go to tenant_cache_staging instead of tenant_cache.
+    """
+    rows = []
     for tenant in tenants:
         match_value = (tenant.get("match_value") or "").strip().lower()
-        if not match_value or match_value in unique:
+        if not match_value:
             continue
-        unique[match_value] = tenant
-    if not unique:
-        return
-    db.execute("DELETE FROM tenant_cache WHERE instance_id = ?", (instance_id,))
-    db.executemany(
-        """
-        INSERT INTO tenant_cache (
-            instance_id, match_value, tenant_id, tenant_name, subscriber, fetched_at
-        ) VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        [
+        rows.append(
             (
+                *((sync_id,) if sync_id else ()),
                 instance_id,
                 match_value,
                 tenant.get("tenant_id"),
@@ -831,36 +2166,66 @@ def _save_cached_tenants(db, instance_id: str, tenants: list[dict]) -> None:
                 tenant.get("subscriber"),
                 fetched_at,
             )
-            for match_value, tenant in unique.items()
-        ],
+        )
+    conflict = (
+        """
+        DO UPDATE SET
+            tenant_id = excluded.tenant_id,
+            tenant_name = excluded.tenant_name,
+            subscriber = excluded.subscriber,
+            fetched_at = excluded.fetched_at
+        """
+        if overwrite
+        else "DO NOTHING"
+    )
+    if sync_id:
+        # last write per sync, so init_db() can tell an abandoned sync from a running one
+        staged_at = utc_now()
+        db.executemany(
+            f"""
+            INSERT INTO tenant_cache_staging (
+                sync_id, instance_id, match_value, tenant_id, tenant_name, subscriber,
+                fetched_at, staged_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(sync_id, match_value) {conflict}
+            """,
+            [(*row, staged_at) for row in rows],
+        )
+        return
+    if overwrite:
+        db.executemany(
+            "DELETE FROM tenant_cache WHERE instance_id = ? AND tenant_id = ?",
+            [(instance_id, row[2]) for row in rows],
+        )
+    db.executemany(
+        f"""
+        INSERT INTO tenant_cache (
+            instance_id, match_value, tenant_id, tenant_name, subscriber, fetched_at
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(instance_id, match_value) {conflict}
+        """,
+        rows,
     )
-    db.commit()
-
-
-def _is_cache_fresh(fetched_at: str | None) -> bool:
-    if not fetched_at:
-        return False
-    try:
-        parsed = datetime.fromisoformat(fetched_at)
-    except ValueError:
-        return False
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    age = (datetime.now(timezone.utc) - parsed).total_seconds()
-    return age <= settings.tenant_cache_ttl_seconds
 
 
-def _is_internal_user_cache_fresh(fetched_at: str | None) -> bool:
-    if not fetched_at:
+def _is_fresh_since(at: str | None, max_age_seconds: int) -> bool:
+    if not at:
         return False
     try:
-        parsed = datetime.fromisoformat(fetched_at)
+        parsed = datetime.fromisoformat(at)
     except ValueError:
         return False
     if parsed.tzinfo is None:
         parsed = parsed.replace(tzinfo=timezone.utc)
-    age = (datetime.now(timezone.utc) - parsed).total_seconds()
-    return age <= settings.internal_user_cache_ttl_seconds
+    return (datetime.now(timezone.utc) - parsed).total_seconds() <= max_age_seconds
+
+
+def _is_cache_fresh(fetched_at: str | None) -> bool:
+    return _is_fresh_since(fetched_at, settings.tenant_cache_ttl_seconds)
+
+
+def _is_internal_user_cache_fresh(fetched_at: str | None) -> bool:
+    return _is_fresh_since(fetched_at, settings.internal_user_cache_ttl_seconds)
 
 
 def _clear_internal_user_cache(
@@ -876,7 +2241,10 @@ def _clear_internal_user_cache(
 
 
 def _resolve_internal_user_tenant(
-    instance: dict, db, payload: InternalUserCreate
+    instance: dict,
+    db,
+    payload: InternalUserCreate | InternalUserBulkItem,
+    tenant_rows: dict[str, dict] | None = None,
 ) -> tuple[str, str | None]:
     if payload.tenant_id:
         tenant_id = payload.tenant_id
@@ -888,7 +2256,7 @@ def _resolve_internal_user_tenant(
                 WHERE instance_id = ? AND tenant_id = ?
                 LIMIT 1
                 """,
-                (instance.get("id") or payload.instance_id, tenant_id),
+                (instance.get("id"), tenant_id),
             ).fetchone()
             if cached:
                 subscriber = cached["subscriber"]
@@ -900,45 +2268,65 @@ def _resolve_internal_user_tenant(
         match_value = (payload.match_name or payload.match_email or "").strip().lower()
     if not match_value:
         raise HTTPException(status_code=400, detail="Tenant match value is required.")
-    tenant_rows = _fetch_tenant_rows(instance, [match_value])
+    if tenant_rows is None:
+        tenant_rows = _fetch_tenant_rows(instance, [match_value])
     info = tenant_rows.get(match_value)
     if not info:
         raise HTTPException(status_code=404, detail="Tenant not found for internal user.")
     return info["tenant_id"], info.get("subscriber")
 
 
+def _internal_user_defaults_sql(
+    tenant_column: str, tenant_match_mode: str, with_subscriber: bool
+) -> sql.Composed:
+    query = sql.SQL(
+        "SELECT {role_ids}, {group_ids}, {status}, {verification}, "
+        "{createdby}, {updatedby}, {email_sent} FROM {table} "
+        "WHERE {account_type_col} = {account_val} AND "
+    ).format(
+        role_ids=sql.Identifier(settings.user_role_ids_column),
+        group_ids=sql.Identifier(settings.user_group_ids_column),
+        status=sql.Identifier(settings.user_status_column),
+        verification=sql.Identifier(settings.user_verification_column),
+        createdby=sql.Identifier(settings.user_createdby_column),
+        updatedby=sql.Identifier(settings.user_updatedby_column),
+        email_sent=sql.Identifier(settings.user_email_sent_column),
+        table=_table_identifier(settings.user_table),
+        account_type_col=sql.Identifier(settings.user_account_type_column),
+        account_val=sql.Placeholder(),
+    )
+    query += _match_sql(tenant_column, tenant_match_mode)
+    if with_subscriber:
+        query += sql.SQL(" AND {subscriber_col} = {subscriber_val}").format(
+            subscriber_col=sql.Identifier(settings.user_subscriber_column),
+            subscriber_val=sql.Placeholder(),
+        )
+    return query + sql.SQL(" LIMIT 1")
+
+
+def _internal_user_defaults_params(
+    tenant_id: str, subscriber: str | None, account_type_value: str
+) -> list[object]:
+    params: list[object] = [account_type_value, tenant_id]
+    if subscriber:
+        params.append(subscriber)
+    return params
+
+
 def _fetch_internal_user_defaults(
-    conn, tenant_id: str, subscriber: str | None, account_type_value: str
+    conn,
+    tenant_id: str,
+    subscriber: str | None,
+    account_type_value: str,
+    schema: dict[str, dict[str, str]] | None = None,
 ) -> dict | None:
     with conn.cursor() as cursor:
-        tenant_clause, tenant_params = _tenant_match_clause(tenant_id)
-        query = sql.SQL(
-            "SELECT {role_ids}, {group_ids}, {status}, {verification}, "
-            "{createdby}, {updatedby}, {email_sent} FROM {table} "
-            "WHERE {account_type_col} = {account_val} AND "
-        ).format(
-            role_ids=sql.Identifier(settings.user_role_ids_column),
-            group_ids=sql.Identifier(settings.user_group_ids_column),
-            status=sql.Identifier(settings.user_status_column),
-            verification=sql.Identifier(settings.user_verification_column),
-            createdby=sql.Identifier(settings.user_createdby_column),
-            updatedby=sql.Identifier(settings.user_updatedby_column),
-            email_sent=sql.Identifier(settings.user_email_sent_column),
-            table=_table_identifier(settings.user_table),
-            account_type_col=sql.Identifier(settings.user_account_type_column),
-            account_val=sql.Placeholder(),
-        )
-        params: list[object] = [account_type_value]
-        query += tenant_clause
-        params.extend(tenant_params)
-        if subscriber:
-            query += sql.SQL(" AND {subscriber_col} = {subscriber_val}").format(
-                subscriber_col=sql.Identifier(settings.user_subscriber_column),
-                subscriber_val=sql.Placeholder(),
-            )
-            params.append(subscriber)
-        query += sql.SQL(" LIMIT 1")
-        cursor.execute(query, params)
+        queries.execute(
+            cursor,
+            _internal_user_defaults_sql,
+            (*_user_tenant_column(schema), bool(subscriber)),
+            _internal_user_defaults_params(tenant_id, subscriber, account_type_value),
+        )
         row = cursor.fetchone()
         if not row:
             return None
@@ -953,6 +2341,187 @@ def _fetch_internal_user_defaults(
         }
 
 
+def _role_group_lookups() -> tuple[tuple, tuple]:
+    return (
+        (
+            settings.role_table,
+            settings.role_id_column,
+            settings.role_name_column,
+            settings.role_tenant_column,
+            settings.role_tenant_match_mode,
+            settings.role_subscriber_column,
+            settings.default_role_names,
+        ),
+        (
+            settings.group_table,
+            settings.group_id_column,
+            settings.group_name_column,
+            settings.group_tenant_column,
+            settings.group_tenant_match_mode,
+            settings.group_subscriber_column,
+            settings.default_group_names,
+        ),
+    )
+
+
+def _internal_user_values_sql(
+    user_tenant: tuple[str, str],
+    lookups: tuple[tuple | None, ...],
+    with_subscriber: bool,
+) -> sql.Composed:
+    id_arrays: list[sql.Composable] = []
+    for lookup in lookups:
+        if lookup is None:
+            id_arrays.append(sql.SQL("ARRAY[]::text[]"))
+            continue
+        id_arrays.append(
+            sql.SQL("ARRAY(SELECT CAST(ids.{id_col} AS text) FROM ({ids}) AS ids)").format(
+                id_col=sql.Identifier(lookup[1]), ids=_ids_sql(*lookup)
+            )
+        )
+    return sql.SQL(
+        "SELECT d.*, {role_ids}, {group_ids} FROM (SELECT 1) AS seed "
+        "LEFT JOIN LATERAL ({defaults}) AS d ON TRUE"
+    ).format(
+        role_ids=id_arrays[0],
+        group_ids=id_arrays[1],
+        defaults=_internal_user_defaults_sql(*user_tenant, with_subscriber),
+    )
+
+
+def _internal_user_values_query(
+    tenant_id: str,
+    subscriber: str | None,
+    account_type_value: str,
+    schema: dict[str, dict[str, str]] | None = None,
+) -> tuple[tuple, list[object]]:
+    lookups: list[tuple | None] = []
+    params: list[object] = []
+    for table, id_column, name_column, tenant_column, match_mode, subscriber_column, names in (
+        _role_group_lookups()
+    ):
+        if not table or not id_column or not tenant_column:
+            lookups.append(None)
+            continue
+        tenant_column, match_mode = _resolve_tenant_column(
+            schema, table, tenant_column, match_mode
+        ) or (tenant_column, match_mode)
+        lookups.append(
+            (
+                table,
+                id_column,
+                name_column,
+                tenant_column,
+                match_mode,
+                subscriber_column,
+                bool(subscriber),
+                bool(names),
+            )
+        )
+        params.extend(_ids_params(tenant_id, subscriber_column, subscriber, names))
+    params.extend(_internal_user_defaults_params(tenant_id, subscriber, account_type_value))
+    return (_user_tenant_column(schema), tuple(lookups), bool(subscriber)), params
+
+
+def _fetch_internal_user_values(
+    conn,
+    tenant_id: str,
+    subscriber: str | None,
+    account_type_value: str,
+    schema: dict[str, dict[str, str]] | None = None,
+) -> tuple[dict | None, list[str], list[str]]:
+    # defaults plus role/group fallbacks in one round trip
+    args, params = _internal_user_values_query(
+        tenant_id, subscriber, account_type_value, schema
+    )
+    with conn.cursor() as cursor:
+        queries.execute(cursor, _internal_user_values_sql, args, params)
+        row = cursor.fetchone()
+    defaults = None
+    if row and any(value is not None for value in row[:7]):
+        defaults = {
+            "role_ids": row[0] or [],
+            "group_ids": row[1] or [],
+            "status": row[2],
+            "verification_status": row[3],
+            "createdby": row[4],
+            "updatedby": row[5],
+            "email_sent": row[6],
+        }
+    role_ids = [str(value) for value in (row[7] or []) if value] if row else []
+    group_ids = [str(value) for value in (row[8] or []) if value] if row else []
+    return defaults, role_ids, group_ids
+
+
+def _internal_user_defaults_names_key() -> str:
+    return json.dumps([settings.default_role_names, settings.default_group_names])
+
+
+def _is_internal_user_defaults_cache_fresh(fetched_at: str | None) -> bool:
+    return _is_fresh_since(fetched_at, settings.internal_user_defaults_cache_ttl_seconds)
+
+
+def _load_cached_internal_user_values(
+    db, instance_id: str, tenant_id: str, subscriber: str, account_type: str
+) -> dict | None:
+    row = db.execute(
+        """
+        SELECT names_key, payload, fetched_at FROM internal_user_defaults_cache
+        WHERE instance_id = ? AND tenant_id = ? AND subscriber = ? AND account_type = ?
+        """,
+        (instance_id, tenant_id, subscriber, account_type),
+    ).fetchone()
+    if not row:
+        return None
+    # DEFAULT_ROLE_NAMES / DEFAULT_GROUP_NAMES changes invalidate older entries
+    if row["names_key"] != _internal_user_defaults_names_key():
+        return None
+    if not _is_internal_user_defaults_cache_fresh(row["fetched_at"]):
+        return None
+    return json.loads(row["payload"])
+
+
+def _save_cached_internal_user_values(
+    db, instance_id: str, tenant_id: str, subscriber: str, account_type: str, values: dict
+) -> None:
+    db.execute(
+        """
+        INSERT INTO internal_user_defaults_cache (
+            instance_id, tenant_id, subscriber, account_type, names_key, payload, fetched_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(instance_id, tenant_id, subscriber, account_type) DO UPDATE SET
+            names_key = excluded.names_key,
+            payload = excluded.payload,
+            fetched_at = excluded.fetched_at
+        """,
+        (
+            instance_id,
+            tenant_id,
+            subscriber,
+            account_type,
+            _internal_user_defaults_names_key(),
+            json.dumps(values),
+            utc_now(),
+        ),
+    )
+    db.commit()
+
+
+def _clear_internal_user_defaults_cache(
+    db, instance_id: str, tenant_id: str | None = None
+) -> int:
+    if tenant_id:
+        cursor = db.execute(
+            "DELETE FROM internal_user_defaults_cache WHERE instance_id = ? AND tenant_id = ?",
+            (instance_id, tenant_id),
+        )
+    else:
+        cursor = db.execute(
+            "DELETE FROM internal_user_defaults_cache WHERE instance_id = ?", (instance_id,)
+        )
+    return cursor.rowcount
+
+
 def _load_cached_internal_users(
     db, instance_id: str, tenant_id: str, subscriber: str, account_type: str
 ) -> tuple[list[dict], str | None]:
@@ -1021,6 +2590,379 @@ def _save_cached_internal_users(
 
 def _clear_tenant_cache(db, instance_id: str) -> None:
     db.execute("DELETE FROM tenant_cache WHERE instance_id = ?", (instance_id,))
+    db.execute("DELETE FROM tenant_sync_state WHERE instance_id = ?", (instance_id,))
+
+
+def _sync_tenants(db, instance_id: str, instance: dict) -> list[dict]:
+    state = db.execute(
+        """
+        SELECT watermark, watermark_column, last_full_sync_at
+        FROM tenant_sync_state WHERE instance_id = ?
+        """,
+        (instance_id,),
+    ).fetchone()
+    watermark_column = settings.tenant_updated_at_column or ""
+    incremental = (
+        settings.tenant_incremental_sync
+        and state is not None
+        and state["watermark"] is not None
+        and state["watermark_column"] == watermark_column
+        and _is_fresh_since(state["last_full_sync_at"], settings.tenant_full_sync_seconds)
+    )
+    now = utc_now()
+    # a full pass streams into staging and swaps it in at the end, so the SQLite
+    # write lock is held per chunk rather than for the whole Postgres scan
+    sync_id = uuid4().hex
+
+    def write_chunk(chunk: list[dict], incremental: bool) -> None:
+        _write_cached_tenants(
+            db, instance_id, chunk, now, incremental, None if incremental else sync_id
+        )
+        db.commit()
+
+    def fetch(incremental: bool) -> tuple[int, str | None] | None:
+        return _fetch_all_tenants(
+            instance,
+            lambda chunk: write_chunk(chunk, incremental),
+            state["watermark"] if incremental else None,
+        )
+
+    def discard_staging() -> None:
+        db.rollback()
+        db.execute("DELETE FROM tenant_cache_staging WHERE sync_id = ?", (sync_id,))
+        db.commit()
+
+    try:
+        fetched = fetch(incremental)
+        if fetched is not None and incremental and not watermark_column:
+            if int(fetched[1]) < int(state["watermark"]):
+                # xmin wrapped around; only a full pass is safe
+                incremental = False
+                fetched = fetch(incremental)
+    except Exception:
+        discard_staging()
+        raise
+    if fetched is None or (not incremental and not fetched[0]):
+        # keep the previous cache rather than a partial or empty one
+        discard_staging()
+        return []
+    changed, watermark = fetched
+    if incremental:
+        # unchanged rows are as current as the sync that just confirmed them
+        db.execute(
+            "UPDATE tenant_cache SET fetched_at = ? WHERE instance_id = ?",
+            (now, instance_id),
+        )
+        last_full_sync_at = state["last_full_sync_at"]
+    else:
+        # full pass replaces the cache, which drops tenants deleted upstream
+        db.execute("DELETE FROM tenant_cache WHERE instance_id = ?", (instance_id,))
+        db.execute(
+            """
+            INSERT INTO tenant_cache (
+                instance_id, match_value, tenant_id, tenant_name, subscriber, fetched_at
+            )
+            SELECT instance_id, match_value, tenant_id, tenant_name, subscriber, fetched_at
+            FROM tenant_cache_staging WHERE sync_id = ?
+            """,
+            (sync_id,),
+        )
+        db.execute("DELETE FROM tenant_cache_staging WHERE sync_id = ?", (sync_id,))
+        last_full_sync_at = now
+    db.execute(
+        """
+        INSERT INTO tenant_sync_state (
+            instance_id, watermark, watermark_column, last_full_sync_at, last_sync_at, changed
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(instance_id) DO UPDATE SET
+            watermark = excluded.watermark,
+            watermark_column = excluded.watermark_column,
+            last_full_sync_at = excluded.last_full_sync_at,
+            last_sync_at = excluded.last_sync_at,
+            changed = excluded.changed
+        """,
+        (instance_id, watermark, watermark_column, last_full_sync_at, now, changed),
+    )
+    db.commit()
+    tenants, _ = _load_cached_tenants(db, instance_id)
+    return tenants
+
+
+TENANT_NOTIFY_TRIGGER = "quilr_tenant_notify"
+
+
+def _expire_tenant_cache(db, instance_id: str) -> None:
+    # keeps the rows but forces the next read through _sync_tenants
+    db.execute(
+        "UPDATE tenant_cache SET fetched_at = ? WHERE instance_id = ?",
+        ("1970-01-01T00:00:00+00:00", instance_id),
+    )
+
+
+def _apply_tenant_notification(db, instance_id: str, payload: str) -> None:
+    try:
+        change = json.loads(payload)
+    except ValueError:
+        change = None
+    if not isinstance(change, dict) or not change.get("tenant_id"):
+        _expire_tenant_cache(db, instance_id)
+        return
+    tenant_id = str(change["tenant_id"])
+    # keep the instance's cache age; a patched row does not make the rest fresher
+    fetched_at = db.execute(
+        "SELECT MIN(fetched_at) AS fetched_at FROM tenant_cache WHERE instance_id = ?",
+        (instance_id,),
+    ).fetchone()["fetched_at"]
+    db.execute(
+        "DELETE FROM tenant_cache WHERE instance_id = ? AND tenant_id = ?",
+        (instance_id, tenant_id),
+    )
+    match_value = (change.get("match_value") or "").strip().lower()
+    if (change.get("op") or "").upper() == "DELETE" or not match_value:
+        return
+    db.execute(
+        """
+        INSERT INTO tenant_cache (
+            instance_id, match_value, tenant_id, tenant_name, subscriber, fetched_at
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(instance_id, match_value) DO UPDATE SET
+            tenant_id = excluded.tenant_id,
+            tenant_name = excluded.tenant_name,
+            subscriber = excluded.subscriber
+        """,
+        (
+            instance_id,
+            match_value,
+            tenant_id,
+            change.get("tenant_name"),
+            str(change["subscriber"]) if change.get("subscriber") is not None else None,
+            fetched_at or utc_now(),
+        ),
+    )
+
+
+class TenantChangeListener:
+    """Background thread that LISTENs for tenant changes on every instance's Postgres."""
+
+    def __init__(self, channel: str) -> None:
+        self._channel = channel
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._connections: dict[str, tuple[tuple, object]] = {}
+        self._status: dict[str, dict] = {}
+        self._expire_pending: set[str] = set()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="tenant-notify", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=settings.connection_timeout_seconds)
+            self._thread = None
+        for instance_id in list(self._connections):
+            self._drop(instance_id)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "channel": self._channel,
+                "running": bool(self._thread and self._thread.is_alive()),
+                "instances": {key: dict(value) for key, value in self._status.items()},
+            }
+
+    def _run(self) -> None:
+        next_refresh = 0.0
+        while not self._stop.is_set():
+            if time.monotonic() >= next_refresh:
+                try:
+                    self._refresh_connections()
+                except Exception:
+                    logger.exception("Tenant listener refresh failed")
+                next_refresh = time.monotonic() + settings.tenant_notify_reconnect_seconds
+            for instance_id in list(self._expire_pending):
+                self._deliver(instance_id, [])
+            by_fileno = {
+                conn.fileno(): (instance_id, conn)
+                for instance_id, (_, conn) in self._connections.items()
+                if not conn.closed
+            }
+            if not by_fileno:
+                self._stop.wait(1.0)
+                continue
+            try:
+                ready, _, _ = select.select(list(by_fileno), [], [], 1.0)
+            except (OSError, ValueError):
+                ready = []
+            for fileno in ready:
+                instance_id, conn = by_fileno[fileno]
+                try:
+                    conn.poll()
+                except Exception as exc:
+                    logger.warning("Tenant listener for %s lost: %s", instance_id, exc)
+                    self._drop(instance_id, error=str(exc))
+                    continue
+                notifies = list(conn.notifies)
+                conn.notifies.clear()
+                if notifies:
+                    self._deliver(instance_id, [notify.payload for notify in notifies])
+
+    def _refresh_connections(self) -> None:
+        db = connect_db()
+        try:
+            instances = _load_instances(db)
+        finally:
+            db.close()
+        for instance_id in set(self._connections) - set(instances):
+            self._drop(instance_id)
+        for instance_id, instance in instances.items():
+            if not all(
+                [instance.get("pg_host"), instance.get("pg_user"), instance.get("pg_password")]
+            ):
+                self._drop(instance_id)
+                continue
+            fingerprint = (
+                instance.get("pg_host"),
+                str(instance.get("pg_port") or 5432),
+                instance.get("pg_user"),
+                instance.get("pg_password"),
+            )
+            entry = self._connections.get(instance_id)
+            if entry and entry[0] == fingerprint and not entry[1].closed:
+                continue
+            self._drop(instance_id)
+            try:
+                conn = _connect_instance_postgres(instance)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self._channel)))
+            except Exception as exc:
+                detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+                with self._lock:
+                    self._status[instance_id] = {"listening": False, "error": detail}
+                continue
+            with self._lock:
+                self._connections[instance_id] = (fingerprint, conn)
+                self._status[instance_id] = {
+                    "listening": True,
+                    "since": utc_now(),
+                    "notifications": 0,
+                    "last_notification_at": None,
+                    "error": None,
+                }
+            # changes made while we were not listening are unknown
+            self._deliver(instance_id, [])
+
+    def _deliver(self, instance_id: str, payloads: list[str]) -> None:
+        # a failed write (e.g. "database is locked") loses these payloads, so the whole
+        # instance cache is expired on the next loop instead of killing the thread
+        try:
+            self._apply(instance_id, payloads)
+        except Exception as exc:
+            logger.warning("Tenant listener could not update cache for %s: %s", instance_id, exc)
+            self._expire_pending.add(instance_id)
+            with self._lock:
+                self._status.setdefault(instance_id, {})["error"] = str(exc)
+            return
+        if instance_id in self._expire_pending:
+            self._expire_pending.discard(instance_id)
+            with self._lock:
+                self._status.get(instance_id, {})["error"] = None
+
+    def _apply(self, instance_id: str, payloads: list[str]) -> None:
+        db = connect_db()
+        try:
+            for payload in payloads:
+                _apply_tenant_notification(db, instance_id, payload)
+            if not payloads or instance_id in self._expire_pending:
+                _expire_tenant_cache(db, instance_id)
+            db.commit()
+        finally:
+            db.close()
+        if payloads:
+            with self._lock:
+                status_entry = self._status.setdefault(instance_id, {})
+                status_entry["notifications"] = status_entry.get("notifications", 0) + len(
+                    payloads
+                )
+                status_entry["last_notification_at"] = utc_now()
+
+    def _drop(self, instance_id: str, error: str | None = None) -> None:
+        with self._lock:
+            entry = self._connections.pop(instance_id, None)
+            if error:
+                self._status[instance_id] = {"listening": False, "error": error}
+            elif entry or instance_id in self._status:
+                self._status.pop(instance_id, None)
+        if entry:
+            try:
+                entry[1].close()
+            except Exception:
+                pass
+
+
+tenant_listener = TenantChangeListener(settings.tenant_notify_channel)
+
+
+def _install_tenant_notify_trigger(instance: dict) -> dict:
+    table = _table_identifier(settings.tenant_table)
+    schema_name = _table_key(settings.tenant_table).split(".")[0]
+    function = sql.Identifier(schema_name, TENANT_NOTIFY_TRIGGER)
+    statements = [
+        sql.SQL(
+            "CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$\n"
+            "DECLARE changed record;\n"
+            "BEGIN\n"
+            "  IF TG_OP = 'DELETE' THEN changed := OLD; ELSE changed := NEW; END IF;\n"
+            "  PERFORM pg_notify({channel}, json_build_object(\n"
+            "    'op', TG_OP,\n"
+            "    'tenant_id', changed.{tenant_id},\n"
+            "    'subscriber', changed.{subscriber},\n"
+            "    'tenant_name', changed.{name},\n"
+            "    'match_value', lower(changed.{match}::text)\n"
+            "  )::text);\n"
+            "  RETURN NULL;\n"
+            "END;\n"
+            "$$ LANGUAGE plpgsql"
+        ).format(
+            function=function,
+            channel=sql.Literal(settings.tenant_notify_channel),
+            tenant_id=sql.Identifier(settings.tenant_id_column),
+            subscriber=sql.Identifier(settings.tenant_subscriber_column),
+            name=sql.Identifier(settings.tenant_name_column),
+            match=sql.Identifier(settings.tenant_match_column),
+        ),
+        sql.SQL("DROP TRIGGER IF EXISTS {trigger} ON {table}").format(
+            trigger=sql.Identifier(TENANT_NOTIFY_TRIGGER), table=table
+        ),
+        sql.SQL(
+            "CREATE TRIGGER {trigger} AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            "FOR EACH ROW EXECUTE PROCEDURE {function}()"
+        ).format(trigger=sql.Identifier(TENANT_NOTIFY_TRIGGER), table=table, function=function),
+    ]
+    with postgres_pools.connection(instance) as conn:
+        try:
+            postgres_timeouts.apply(conn, "write")
+            with conn.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+            conn.commit()
+        except Exception as exc:
+            conn.rollback()
+            raise _postgres_failure("Trigger install", exc)
+    return {
+        "ok": True,
+        "trigger": TENANT_NOTIFY_TRIGGER,
+        "table": settings.tenant_table,
+        "channel": settings.tenant_notify_channel,
+    }
 
 
 def _attach_tenant_info(customers: list[dict], instances: dict[str, dict]) -> None:
@@ -1081,12 +3023,7 @@ def _expand_customers_with_tenants(
         if not refresh and cache_fresh and cached_tenants:
             tenants = cached_tenants
         else:
-            fetched = _fetch_all_tenants(instance)
-            if fetched:
-                _save_cached_tenants(db, instance_id, fetched)
-                tenants = fetched
-            else:
-                tenants = cached_tenants
+            tenants = _sync_tenants(db, instance_id, instance) or cached_tenants
         if not tenants:
             continue
         tenant_map = {tenant["match_value"]: tenant for tenant in tenants if tenant["match_value"]}
@@ -1128,6 +3065,19 @@ def _expand_customers_with_tenants(
 @app.on_event("startup")
 def startup() -> None:
     init_db()
+    if settings.neo4j_outbox_enabled:
+        neo4j_outbox_worker.start()
+    if settings.tenant_notify_channel:
+        tenant_listener.start()
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    neo4j_outbox_worker.stop()
+    tenant_listener.stop()
+    neo4j_drivers.close_all()
+    postgres_pools.close_all()
+    password_hasher.shutdown()
 
 
 @app.get("/health")
@@ -1296,6 +3246,7 @@ def list_instances(user: dict = Depends(require_user), db=Depends(get_db)):
         SELECT id, name, base_url AS bff_url, status,
                pg_host, pg_port, pg_user, pg_password,
                neo4j_host, neo4j_port, neo4j_user, neo4j_password,
+               pg_scan_partitions, pg_replica_host, pg_replica_port,
                created_at, updated_at
         FROM instances
         """
@@ -1315,9 +3266,10 @@ def create_instance(
             id, name, base_url, status,
             pg_host, pg_port, pg_user, pg_password,
             neo4j_host, neo4j_port, neo4j_user, neo4j_password,
+            pg_scan_partitions, pg_replica_host, pg_replica_port,
             created_at, updated_at
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         (
             instance_id,
@@ -1332,6 +3284,9 @@ def create_instance(
             payload.neo4j_port,
             payload.neo4j_user,
             payload.neo4j_password,
+            payload.pg_scan_partitions,
+            payload.pg_replica_host,
+            payload.pg_replica_port,
             now,
             now,
         ),
@@ -1342,6 +3297,7 @@ def create_instance(
         SELECT id, name, base_url AS bff_url, status,
                pg_host, pg_port, pg_user, pg_password,
                neo4j_host, neo4j_port, neo4j_user, neo4j_password,
+               pg_scan_partitions, pg_replica_host, pg_replica_port,
                created_at, updated_at
         FROM instances WHERE id = ?
         """,
@@ -1362,6 +3318,7 @@ def update_instance(
         SELECT id, name, base_url AS bff_url, status,
                pg_host, pg_port, pg_user, pg_password,
                neo4j_host, neo4j_port, neo4j_user, neo4j_password,
+               pg_scan_partitions, pg_replica_host, pg_replica_port,
                created_at, updated_at
         FROM instances WHERE id = ?
         """,
@@ -1392,6 +3349,15 @@ def update_instance(
         "neo4j_password": payload.neo4j_password
         if payload.neo4j_password is not None
         else current["neo4j_password"],
+        "pg_scan_partitions": payload.pg_scan_partitions
+        if payload.pg_scan_partitions is not None
+        else current["pg_scan_partitions"],
+        "pg_replica_host": payload.pg_replica_host
+        if payload.pg_replica_host is not None
+        else current["pg_replica_host"],
+        "pg_replica_port": payload.pg_replica_port
+        if payload.pg_replica_port is not None
+        else current["pg_replica_port"],
         "updated_at": utc_now(),
     }
     db.execute(
@@ -1400,6 +3366,7 @@ def update_instance(
         SET name = ?, base_url = ?, status = ?,
             pg_host = ?, pg_port = ?, pg_user = ?, pg_password = ?,
             neo4j_host = ?, neo4j_port = ?, neo4j_user = ?, neo4j_password = ?,
+            pg_scan_partitions = ?, pg_replica_host = ?, pg_replica_port = ?,
             updated_at = ?
         WHERE id = ?
         """,
@@ -1415,17 +3382,31 @@ def update_instance(
             updated["neo4j_port"],
             updated["neo4j_user"],
             updated["neo4j_password"],
+            updated["pg_scan_partitions"],
+            updated["pg_replica_host"],
+            updated["pg_replica_port"],
             updated["updated_at"],
             instance_id,
         ),
     )
     _clear_tenant_cache(db, instance_id)
+    _clear_internal_user_defaults_cache(db, instance_id)
     db.commit()
+    postgres_schemas.discard(instance_id)
+    postgres_pools.discard(instance_id)
+    if any(
+        updated[key] != current[key]
+        for key in ("neo4j_host", "neo4j_port", "neo4j_user", "neo4j_password")
+    ):
+        neo4j_drivers.discard(instance_id)
+        _clear_neo4j_push_state(db, instance_id=instance_id)
+        db.commit()
     row = db.execute(
         """
         SELECT id, name, base_url AS bff_url, status,
                pg_host, pg_port, pg_user, pg_password,
                neo4j_host, neo4j_port, neo4j_user, neo4j_password,
+               pg_scan_partitions, pg_replica_host, pg_replica_port,
                created_at, updated_at
         FROM instances WHERE id = ?
         """,
@@ -1443,7 +3424,12 @@ def delete_instance(
         raise HTTPException(status_code=404, detail="Instance not found.")
     db.execute("UPDATE customers SET instance_id = NULL WHERE instance_id = ?", (instance_id,))
     db.execute("DELETE FROM instances WHERE id = ?", (instance_id,))
+    _clear_neo4j_push_state(db, instance_id=instance_id)
+    _clear_internal_user_defaults_cache(db, instance_id)
     db.commit()
+    neo4j_drivers.discard(instance_id)
+    postgres_schemas.discard(instance_id)
+    postgres_pools.discard(instance_id)
     return JSONResponse(status_code=status.HTTP_204_NO_CONTENT, content=None)
 
 
@@ -1512,6 +3498,8 @@ def list_internal_users(
 @app.post("/api/customers/{customer_id}/neo4j")
 def push_customer_to_neo4j(
     customer_id: str,
+    force: bool = Query(False),
+    queue: bool = Query(False),
     user: dict = Depends(require_user),
     db=Depends(get_db),
 ):
@@ -1540,87 +3528,233 @@ def push_customer_to_neo4j(
     ).fetchone()
     if not instance_row:
         raise HTTPException(status_code=404, detail="Instance not found.")
+    if not (
+        instance_row["neo4j_host"]
+        and instance_row["neo4j_user"]
+        and instance_row["neo4j_password"]
+    ):
+        raise HTTPException(status_code=400, detail="Neo4j credentials are missing.")
+    if queue:
+        if not settings.neo4j_outbox_enabled:
+            raise HTTPException(status_code=400, detail="Neo4j outbox is disabled.")
+        outbox_id = _enqueue_neo4j_push(db, instance_id, customer_id, "push", force=force)
+        db.commit()
+        return {"ok": True, "queued": True, "outbox_id": outbox_id}
     instance = _row_to_dict(instance_row)
-    instances = _load_instances(db, {instance_id})
-    _attach_tenant_info([customer], instances)
+    _attach_tenant_info([customer], _load_instances(db, {instance_id}))
     tenant_id = customer.get("tenant_id")
-    subscriber = customer.get("subscriber")
-    tenant_name = customer.get("tenant_name") or tenant_id
     if not tenant_id:
         raise HTTPException(status_code=400, detail="Tenant details are missing.")
-    _push_customer_to_neo4j(instance, customer, tenant_id, subscriber, tenant_name or "")
-    return {"ok": True}
+    result = _push_customer_to_neo4j(
+        instance,
+        customer,
+        tenant_id,
+        customer.get("subscriber"),
+        customer.get("tenant_name") or tenant_id,
+        db=db,
+        force=force,
+    )
+    return {"ok": True, "skipped": result is None}
 
 
-@app.get("/api/internal-users", response_model=list[InternalUserOut])
-def list_internal_users_by_tenant(
-    instance_id: str = Query(...),
-    tenant_id: str = Query(...),
-    subscriber: str | None = Query(None),
-    refresh: bool = Query(False),
-    account_type: str | None = Query(None),
+@app.post("/api/instances/{instance_id}/neo4j/schema")
+def bootstrap_instance_neo4j_schema(
+    instance_id: str,
     user: dict = Depends(require_user),
     db=Depends(get_db),
 ):
-    row = db.execute(
+    instance_row = db.execute(
         """
-        SELECT pg_host, pg_port, pg_user, pg_password
+        SELECT id, name, neo4j_host, neo4j_port, neo4j_user, neo4j_password
         FROM instances WHERE id = ?
         """,
         (instance_id,),
     ).fetchone()
-    if not row:
+    if not instance_row:
         raise HTTPException(status_code=404, detail="Instance not found.")
-    instance = _row_to_dict(row)
-    resolved_subscriber = subscriber
-    if not resolved_subscriber:
-        cached = db.execute(
-            """
-            SELECT subscriber FROM tenant_cache
-            WHERE instance_id = ? AND tenant_id = ?
-            LIMIT 1
-            """,
-            (instance_id, tenant_id),
-        ).fetchone()
-        if cached:
-            resolved_subscriber = cached["subscriber"]
-    subscriber_key = (resolved_subscriber or "").strip()
-    account_type_value = account_type or settings.user_account_type_value
-    cached_users, fetched_at = _load_cached_internal_users(
-        db, instance_id, tenant_id, subscriber_key, account_type_value
-    )
-    if not refresh and cached_users and _is_internal_user_cache_fresh(fetched_at):
-        return [InternalUserOut(**user_row) for user_row in cached_users]
-    users = _fetch_internal_users(instance, tenant_id, resolved_subscriber, account_type_value)
-    _save_cached_internal_users(
-        db, instance_id, tenant_id, subscriber_key, account_type_value, users
-    )
-    return [InternalUserOut(**user_row) for user_row in users]
+    result = _bootstrap_neo4j_schema(_row_to_dict(instance_row))
+    return {"ok": not result["failed"], **result}
 
 
-@app.post("/api/internal-users", response_model=InternalUserOut)
-def create_internal_user(
-    payload: InternalUserCreate,
+@app.post("/api/instances/{instance_id}/neo4j")
+def push_instance_customers_to_neo4j(
+    instance_id: str,
+    tenant_id: str | None = Query(None),
+    chunk_size: int | None = Query(None, ge=1),
+    force: bool = Query(False),
     user: dict = Depends(require_user),
     db=Depends(get_db),
 ):
-    row = db.execute(
+    instance_row = db.execute(
         """
-        SELECT id, pg_host, pg_port, pg_user, pg_password
+        SELECT id, name, neo4j_host, neo4j_port, neo4j_user, neo4j_password
         FROM instances WHERE id = ?
         """,
-        (payload.instance_id,),
+        (instance_id,),
     ).fetchone()
-    if not row:
+    if not instance_row:
         raise HTTPException(status_code=404, detail="Instance not found.")
-    instance = _row_to_dict(row)
-    required = [instance.get("pg_host"), instance.get("pg_user"), instance.get("pg_password")]
-    if not all(required):
-        raise HTTPException(
-            status_code=400, detail="Instance Postgres credentials are missing."
+    instance = _row_to_dict(instance_row)
+    rows = db.execute(
+        """
+        SELECT id, name, first_name, last_name, department, vendor,
+               contact_email, instance_id
+        FROM customers WHERE instance_id = ?
+        """,
+        (instance_id,),
+    ).fetchall()
+    customers = [_row_to_dict(row) for row in rows]
+    _attach_tenant_info(customers, _load_instances(db, {instance_id}))
+    if tenant_id:
+        customers = [
+            customer for customer in customers if customer.get("tenant_id") == tenant_id
+        ]
+    force_ids = {customer["id"] for customer in customers} if force else set()
+    result = _push_customers_batch(db, instance, customers, chunk_size, force_ids)
+    return {"ok": not result["failed_ids"], **result}
+
+
+@app.get("/api/neo4j/outbox")
+def get_neo4j_outbox(
+    instance_id: str | None = Query(None),
+    user: dict = Depends(require_user),
+    db=Depends(get_db),
+) -> dict:
+    filters = "WHERE instance_id = ?" if instance_id else ""
+    params = (instance_id,) if instance_id else ()
+    rows = db.execute(
+        f"""
+        SELECT instance_id,
+               SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) AS pending,
+               SUM(CASE WHEN status = 'claimed' THEN 1 ELSE 0 END) AS claimed,
+               SUM(CASE WHEN status = 'dead' THEN 1 ELSE 0 END) AS dead,
+               MIN(CASE WHEN status = 'pending' THEN created_at END) AS oldest_pending_at,
+               MAX(CASE WHEN status IN ('done', 'skipped') THEN updated_at END)
+                   AS last_processed_at
+        FROM neo4j_outbox {filters}
+        GROUP BY instance_id
+        """,
+        params,
+    ).fetchall()
+    now = datetime.now(timezone.utc)
+    instances: dict[str, dict] = {}
+    for row in rows:
+        summary = _row_to_dict(row)
+        oldest = summary.get("oldest_pending_at")
+        summary["lag_seconds"] = (
+            round((now - datetime.fromisoformat(oldest)).total_seconds(), 1)
+            if oldest
+            else 0.0
         )
+        instances[summary.pop("instance_id")] = summary
+    dead_rows = db.execute(
+        f"""
+        SELECT id, instance_id, customer_id, action, attempts, last_error, updated_at
+        FROM neo4j_outbox
+        {filters + " AND" if filters else "WHERE"} status = 'dead'
+        ORDER BY id DESC LIMIT 100
+        """,
+        params,
+    ).fetchall()
+    return {
+        "instances": instances,
+        "dead_letters": [_row_to_dict(row) for row in dead_rows],
+    }
+
+
+@app.post("/api/neo4j/outbox/{entry_id}/retry")
+def retry_neo4j_outbox_entry(
+    entry_id: int,
+    user: dict = Depends(require_user),
+    db=Depends(get_db),
+) -> dict:
+    now = utc_now()
+    cursor = db.execute(
+        """
+        UPDATE neo4j_outbox
+        SET status = 'pending', attempts = 0, next_attempt_at = ?, updated_at = ?
+        WHERE id = ? AND status = 'dead'
+        """,
+        (now, now, entry_id),
+    )
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Dead-lettered outbox entry not found.")
+    db.commit()
+    return {"ok": True}
+
+
+@app.get("/api/internal-users", response_model=list[InternalUserOut])
+def list_internal_users_by_tenant(
+    instance_id: str = Query(...),
+    tenant_id: str = Query(...),
+    subscriber: str | None = Query(None),
+    refresh: bool = Query(False),
+    account_type: str | None = Query(None),
+    user: dict = Depends(require_user),
+    db=Depends(get_db),
+):
+    row = db.execute(
+        """
+        SELECT id, pg_host, pg_port, pg_user, pg_password, pg_replica_host, pg_replica_port
+        FROM instances WHERE id = ?
+        """,
+        (instance_id,),
+    ).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Instance not found.")
+    instance = _row_to_dict(row)
+    resolved_subscriber = subscriber
+    if not resolved_subscriber:
+        cached = db.execute(
+            """
+            SELECT subscriber FROM tenant_cache
+            WHERE instance_id = ? AND tenant_id = ?
+            LIMIT 1
+            """,
+            (instance_id, tenant_id),
+        ).fetchone()
+        if cached:
+            resolved_subscriber = cached["subscriber"]
+    subscriber_key = (resolved_subscriber or "").strip()
+    account_type_value = account_type or settings.user_account_type_value
+    cached_users, fetched_at = _load_cached_internal_users(
+        db, instance_id, tenant_id, subscriber_key, account_type_value
+    )
+    if not refresh and cached_users and _is_internal_user_cache_fresh(fetched_at):
+        return [InternalUserOut(**user_row) for user_row in cached_users]
+    users = _fetch_internal_users(instance, tenant_id, resolved_subscriber, account_type_value)
+    _save_cached_internal_users(
+        db, instance_id, tenant_id, subscriber_key, account_type_value, users
+    )
+    return [InternalUserOut(**user_row) for user_row in users]
+
+
+@app.post("/api/internal-users", response_model=InternalUserOut)
+async def create_internal_user(
+    payload: InternalUserCreate,
+    user: dict = Depends(require_user),
+    db=Depends(get_db),
+):
+    instance, account_type_value, raw_password = await run_in_threadpool(
+        _prepare_internal_user_create, db, payload
+    )
+    hashed = await password_hasher.hash_async(raw_password)
+    return await run_in_threadpool(
+        _insert_internal_user, db, payload, instance, account_type_value, hashed
+    )
+
+
+def _prepare_internal_user_create(
+    db, payload: InternalUserCreate
+) -> tuple[dict, str, str]:
+    instance = _load_internal_user_instance(db, payload.instance_id)
     account_type_value = payload.account_type or settings.user_account_type_value
-    raw_password = (payload.password or "").strip()
+    raw_password = _internal_user_password(account_type_value, payload.password)
+    return instance, account_type_value, raw_password
+
+
+def _internal_user_password(account_type_value: str, password: str | None) -> str:
+    raw_password = (password or "").strip()
     if account_type_value == settings.user_account_type_value:
         if not raw_password:
             raise HTTPException(status_code=400, detail="Password is required.")
@@ -1631,10 +3765,12 @@ def create_internal_user(
             raise HTTPException(status_code=400, detail="Password must be at least 8 characters.")
         if not raw_password:
             raw_password = uuid4().hex
-    tenant_id, subscriber = _resolve_internal_user_tenant(instance, db, payload)
-    subscriber_key = (subscriber or "").strip()
+    return raw_password
+
+
+def _connect_instance_postgres(instance: dict):
     try:
-        conn = psycopg2.connect(
+        return psycopg2.connect(
             host=instance.get("pg_host"),
             port=instance.get("pg_port") or 5432,
             user=instance.get("pg_user"),
@@ -1646,103 +3782,158 @@ def create_internal_user(
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Postgres connection failed: {exc}")
 
-    hashed = bcrypt.hashpw(raw_password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+def _resolve_internal_user_values(
+    db,
+    instance: dict,
+    conn,
+    tenant_id: str,
+    subscriber: str | None,
+    account_type_value: str,
+) -> dict:
+    instance_id = instance["id"]
+    subscriber_key = (subscriber or "").strip()
+    cached = _load_cached_internal_user_values(
+        db, instance_id, tenant_id, subscriber_key, account_type_value
+    )
+    if cached is not None:
+        return cached
+    schema = postgres_schemas.get(instance, conn)
+    postgres_timeouts.apply(conn, "defaults")
     try:
-        defaults = _fetch_internal_user_defaults(conn, tenant_id, subscriber, account_type_value)
+        defaults, role_ids, group_ids = _fetch_internal_user_values(
+            conn, tenant_id, subscriber, account_type_value, schema
+        )
+        role_ids = (defaults or {}).get("role_ids") or role_ids
+        group_ids = (defaults or {}).get("group_ids") or group_ids
+    except Exception as exc:
+        if postgres_timeouts.is_timeout(exc):
+            # the sequential lookups would only hit the same wall, one query at a time
+            raise
+        # tables that could not be introspected still need the column probing below
+        logger.warning("Combined internal user defaults lookup failed: %s", exc)
+        postgres_timeouts.rollback(conn)
+        defaults = _fetch_internal_user_defaults(
+            conn, tenant_id, subscriber, account_type_value, schema
+        )
         role_ids = (defaults or {}).get("role_ids") or []
         group_ids = (defaults or {}).get("group_ids") or []
         if not role_ids:
-            role_ids = _fetch_role_ids(conn, tenant_id, subscriber)
+            role_ids = _fetch_role_ids(conn, tenant_id, subscriber, schema)
         if not group_ids:
-            group_ids = _fetch_group_ids(conn, tenant_id, subscriber)
-        status_value = (defaults or {}).get("status") or settings.internal_user_default_status
-        verification_value = (defaults or {}).get("verification_status") or (
-            settings.internal_user_default_verification_status
-        )
-        createdby_value = (defaults or {}).get("createdby") or (
-            settings.internal_user_default_createdby
-        )
-        updatedby_value = (defaults or {}).get("updatedby") or (
-            settings.internal_user_default_updatedby
-        )
-        email_sent_value = (
-            (defaults or {}).get("email_sent")
+            group_ids = _fetch_group_ids(conn, tenant_id, subscriber, schema)
+    values = {
+        "role_ids": role_ids,
+        "group_ids": group_ids,
+        "status": (defaults or {}).get("status") or settings.internal_user_default_status,
+        "verification_status": (defaults or {}).get("verification_status")
+        or settings.internal_user_default_verification_status,
+        "createdby": (defaults or {}).get("createdby")
+        or settings.internal_user_default_createdby,
+        "updatedby": (defaults or {}).get("updatedby")
+        or settings.internal_user_default_updatedby,
+        "email_sent": (
+            defaults.get("email_sent")
             if defaults and defaults.get("email_sent") is not None
             else settings.internal_user_default_email_sent
+        ),
+    }
+    # a tenant without roles yet is usually still being provisioned, so don't pin that
+    if role_ids:
+        _save_cached_internal_user_values(
+            db, instance_id, tenant_id, subscriber_key, account_type_value, values
         )
-        with conn.cursor() as cursor:
-            query = sql.SQL(
-                "INSERT INTO {table} ("
-                "{first_name}, {last_name}, {username}, {email}, {password}, "
-                "{subscriber_col}, {tenant_col}, {role_col}, {group_col}, "
-                "{status_col}, {verification_col}, {createdby_col}, {updatedby_col}, "
-                "{account_type_col}, {email_sent_col}"
-                ") VALUES ("
-                "{first_val}, {last_val}, {username_val}, {email_val}, {password_val}, "
-                "{subscriber_val}, {tenant_val}, {role_val}, {group_val}, "
-                "{status_val}, {verification_val}, {createdby_val}, {updatedby_val}, "
-                "{account_type_val}, {email_sent_val}"
-                ") RETURNING {user_id_col}"
-            ).format(
-                table=_table_identifier(settings.user_table),
-                first_name=sql.Identifier(settings.user_first_name_column),
-                last_name=sql.Identifier(settings.user_last_name_column),
-                username=sql.Identifier(settings.user_username_column),
-                email=sql.Identifier(settings.user_email_column),
-                password=sql.Identifier(settings.user_password_column),
-                subscriber_col=sql.Identifier(settings.user_subscriber_column),
-                tenant_col=sql.Identifier(settings.user_tenant_column),
-                role_col=sql.Identifier(settings.user_role_ids_column),
-                group_col=sql.Identifier(settings.user_group_ids_column),
-                status_col=sql.Identifier(settings.user_status_column),
-                verification_col=sql.Identifier(settings.user_verification_column),
-                createdby_col=sql.Identifier(settings.user_createdby_column),
-                updatedby_col=sql.Identifier(settings.user_updatedby_column),
-                account_type_col=sql.Identifier(settings.user_account_type_column),
-                email_sent_col=sql.Identifier(settings.user_email_sent_column),
-                first_val=sql.Placeholder(),
-                last_val=sql.Placeholder(),
-                username_val=sql.Placeholder(),
-                email_val=sql.Placeholder(),
-                password_val=sql.Placeholder(),
-                subscriber_val=sql.Placeholder(),
-                tenant_val=sql.Placeholder(),
-                role_val=sql.Placeholder(),
-                group_val=sql.Placeholder(),
-                status_val=sql.Placeholder(),
-                verification_val=sql.Placeholder(),
-                createdby_val=sql.Placeholder(),
-                updatedby_val=sql.Placeholder(),
-                account_type_val=sql.Placeholder(),
-                email_sent_val=sql.Placeholder(),
-                user_id_col=sql.Identifier(settings.user_id_column),
-            )
-            cursor.execute(
-                query,
-                (
-                    payload.first_name.strip(),
-                    payload.last_name.strip(),
-                    payload.username.strip(),
-                    payload.email.strip(),
-                    hashed,
-                    subscriber,
-                    [tenant_id],
-                    role_ids,
-                    group_ids,
-                    status_value,
-                    verification_value,
-                    createdby_value,
-                    updatedby_value,
-                    account_type_value,
-                    email_sent_value,
-                ),
+    return values
+
+
+def _internal_user_insert_sql(multi_row: bool) -> sql.Composed:
+    columns = [
+        settings.user_first_name_column,
+        settings.user_last_name_column,
+        settings.user_username_column,
+        settings.user_email_column,
+        settings.user_password_column,
+        settings.user_subscriber_column,
+        settings.user_tenant_column,
+        settings.user_role_ids_column,
+        settings.user_group_ids_column,
+        settings.user_status_column,
+        settings.user_verification_column,
+        settings.user_createdby_column,
+        settings.user_updatedby_column,
+        settings.user_account_type_column,
+        settings.user_email_sent_column,
+    ]
+    # execute_values expands a single %s into the row list
+    values = (
+        sql.SQL("%s")
+        if multi_row
+        else sql.SQL("({})").format(sql.SQL(", ").join(sql.Placeholder() * len(columns)))
+    )
+    return sql.SQL("INSERT INTO {table} ({columns}) VALUES {values} RETURNING {user_id_col}").format(
+        table=_table_identifier(settings.user_table),
+        columns=sql.SQL(", ").join(sql.Identifier(column) for column in columns),
+        values=values,
+        user_id_col=sql.Identifier(settings.user_id_column),
+    )
+
+
+def _internal_user_row(
+    payload: InternalUserCreate | InternalUserBulkItem,
+    hashed: str,
+    tenant_id: str,
+    subscriber: str | None,
+    account_type_value: str,
+    values: dict,
+) -> tuple:
+    return (
+        payload.first_name.strip(),
+        payload.last_name.strip(),
+        payload.username.strip(),
+        payload.email.strip(),
+        hashed,
+        subscriber,
+        [tenant_id],
+        values["role_ids"],
+        values["group_ids"],
+        values["status"],
+        values["verification_status"],
+        values["createdby"],
+        values["updatedby"],
+        account_type_value,
+        values["email_sent"],
+    )
+
+
+def _insert_internal_user(
+    db,
+    payload: InternalUserCreate,
+    instance: dict,
+    account_type_value: str,
+    hashed: str,
+) -> InternalUserOut:
+    tenant_id, subscriber = _resolve_internal_user_tenant(instance, db, payload)
+    subscriber_key = (subscriber or "").strip()
+    with postgres_pools.connection(instance) as conn:
+        try:
+            values = _resolve_internal_user_values(
+                db, instance, conn, tenant_id, subscriber, account_type_value
             )
-            user_id = cursor.fetchone()[0]
-            conn.commit()
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Internal user create failed: {exc}")
-    finally:
-        conn.close()
+            postgres_timeouts.apply(conn, "write")
+            with conn.cursor() as cursor:
+                queries.execute(
+                    cursor,
+                    _internal_user_insert_sql,
+                    (False,),
+                    _internal_user_row(
+                        payload, hashed, tenant_id, subscriber, account_type_value, values
+                    ),
+                )
+                user_id = cursor.fetchone()[0]
+                conn.commit()
+            postgres_pools.note_write(instance)
+        except Exception as exc:
+            raise _postgres_failure("Internal user create", exc)
     _clear_internal_user_cache(
         db, payload.instance_id, tenant_id, subscriber_key, account_type_value
     )
@@ -1754,20 +3945,568 @@ def create_internal_user(
     )
 
 
+@app.post("/api/internal-users/bulk", response_model=InternalUserBulkOut)
+async def create_internal_users_bulk(
+    payload: InternalUserBulkCreate,
+    user: dict = Depends(require_user),
+    db=Depends(get_db),
+):
+    instance, pending, results = await run_in_threadpool(
+        _prepare_internal_user_bulk, db, payload
+    )
+    hashes = await asyncio.gather(
+        *(password_hasher.hash_async(entry["password"]) for entry in pending),
+        return_exceptions=True,
+    )
+    ready = []
+    for entry, hashed in zip(pending, hashes):
+        if isinstance(hashed, BaseException):
+            results[entry["index"]].error = f"Password hashing failed: {hashed}"
+            continue
+        entry["hashed"] = hashed
+        ready.append(entry)
+    if ready:
+        await run_in_threadpool(
+            _insert_internal_users_bulk, db, payload.instance_id, instance, ready, results
+        )
+    created = sum(1 for result in results if result.ok)
+    return InternalUserBulkOut(created=created, failed=len(results) - created, results=results)
+
+
+def _prepare_internal_user_bulk(
+    db, payload: InternalUserBulkCreate
+) -> tuple[dict, list[dict], list[InternalUserBulkResult]]:
+    instance = _load_internal_user_instance(db, payload.instance_id)
+    results = [
+        InternalUserBulkResult(
+            index=index,
+            name=_compose_name(item.first_name, item.last_name),
+            email=item.email,
+        )
+        for index, item in enumerate(payload.users)
+    ]
+    match_column = settings.tenant_match_column.lower()
+    match_values: set[str] = set()
+    for item in payload.users:
+        if item.tenant_id:
+            continue
+        if match_column in {"email", "contact_email"}:
+            value = (item.match_email or item.match_name or "").strip().lower()
+        else:
+            value = (item.match_name or item.match_email or "").strip().lower()
+        if value:
+            match_values.add(value)
+    # one tenant lookup for every user that is matched by name/email
+    tenant_rows = _fetch_tenant_rows(instance, sorted(match_values)) if match_values else {}
+    pending: list[dict] = []
+    seen_emails: set[str] = set()
+    seen_usernames: set[str] = set()
+    for index, item in enumerate(payload.users):
+        result = results[index]
+        email_key = str(item.email).strip().lower()
+        username_key = item.username.strip().lower()
+        if email_key in seen_emails or username_key in seen_usernames:
+            result.error = "Duplicate email or username in request."
+            continue
+        seen_emails.add(email_key)
+        seen_usernames.add(username_key)
+        account_type_value = item.account_type or settings.user_account_type_value
+        result.account_type = account_type_value
+        try:
+            password = _internal_user_password(account_type_value, item.password)
+            tenant_id, subscriber = _resolve_internal_user_tenant(
+                instance, db, item, tenant_rows
+            )
+        except HTTPException as exc:
+            result.error = exc.detail
+            continue
+        pending.append(
+            {
+                "index": index,
+                "item": item,
+                "password": password,
+                "tenant_id": tenant_id,
+                "subscriber": subscriber,
+                "account_type": account_type_value,
+            }
+        )
+    return instance, pending, results
+
+
+def _insert_internal_users_bulk(
+    db,
+    instance_id: str,
+    instance: dict,
+    entries: list[dict],
+    results: list[InternalUserBulkResult],
+) -> None:
+    groups: dict[tuple, list[dict]] = {}
+    for entry in entries:
+        key = (entry["tenant_id"], entry["subscriber"], entry["account_type"])
+        groups.setdefault(key, []).append(entry)
+    try:
+        with postgres_pools.connection(instance) as conn:
+            inserted = _insert_internal_user_rows(db, conn, instance, groups, entries, results)
+    except HTTPException as exc:
+        for entry in entries:
+            results[entry["index"]].error = exc.detail
+        return
+    if inserted is None:
+        return
+    for entry, inserted_row in inserted:
+        result = results[entry["index"]]
+        result.id = str(inserted_row[0])
+        result.ok = True
+    for tenant_id, subscriber, account_type_value in groups:
+        _clear_internal_user_cache(
+            db, instance_id, tenant_id, (subscriber or "").strip(), account_type_value
+        )
+    db.commit()
+
+
+def _insert_internal_user_rows(
+    db,
+    conn,
+    instance: dict,
+    groups: dict[tuple, list[dict]],
+    entries: list[dict],
+    results: list[InternalUserBulkResult],
+) -> list[tuple[dict, tuple]] | None:
+    """Insert the users of every group, isolating failures per group and then per row.
+
+    Each group's multi-row INSERT runs under a SAVEPOINT; when it fails the group is
+    retried row by row so only the offending rows report an error. Returns None when
+    the final commit fails and nothing was written.
+    """
+    resolved: list[tuple[list[dict], list[tuple]]] = []
+    for (tenant_id, subscriber, account_type_value), group in groups.items():
+        try:
+            values = _resolve_internal_user_values(
+                db, instance, conn, tenant_id, subscriber, account_type_value
+            )
+        except Exception as exc:
+            # nothing is written yet, so dropping the read transaction loses nothing
+            conn.rollback()
+            error = _postgres_failure("Internal user create", exc).detail
+            for entry in group:
+                results[entry["index"]].error = error
+            continue
+        rows = [
+            _internal_user_row(
+                entry["item"], entry["hashed"], tenant_id, subscriber, account_type_value, values
+            )
+            for entry in group
+        ]
+        resolved.append((group, rows))
+    # the lookups above may have rolled back; start the writes in a fresh transaction
+    conn.rollback()
+    if not resolved:
+        return []
+    inserted: list[tuple[dict, tuple]] = []
+    try:
+        postgres_timeouts.apply(conn, "write")
+        with conn.cursor() as cursor:
+            for group, rows in resolved:
+                cursor.execute("SAVEPOINT bulk_group")
+                try:
+                    query = queries.render(conn, _internal_user_insert_sql, (True,))
+                    returned = execute_values(
+                        cursor, query, rows, page_size=len(rows), fetch=True
+                    )
+                except Exception as exc:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_group")
+                    if postgres_timeouts.is_timeout(exc) or len(rows) == 1:
+                        error = _postgres_failure("Internal user create", exc).detail
+                        for entry in group:
+                            results[entry["index"]].error = error
+                        continue
+                    inserted.extend(
+                        _insert_internal_user_rows_one_by_one(cursor, group, rows, results)
+                    )
+                    continue
+                cursor.execute("RELEASE SAVEPOINT bulk_group")
+                inserted.extend(zip(group, returned))
+        conn.commit()
+        postgres_pools.note_write(instance)
+    except Exception as exc:
+        conn.rollback()
+        error = _postgres_failure("Internal user create", exc).detail
+        for entry in entries:
+            results[entry["index"]].error = results[entry["index"]].error or error
+        return None
+    return inserted
+
+
+def _insert_internal_user_rows_one_by_one(
+    cursor, group: list[dict], rows: list[tuple], results: list[InternalUserBulkResult]
+) -> list[tuple[dict, tuple]]:
+    inserted: list[tuple[dict, tuple]] = []
+    for entry, row in zip(group, rows):
+        cursor.execute("SAVEPOINT bulk_row")
+        try:
+            queries.execute(cursor, _internal_user_insert_sql, (False,), row)
+            returned = cursor.fetchone()
+        except Exception as exc:
+            cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+            results[entry["index"]].error = _postgres_failure("Internal user create", exc).detail
+            continue
+        cursor.execute("RELEASE SAVEPOINT bulk_row")
+        inserted.append((entry, returned))
+    return inserted
+
+
+@app.get("/api/tenant-notify")
+def get_tenant_notify_status(user: dict = Depends(require_user)) -> dict:
+    return tenant_listener.status()
+
+
+@app.post("/api/instances/{instance_id}/tenant-notify/trigger")
+def install_tenant_notify_trigger(
+    instance_id: str, user: dict = Depends(require_user), db=Depends(get_db)
+) -> dict:
+    if not settings.tenant_notify_channel:
+        raise HTTPException(status_code=400, detail="TENANT_NOTIFY_CHANNEL is not configured.")
+    return _install_tenant_notify_trigger(_load_internal_user_instance(db, instance_id))
+
+
+@app.get("/api/instances/{instance_id}/postgres/schema")
+def get_instance_postgres_schema(
+    instance_id: str,
+    refresh: bool = Query(False),
+    user: dict = Depends(require_user),
+    db=Depends(get_db),
+) -> dict:
+    instance = _load_internal_user_instance(db, instance_id)
+    if refresh:
+        postgres_schemas.discard(instance_id)
+    with postgres_pools.connection(instance) as conn:
+        schema = postgres_schemas.get(instance, conn)
+    return {"tables": _describe_configured_columns(schema)}
+
+
+@app.get("/api/instances/{instance_id}/postgres/explain")
+def explain_instance_postgres_queries(
+    instance_id: str,
+    user: dict = Depends(require_user),
+    db=Depends(get_db),
+) -> dict:
+    instance = _load_internal_user_instance(db, instance_id)
+    with postgres_pools.read_connection(instance) as (conn, source):
+        schema = postgres_schemas.get(instance, conn)
+        postgres_timeouts.apply(conn, "defaults", read_only=True)
+        sample = _explain_sample(conn)
+        plans = []
+        for name, builder, args, params in _explain_templates(schema, sample):
+            plans.append(_explain_template(conn, name, builder, args, params))
+            if plans[-1]["error"]:
+                postgres_timeouts.rollback(conn)
+        existing = _existing_indexes(conn)
+        suggestions = _index_suggestions(conn, schema, existing, plans)
+    return {
+        "server": "replica" if source is not instance else "primary",
+        "sample": sample,
+        "templates": plans,
+        "suggestions": suggestions,
+    }
+
+
+def _explain_sample(conn) -> dict:
+    """One real tenant to fill placeholders with, so plans reflect realistic values."""
+    sample = {
+        "tenant_id": "00000000-0000-0000-0000-000000000000",
+        "subscriber": "00000000-0000-0000-0000-000000000000",
+        "match_value": "example.com",
+    }
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                sql.SQL("SELECT {tenant_id}, {subscriber}, lower({match}) FROM {table} LIMIT 1")
+                .format(
+                    tenant_id=sql.Identifier(settings.tenant_id_column),
+                    subscriber=sql.Identifier(settings.tenant_subscriber_column),
+                    match=sql.Identifier(settings.tenant_match_column),
+                    table=_table_identifier(settings.tenant_table),
+                )
+            )
+            row = cursor.fetchone()
+    except Exception as exc:
+        logger.warning("Explain sample lookup failed: %s", exc)
+        postgres_timeouts.rollback(conn)
+        return sample
+    if row:
+        sample.update(
+            {
+                "tenant_id": str(row[0]),
+                "subscriber": str(row[1]) if row[1] is not None else sample["subscriber"],
+                "match_value": row[2] or sample["match_value"],
+            }
+        )
+    return sample
+
+
+def _explain_templates(
+    schema: dict[str, dict[str, str]], sample: dict
+) -> list[tuple[str, object, tuple, list[object]]]:
+    tenant_id, subscriber = sample["tenant_id"], sample["subscriber"]
+    watermark_column = settings.tenant_updated_at_column or None
+    user_tenant = _user_tenant_column(schema)
+    account_type_value = settings.user_account_type_value
+    values_args, values_params = _internal_user_values_query(
+        tenant_id, subscriber, account_type_value, schema
+    )
+    return [
+        ("tenant_rows", _tenant_rows_sql, (), [[sample["match_value"]]]),
+        ("all_tenants", _all_tenants_sql, (watermark_column, False, False), []),
+        (
+            "all_tenants_incremental",
+            _all_tenants_sql,
+            (watermark_column, True, False),
+            ["1970-01-01T00:00:00+00:00" if watermark_column else 0],
+        ),
+        (
+            "internal_users",
+            _internal_users_sql,
+            (*user_tenant, True),
+            [account_type_value, tenant_id, subscriber],
+        ),
+        (
+            "internal_users_without_subscriber",
+            _internal_users_sql,
+            (*user_tenant, False),
+            [settings.user_account_type_oauth_value, tenant_id],
+        ),
+        ("internal_user_values", _internal_user_values_sql, values_args, values_params),
+    ]
+
+
+def _plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans") or []:
+        yield from _plan_nodes(child)
+
+
+def _explain_template(conn, name: str, builder, args: tuple, params: list[object]) -> dict:
+    result: dict = {
+        "template": name,
+        "sql": None,
+        "total_cost": None,
+        "estimated_rows": None,
+        "seq_scans": [],
+        "indexes_used": [],
+        "error": None,
+    }
+    try:
+        text = queries.render(conn, builder, args)
+        result["sql"] = text
+        with conn.cursor() as cursor:
+            # ANALYZE off: the statement is planned, never executed
+            cursor.execute(f"EXPLAIN (ANALYZE false, FORMAT JSON) {text}", params)
+            explained = cursor.fetchone()[0]
+    except Exception as exc:
+        result["error"] = postgres_timeouts.describe(exc) or str(exc).strip()
+        return result
+    if isinstance(explained, str):
+        explained = json.loads(explained)
+    plan = explained[0]["Plan"]
+    nodes = list(_plan_nodes(plan))
+    result.update(
+        {
+            "total_cost": plan.get("Total Cost"),
+            "estimated_rows": plan.get("Plan Rows"),
+            "seq_scans": [
+                {
+                    "relation": node.get("Relation Name"),
+                    "filter": node.get("Filter"),
+                    "cost": node.get("Total Cost"),
+                    "estimated_rows": node.get("Plan Rows"),
+                }
+                for node in nodes
+                if node.get("Node Type") == "Seq Scan"
+            ],
+            "indexes_used": sorted(
+                {node["Index Name"] for node in nodes if node.get("Index Name")}
+            ),
+        }
+    )
+    return result
+
+
+def _existing_indexes(conn) -> dict[str, list[str]]:
+    tables = _configured_tables()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT schemaname || '.' || tablename, indexdef FROM pg_indexes "
+                "WHERE schemaname || '.' || tablename = ANY(%s)",
+                (tables,),
+            )
+            rows = cursor.fetchall()
+    except Exception as exc:
+        logger.warning("Index listing failed: %s", exc)
+        return {}
+    indexes: dict[str, list[str]] = {}
+    for table, definition in rows:
+        indexes.setdefault(table, []).append(definition)
+    return indexes
+
+
+def _normalize_index_expression(expression: str) -> str:
+    expression = re.sub(r"::[a-z ]+", "", expression.lower().replace('"', ""))
+    expression = re.sub(r"\s+", "", expression)
+    # pg_indexes wraps casted columns in parentheses: lower((name)::text)
+    return re.sub(r"(?<![a-z0-9_])\(([a-z_][a-z0-9_]*)\)", r"\1", expression)
+
+
+def _index_covered(definitions: list[str], method: str, leading: str) -> bool:
+    leading = _normalize_index_expression(leading)
+    for definition in definitions:
+        found = re.search(r"USING (\w+) \((.*)\)", definition)
+        if not found or found.group(1).lower() != method:
+            continue
+        columns = _normalize_index_expression(found.group(2))
+        if columns == leading or columns.startswith(leading + ","):
+            return True
+    return False
+
+
+def _index_suggestions(
+    conn,
+    schema: dict[str, dict[str, str]],
+    existing: dict[str, list[str]],
+    plans: list[dict],
+) -> list[dict]:
+    """Indexes that would let the generated lookups avoid sequential scans. Never applied."""
+    candidates: list[tuple[str, str, list[sql.Composable], str]] = [
+        (
+            settings.tenant_table,
+            "btree",
+            [sql.SQL("lower({})").format(sql.Identifier(settings.tenant_match_column))],
+            "tenant_rows matches lower(match column) = ANY(...)",
+        )
+    ]
+    if settings.tenant_updated_at_column:
+        candidates.append(
+            (
+                settings.tenant_table,
+                "btree",
+                [sql.Identifier(settings.tenant_updated_at_column)],
+                "incremental tenant sync filters on the updated-at column",
+            )
+        )
+    user_tenant, user_mode = _user_tenant_column(schema)
+    if user_mode == "any":
+        candidates.append(
+            (
+                settings.user_table,
+                "gin",
+                [sql.Identifier(user_tenant)],
+                "user lookups match the tenant id with = ANY(array column)",
+            )
+        )
+        candidates.append(
+            (
+                settings.user_table,
+                "btree",
+                [
+                    sql.Identifier(settings.user_account_type_column),
+                    sql.Identifier(settings.user_subscriber_column),
+                ],
+                "user lookups filter on account type and subscriber",
+            )
+        )
+    else:
+        candidates.append(
+            (
+                settings.user_table,
+                "btree",
+                [
+                    sql.Identifier(user_tenant),
+                    sql.Identifier(settings.user_account_type_column),
+                    sql.Identifier(settings.user_subscriber_column),
+                ],
+                "user lookups filter on tenant, account type and subscriber",
+            )
+        )
+    for table, _, name_column, tenant_column, mode, _, _ in _role_group_lookups():
+        if not table or not tenant_column:
+            continue
+        tenant_column, mode = _resolve_tenant_column(schema, table, tenant_column, mode) or (
+            tenant_column,
+            mode,
+        )
+        if mode.lower() == "any":
+            candidates.append(
+                (table, "gin", [sql.Identifier(tenant_column)], "default role/group ids by tenant")
+            )
+        else:
+            columns = [sql.Identifier(tenant_column)]
+            if name_column:
+                columns.append(sql.Identifier(name_column))
+            candidates.append((table, "btree", columns, "default role/group ids by tenant"))
+
+    seq_scanned: dict[str, list[str]] = {}
+    for plan in plans:
+        for scan in plan["seq_scans"]:
+            seq_scanned.setdefault(scan["relation"], []).append(plan["template"])
+    suggestions = []
+    for table, method, columns, reason in candidates:
+        column_sql = sql.SQL(", ").join(columns).as_string(conn)
+        key = _table_key(table)
+        slug = re.sub(r"[^a-z0-9]+", "_", column_sql.lower()).strip("_")
+        index_name = f"quilr_{key.split('.')[1]}_{slug}_idx"[:63]
+        statement = sql.SQL(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} USING {method} ({columns})"
+        ).format(
+            index=sql.Identifier(index_name),
+            table=_table_identifier(table),
+            method=sql.SQL(method),
+            columns=sql.SQL(column_sql),
+        )
+        suggestions.append(
+            {
+                "table": key,
+                "index": index_name,
+                "ddl": statement.as_string(conn),
+                "reason": reason,
+                "seq_scanned_by": seq_scanned.get(key.split(".")[1], []),
+                "exists": _index_covered(existing.get(key, []), method, column_sql.split(", ")[0]),
+            }
+        )
+    return suggestions
+
+
+@app.delete("/api/internal-users/defaults-cache")
+def clear_internal_user_defaults_cache(
+    instance_id: str = Query(...),
+    tenant_id: str | None = Query(None),
+    user: dict = Depends(require_user),
+    db=Depends(get_db),
+) -> dict:
+    cleared = _clear_internal_user_defaults_cache(db, instance_id, tenant_id)
+    db.commit()
+    return {"ok": True, "cleared": cleared}
+
+
 @app.post("/api/internal-users/password")
-def update_internal_user_password(
+async def update_internal_user_password(
     payload: InternalUserPasswordUpdate,
     user: dict = Depends(require_user),
     db=Depends(get_db),
 ):
     if not payload.new_password.strip():
         raise HTTPException(status_code=400, detail="Password is required.")
+    instance = await run_in_threadpool(_load_internal_user_instance, db, payload.instance_id)
+    hashed = await password_hasher.hash_async(payload.new_password)
+    return await run_in_threadpool(_update_internal_user_password, payload, instance, hashed)
+
+
+def _load_internal_user_instance(db, instance_id: str) -> dict:
     row = db.execute(
         """
-        SELECT pg_host, pg_port, pg_user, pg_password
+        SELECT id, pg_host, pg_port, pg_user, pg_password, pg_replica_host, pg_replica_port
         FROM instances WHERE id = ?
         """,
-        (payload.instance_id,),
+        (instance_id,),
     ).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Instance not found.")
@@ -1777,56 +4516,61 @@ def update_internal_user_password(
         raise HTTPException(
             status_code=400, detail="Instance Postgres credentials are missing."
         )
-    try:
-        conn = psycopg2.connect(
-            host=instance.get("pg_host"),
-            port=instance.get("pg_port") or 5432,
-            user=instance.get("pg_user"),
-            password=instance.get("pg_password"),
-            dbname=settings.pg_database,
-            sslmode=settings.pg_sslmode,
-            connect_timeout=settings.connection_timeout_seconds,
+    return instance
+
+
+def _internal_user_password_sql(
+    tenant_column: str, tenant_match_mode: str, with_subscriber: bool
+) -> sql.Composed:
+    query = sql.SQL(
+        "UPDATE {table} SET {password_col} = {password_val} "
+        "WHERE {user_id_col} = {user_id_val} AND {account_type_col} = {account_val} AND "
+    ).format(
+        table=_table_identifier(settings.user_table),
+        password_col=sql.Identifier(settings.user_password_column),
+        password_val=sql.Placeholder(),
+        user_id_col=sql.Identifier(settings.user_id_column),
+        user_id_val=sql.Placeholder(),
+        account_type_col=sql.Identifier(settings.user_account_type_column),
+        account_val=sql.Placeholder(),
+    ) + _match_sql(tenant_column, tenant_match_mode)
+    if with_subscriber:
+        query += sql.SQL(" AND {subscriber_col} = {subscriber_val}").format(
+            subscriber_col=sql.Identifier(settings.user_subscriber_column),
+            subscriber_val=sql.Placeholder(),
         )
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Postgres connection failed: {exc}")
+    return query
 
-    hashed = bcrypt.hashpw(payload.new_password.encode("utf-8"), bcrypt.gensalt()).decode(
-        "utf-8"
-    )
-    try:
-        with conn.cursor() as cursor:
-            tenant_clause, tenant_params = _tenant_match_clause(payload.tenant_id)
-            query = sql.SQL(
-                "UPDATE {table} SET {password_col} = {password_val} "
-                "WHERE {user_id_col} = {user_id_val} AND {account_type_col} = {account_val} AND "
-            ).format(
-                table=_table_identifier(settings.user_table),
-                password_col=sql.Identifier(settings.user_password_column),
-                password_val=sql.Placeholder(),
-                user_id_col=sql.Identifier(settings.user_id_column),
-                user_id_val=sql.Placeholder(),
-                account_type_col=sql.Identifier(settings.user_account_type_column),
-                account_val=sql.Placeholder(),
-            )
-            params: list[object] = [
-                hashed,
-                payload.user_id,
-                settings.user_account_type_value,
-            ]
-            query += tenant_clause
-            params.extend(tenant_params)
-            if payload.subscriber:
-                query += sql.SQL(" AND {subscriber_col} = {subscriber_val}").format(
-                    subscriber_col=sql.Identifier(settings.user_subscriber_column),
-                    subscriber_val=sql.Placeholder(),
+
+def _update_internal_user_password(
+    payload: InternalUserPasswordUpdate, instance: dict, hashed: str
+) -> dict:
+    with postgres_pools.connection(instance) as conn:
+        schema = postgres_schemas.get(instance, conn)
+        try:
+            postgres_timeouts.apply(conn, "write")
+            with conn.cursor() as cursor:
+                params: list[object] = [
+                    hashed,
+                    payload.user_id,
+                    settings.user_account_type_value,
+                    payload.tenant_id,
+                ]
+                if payload.subscriber:
+                    params.append(payload.subscriber)
+                queries.execute(
+                    cursor,
+                    _internal_user_password_sql,
+                    (*_user_tenant_column(schema), bool(payload.subscriber)),
+                    params,
                 )
-                params.append(payload.subscriber)
-            cursor.execute(query, params)
-            if cursor.rowcount == 0:
-                raise HTTPException(status_code=404, detail="User not found for tenant.")
-            conn.commit()
-    finally:
-        conn.close()
+                if cursor.rowcount == 0:
+                    raise HTTPException(status_code=404, detail="User not found for tenant.")
+                conn.commit()
+        except psycopg2.Error as exc:
+            conn.rollback()
+            raise _postgres_failure("Password update", exc)
+    postgres_pools.note_write(instance)
     return {"ok": True}
 
 
@@ -1856,7 +4600,7 @@ def create_customer(
             status_code=400, detail="Customer first name and last name are required."
         )
     if instance and bff_payload:
-        _notify_bff_onboard(instance.get("base_url"), bff_payload)
+        _notify_bff_onboard(instance.get("base_url"), bff_payload, instance.get("id"))
         _update_tenant_subscriber_flags(instance, payload.contact_email)
     comment = (payload.comment or "").strip() or None
     customer_id = str(uuid4())
@@ -1883,6 +4627,7 @@ def create_customer(
             now,
         ),
     )
+    _enqueue_neo4j_push(db, payload.instance_id, customer_id, "create")
     db.commit()
     row = db.execute(
         """
@@ -1976,6 +4721,7 @@ def update_customer(
             customer_id,
         ),
     )
+    _enqueue_neo4j_push(db, updated["instance_id"], customer_id, "update")
     db.commit()
     row = db.execute(
         """
@@ -2002,6 +4748,7 @@ def delete_customer(
     if not row:
         raise HTTPException(status_code=404, detail="Customer not found.")
     db.execute("DELETE FROM customers WHERE id = ?", (customer_id,))
+    _clear_neo4j_push_state(db, customer_id=customer_id)
     db.commit()
     return JSONResponse(status_code=status.HTTP_204_NO_CONTENT, content=None)
 
@@ -2135,7 +4882,7 @@ def onboard_customer(
     if payload.instance:
         instance_id = str(uuid4())
         now = utc_now()
-        _notify_bff_onboard(payload.instance.bff_url, bff_payload)
+        _notify_bff_onboard(payload.instance.bff_url, bff_payload, instance_id)
         _update_tenant_subscriber_flags(
             {
                 "pg_host": payload.instance.pg_host,
@@ -2151,9 +4898,10 @@ def onboard_customer(
                 id, name, base_url, status,
                 pg_host, pg_port, pg_user, pg_password,
                 neo4j_host, neo4j_port, neo4j_user, neo4j_password,
+                pg_scan_partitions, pg_replica_host, pg_replica_port,
                 created_at, updated_at
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 instance_id,
@@ -2168,6 +4916,9 @@ def onboard_customer(
                 payload.instance.neo4j_port,
                 payload.instance.neo4j_user,
                 payload.instance.neo4j_password,
+                payload.instance.pg_scan_partitions,
+                payload.instance.pg_replica_host,
+                payload.instance.pg_replica_port,
                 now,
                 now,
             ),
@@ -2183,7 +4934,7 @@ def onboard_customer(
         if not instance:
             raise HTTPException(status_code=400, detail="Instance does not exist.")
         instance = _row_to_dict(instance)
-        _notify_bff_onboard(instance["base_url"], bff_payload)
+        _notify_bff_onboard(instance["base_url"], bff_payload, instance_id)
         _update_tenant_subscriber_flags(instance, payload.customer.contact_email)
     else:
         raise HTTPException(status_code=400, detail="Instance data is required.")
@@ -2218,5 +4969,6 @@ def onboard_customer(
             now,
         ),
     )
+    _enqueue_neo4j_push(db, instance_id, customer_id, "create")
     db.commit()
     return OnboardResponse(instance_id=instance_id, customer_id=customer_id)
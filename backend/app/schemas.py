@@ -13,6 +13,9 @@ class InstanceBase(BaseModel):
     neo4j_port: str | None = None
     neo4j_user: str | None = None
     neo4j_password: str | None = None
+    pg_scan_partitions: int | None = Field(default=None, ge=1, le=32)
+    pg_replica_host: str | None = None
+    pg_replica_port: str | None = None
 
 
 class InstanceCreate(InstanceBase):
@@ -31,6 +34,9 @@ class InstanceUpdate(BaseModel):
     neo4j_port: str | None = None
     neo4j_user: str | None = None
     neo4j_password: str | None = None
+    pg_scan_partitions: int | None = Field(default=None, ge=1, le=32)
+    pg_replica_host: str | None = None
+    pg_replica_port: str | None = None
 
 
 class InstanceOut(InstanceBase):
@@ -126,6 +132,45 @@ class InternalUserCreate(BaseModel):
     password: str | None = None
 
 
+class InternalUserBulkItem(BaseModel):
+    tenant_id: str | None = None
+    subscriber: str | None = None
+    match_name: str | None = None
+    match_email: EmailStr | None = None
+    account_type: str | None = None
+    first_name: str = Field(..., min_length=1)
+    last_name: str = Field(..., min_length=1)
+    username: str = Field(..., min_length=1)
+    email: EmailStr
+    password: str | None = None
+
+
+INTERNAL_USER_BULK_MAX = 500
+
+
+class InternalUserBulkCreate(BaseModel):
+    instance_id: str
+    users: list[InternalUserBulkItem] = Field(
+        ..., min_length=1, max_length=INTERNAL_USER_BULK_MAX
+    )
+
+
+class InternalUserBulkResult(BaseModel):
+    index: int
+    ok: bool = False
+    id: str | None = None
+    name: str | None = None
+    email: EmailStr | None = None
+    account_type: str | None = None
+    error: str | None = None
+
+
+class InternalUserBulkOut(BaseModel):
+    created: int
+    failed: int
+    results: list[InternalUserBulkResult]
+
+
 class SessionOut(BaseModel):
     authenticated: bool
     user: dict | None = None
@@ -0,0 +1,18 @@
+import sqlite3
+from dataclasses import replace
+
+import pytest
+
+from backend.app import db as db_module
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch) -> sqlite3.Connection:
+    """A fresh onboarding database with the full schema."""
+    monkeypatch.setattr(
+        db_module, "settings", replace(db_module.settings, database_path=str(tmp_path / "app.db"))
+    )
+    db_module.init_db()
+    conn = db_module.connect_db()
+    yield conn
+    conn.close()
@@ -0,0 +1,25 @@
+from backend.app.main import _index_covered, _normalize_index_expression
+
+
+def test_normalize_strips_casts_quotes_and_whitespace():
+    assert _normalize_index_expression("lower((name)::text)") == "lower(name)"
+    assert _normalize_index_expression('LOWER(("Name")::character varying)') == "lower(name)"
+    assert _normalize_index_expression("tenant_id, lower(email)") == "tenant_id,lower(email)"
+
+
+def test_covered_by_pg_indexes_definition():
+    definitions = ["CREATE INDEX x ON public.tenant USING btree (lower((name)::text))"]
+    assert _index_covered(definitions, "btree", "lower(name)")
+    assert not _index_covered(definitions, "gin", "lower(name)")
+    assert not _index_covered(definitions, "btree", "name")
+
+
+def test_covered_by_leading_column_only():
+    definitions = [
+        "CREATE INDEX x ON public.users USING btree (a, b)",
+        "CREATE INDEX y ON public.users USING btree (ab)",
+    ]
+    assert _index_covered(definitions, "btree", "a")
+    assert _index_covered(definitions, "btree", "a, b")
+    assert not _index_covered(definitions, "btree", "b")
+    assert not _index_covered(definitions[1:], "btree", "a")
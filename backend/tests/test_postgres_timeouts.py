@@ -0,0 +1,88 @@
+import psycopg2.extensions
+
+from backend.app.main import PostgresTimeouts
+
+IDLE = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+INTRANS = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode: str | None) -> None:
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+class _Cursor:
+    def __init__(self, executed: list[str]) -> None:
+        self._executed = executed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def execute(self, statement: str) -> None:
+        self._executed.append(statement)
+
+
+class _Connection:
+    def __init__(self, status: int = IDLE) -> None:
+        self.status = status
+        self.executed: list[str] = []
+        self.rollbacks = 0
+
+    def get_transaction_status(self) -> int:
+        return self.status
+
+    def cursor(self) -> _Cursor:
+        return _Cursor(self.executed)
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+        self.status = IDLE
+
+
+def _timeouts() -> PostgresTimeouts:
+    return PostgresTimeouts({"lookup": 2000, "write": 5000}, {"lookup": 100, "write": 500})
+
+
+def test_describe_ignores_other_errors():
+    timeouts = _timeouts()
+    assert timeouts.describe(ValueError("boom")) is None
+    assert timeouts.describe(_PgError("23505")) is None
+    assert timeouts.stats()["fired"] == {}
+
+
+def test_describe_names_and_counts_the_timeout():
+    timeouts = _timeouts()
+    timeouts.apply(_Connection(), "lookup")
+    assert timeouts.describe(_PgError("57014")) == "lookup statement_timeout (2000 ms) exceeded"
+    assert timeouts.describe(_PgError("55P03")) == "lookup lock_timeout (100 ms) exceeded"
+    assert timeouts.describe(_PgError("55P03")) == "lookup lock_timeout (100 ms) exceeded"
+    assert timeouts.stats()["fired"] == {"lookup": {"statement_timeout": 1, "lock_timeout": 2}}
+
+
+def test_apply_sets_transaction_modes_only_when_idle():
+    timeouts = _timeouts()
+    conn = _Connection()
+    timeouts.apply(conn, "write", read_only=True, isolation="REPEATABLE READ")
+    assert conn.executed == [
+        "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY; "
+        "SET LOCAL statement_timeout = 5000; SET LOCAL lock_timeout = 500"
+    ]
+    conn = _Connection(INTRANS)
+    timeouts.apply(conn, "unknown", read_only=True)
+    assert conn.executed == ["SET LOCAL statement_timeout = 0; SET LOCAL lock_timeout = 0"]
+
+
+def test_rollback_reapplies_the_last_class():
+    timeouts = _timeouts()
+    conn = _Connection(INTRANS)
+    timeouts.apply(conn, "lookup", read_only=True)
+    timeouts.rollback(conn)
+    assert conn.rollbacks == 1
+    assert conn.executed[-1] == (
+        "SET TRANSACTION READ ONLY; "
+        "SET LOCAL statement_timeout = 2000; SET LOCAL lock_timeout = 100"
+    )
@@ -0,0 +1,87 @@
+import re
+
+from backend.app.main import QueryRegistry
+
+
+class _Text:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def as_string(self, conn) -> str:
+        return self.text
+
+
+calls: list[tuple] = []
+
+
+def _lookup_sql(with_subscriber: bool) -> _Text:
+    calls.append((with_subscriber,))
+    text = "SELECT id FROM users WHERE tenant = %s AND kind = ANY(%s)"
+    if with_subscriber:
+        text += " AND subscriber = %s"
+    return _Text(text)
+
+
+class _Cursor:
+    def __init__(self, connection, name: str | None = None) -> None:
+        self.connection = connection
+        self.name = name
+        self.executed: list[tuple] = []
+
+    def execute(self, query, params=None) -> None:
+        self.executed.append((query, params))
+
+
+class _Connection:
+    def __init__(self) -> None:
+        self.prepared: set[str] = set()
+
+
+def test_placeholders_are_numbered_in_order():
+    text, statement, prepare_sql = QueryRegistry(True)._rendered_entry(None, _lookup_sql, (True,))
+    assert text == "SELECT id FROM users WHERE tenant = %s AND kind = ANY(%s) AND subscriber = %s"
+    assert re.fullmatch(r"q_[0-9a-f]{20}", statement)
+    assert prepare_sql == (
+        f"PREPARE {statement} AS "
+        "SELECT id FROM users WHERE tenant = $1 AND kind = ANY($2) AND subscriber = $3"
+    )
+
+
+def test_each_variant_is_rendered_once():
+    registry = QueryRegistry(True)
+    calls.clear()
+    first = registry._rendered_entry(None, _lookup_sql, (False,))
+    assert registry._rendered_entry(None, _lookup_sql, (False,)) == first
+    other = registry._rendered_entry(None, _lookup_sql, (True,))
+    assert calls == [(False,), (True,)]
+    assert other[1] != first[1]
+    assert registry.stats()["lookup_sql"]["variants"] == 2
+
+
+def test_statement_name_depends_only_on_text():
+    left = QueryRegistry(True)._rendered_entry(None, _lookup_sql, (True,))
+    right = QueryRegistry(False)._rendered_entry(None, _lookup_sql, (True,))
+    assert left == right
+
+
+def test_execute_prepares_once_per_connection():
+    registry = QueryRegistry(True)
+    cursor = _Cursor(_Connection())
+    registry.execute(cursor, _lookup_sql, (False,), ["t1", ["a"]])
+    registry.execute(cursor, _lookup_sql, (False,), ["t2", ["b"]])
+    _, statement, prepare_sql = registry._rendered_entry(None, _lookup_sql, (False,))
+    assert cursor.executed == [
+        (prepare_sql, None),
+        (f"EXECUTE {statement} (%s, %s)", ["t1", ["a"]]),
+        (f"EXECUTE {statement} (%s, %s)", ["t2", ["b"]]),
+    ]
+    assert registry.stats()["lookup_sql"]["prepares"] == 1
+
+
+def test_named_cursors_and_disabled_prepare_run_plain_text():
+    text = _lookup_sql(False).text
+    named = _Cursor(_Connection(), name="stream_1")
+    QueryRegistry(True).execute(named, _lookup_sql, (False,), ["t1", ["a"]])
+    unprepared = _Cursor(_Connection())
+    QueryRegistry(False).execute(unprepared, _lookup_sql, (False,), ["t1", ["a"]])
+    assert named.executed == unprepared.executed == [(text, ["t1", ["a"]])]
@@ -0,0 +1,162 @@
+from backend.app import db as db_module
+from backend.app import main
+from backend.app.main import _load_cached_tenants, _sync_tenants, _write_cached_tenants, utc_now
+
+
+def _tenants(db, instance_id: str = "i1") -> dict[str, tuple]:
+    tenants, _ = _load_cached_tenants(db, instance_id)
+    return {
+        tenant["match_value"]: (tenant["tenant_id"], tenant["tenant_name"]) for tenant in tenants
+    }
+
+
+def test_full_pass_keeps_first_row_per_match_value(sqlite_db):
+    _write_cached_tenants(
+        sqlite_db,
+        "i1",
+        [
+            {"match_value": " Acme ", "tenant_id": "t1", "tenant_name": "Acme"},
+            {"match_value": "acme", "tenant_id": "t2", "tenant_name": "Acme 2"},
+            {"match_value": "", "tenant_id": "t3", "tenant_name": "Blank"},
+        ],
+        "2026-01-01T00:00:00+00:00",
+        overwrite=False,
+    )
+    assert _tenants(sqlite_db) == {"acme": ("t1", "Acme")}
+
+
+def test_incremental_pass_overwrites_with_latest_row(sqlite_db):
+    _write_cached_tenants(
+        sqlite_db,
+        "i1",
+        [{"match_value": "acme", "tenant_id": "t1", "tenant_name": "Acme"}],
+        "2026-01-01T00:00:00+00:00",
+        overwrite=False,
+    )
+    _write_cached_tenants(
+        sqlite_db,
+        "i1",
+        [{"match_value": "ACME", "tenant_id": "t1", "tenant_name": "Acme Renamed"}],
+        "2026-01-02T00:00:00+00:00",
+        overwrite=True,
+    )
+    _, fetched_at = _load_cached_tenants(sqlite_db, "i1")
+    assert _tenants(sqlite_db) == {"acme": ("t1", "Acme Renamed")}
+    assert fetched_at == "2026-01-02T00:00:00+00:00"
+
+
+def test_incremental_pass_drops_the_old_match_value_of_a_renamed_tenant(sqlite_db):
+    _write_cached_tenants(
+        sqlite_db,
+        "i1",
+        [
+            {"match_value": "acme", "tenant_id": "t1", "tenant_name": "Acme"},
+            {"match_value": "beta", "tenant_id": "t2", "tenant_name": "Beta"},
+        ],
+        "2026-01-01T00:00:00+00:00",
+        overwrite=False,
+    )
+    _write_cached_tenants(
+        sqlite_db,
+        "i1",
+        [{"match_value": "acme corp", "tenant_id": "t1", "tenant_name": "Acme Corp"}],
+        "2026-01-02T00:00:00+00:00",
+        overwrite=True,
+    )
+    assert _tenants(sqlite_db) == {"acme corp": ("t1", "Acme Corp"), "beta": ("t2", "Beta")}
+
+
+def test_sync_id_writes_to_staging_only(sqlite_db):
+    _write_cached_tenants(
+        sqlite_db,
+        "i1",
+        [{"match_value": "acme", "tenant_id": "t1"}, {"match_value": "acme", "tenant_id": "t2"}],
+        "2026-01-01T00:00:00+00:00",
+        overwrite=False,
+        sync_id="s1",
+    )
+    assert _tenants(sqlite_db) == {}
+    staged = sqlite_db.execute(
+        "SELECT instance_id, match_value, tenant_id FROM tenant_cache_staging WHERE sync_id = 's1'"
+    ).fetchall()
+    assert [tuple(row) for row in staged] == [("i1", "acme", "t1")]
+
+
+def test_instances_do_not_share_rows(sqlite_db):
+    for instance_id, tenant_id in (("i1", "t1"), ("i2", "t2")):
+        _write_cached_tenants(
+            sqlite_db,
+            instance_id,
+            [{"match_value": "acme", "tenant_id": tenant_id}],
+            "2026-01-01T00:00:00+00:00",
+            overwrite=True,
+        )
+    assert _tenants(sqlite_db, "i1") == {"acme": ("t1", None)}
+    assert _tenants(sqlite_db, "i2") == {"acme": ("t2", None)}
+
+
+def _fake_scan(chunks: list[list[dict]], fail: bool = False):
+    def fetch(instance, on_chunk, watermark=None):
+        for chunk in chunks:
+            on_chunk(chunk)
+        return None if fail else (sum(len(chunk) for chunk in chunks), "42")
+
+    return fetch
+
+
+def test_full_sync_swaps_staging_into_the_cache(sqlite_db, monkeypatch):
+    _write_cached_tenants(
+        sqlite_db, "i1", [{"match_value": "gone", "tenant_id": "t0"}], "2026-01-01", True
+    )
+    sqlite_db.commit()
+    monkeypatch.setattr(
+        main,
+        "_fetch_all_tenants",
+        _fake_scan(
+            [
+                [{"match_value": "acme", "tenant_id": "t1"}],
+                [{"match_value": "beta", "tenant_id": "t2"}],
+            ]
+        ),
+    )
+    tenants = _sync_tenants(sqlite_db, "i1", {"id": "i1"})
+    assert sorted(tenant["tenant_id"] for tenant in tenants) == ["t1", "t2"]
+    assert sqlite_db.execute("SELECT COUNT(*) FROM tenant_cache_staging").fetchone()[0] == 0
+    state = sqlite_db.execute("SELECT watermark FROM tenant_sync_state").fetchone()
+    assert state["watermark"] == "42"
+
+
+def test_failed_full_sync_keeps_the_previous_cache(sqlite_db, monkeypatch):
+    _write_cached_tenants(
+        sqlite_db, "i1", [{"match_value": "acme", "tenant_id": "t0"}], "2026-01-01", True
+    )
+    sqlite_db.commit()
+    monkeypatch.setattr(
+        main,
+        "_fetch_all_tenants",
+        _fake_scan([[{"match_value": "beta", "tenant_id": "t2"}]], fail=True),
+    )
+    assert _sync_tenants(sqlite_db, "i1", {"id": "i1"}) == []
+    assert _tenants(sqlite_db) == {"acme": ("t0", None)}
+    assert sqlite_db.execute("SELECT COUNT(*) FROM tenant_cache_staging").fetchone()[0] == 0
+
+
+def test_init_db_drops_only_abandoned_staging(sqlite_db):
+    sqlite_db.executemany(
+        """
+        INSERT INTO tenant_cache_staging (
+            sync_id, instance_id, match_value, tenant_id, fetched_at, staged_at
+        ) VALUES (?, 'i1', ?, 't1', ?, ?)
+        """,
+        [
+            ("old", "acme", "2026-01-01T00:00:00+00:00", "2026-01-01T00:00:00+00:00"),
+            ("running", "acme", "2026-01-01T00:00:00+00:00", "2026-01-01T00:00:00+00:00"),
+            ("running", "beta", "2026-01-01T00:00:00+00:00", utc_now()),
+        ],
+    )
+    sqlite_db.commit()
+    db_module.init_db()
+    staged = sqlite_db.execute(
+        "SELECT DISTINCT sync_id FROM tenant_cache_staging"
+    ).fetchall()
+    assert [row["sync_id"] for row in staged] == ["running"]
@@ -0,0 +1,74 @@
+import json
+import sqlite3
+
+from backend.app import main
+from backend.app.main import TenantChangeListener, _apply_tenant_notification, _write_cached_tenants
+
+FETCHED_AT = "2026-01-01T00:00:00+00:00"
+EXPIRED = "1970-01-01T00:00:00+00:00"
+
+
+def _seed(db) -> None:
+    _write_cached_tenants(
+        db,
+        "i1",
+        [
+            {"match_value": "acme", "tenant_id": "t1", "tenant_name": "Acme", "subscriber": "s1"},
+            {"match_value": "beta", "tenant_id": "t2", "tenant_name": "Beta", "subscriber": "s2"},
+        ],
+        FETCHED_AT,
+        overwrite=True,
+    )
+
+
+def _rows(db) -> dict[str, tuple]:
+    return {
+        row["match_value"]: (row["tenant_id"], row["tenant_name"], row["fetched_at"])
+        for row in db.execute("SELECT * FROM tenant_cache WHERE instance_id = 'i1'")
+    }
+
+
+def test_update_replaces_the_tenant_and_keeps_cache_age(sqlite_db):
+    _seed(sqlite_db)
+    payload = {"op": "UPDATE", "tenant_id": "t1", "match_value": "Acme Corp", "tenant_name": "AC"}
+    _apply_tenant_notification(sqlite_db, "i1", json.dumps(payload))
+    assert _rows(sqlite_db) == {
+        "acme corp": ("t1", "AC", FETCHED_AT),
+        "beta": ("t2", "Beta", FETCHED_AT),
+    }
+
+
+def test_delete_removes_only_that_tenant(sqlite_db):
+    _seed(sqlite_db)
+    _apply_tenant_notification(
+        sqlite_db, "i1", json.dumps({"op": "DELETE", "tenant_id": "t2", "match_value": "beta"})
+    )
+    assert set(_rows(sqlite_db)) == {"acme"}
+
+
+def test_unreadable_payload_expires_the_instance(sqlite_db):
+    _seed(sqlite_db)
+    for payload in ("not json", json.dumps({"op": "UPDATE"})):
+        _apply_tenant_notification(sqlite_db, "i1", payload)
+        assert {row[2] for row in _rows(sqlite_db).values()} == {EXPIRED}
+
+
+def test_failed_apply_expires_the_cache_on_the_next_loop(sqlite_db, monkeypatch):
+    _seed(sqlite_db)
+    sqlite_db.commit()
+    connect = main.connect_db
+    failures = [sqlite3.OperationalError("database is locked")]
+
+    def flaky_connect():
+        if failures:
+            raise failures.pop()
+        return connect()
+
+    monkeypatch.setattr(main, "connect_db", flaky_connect)
+    listener = TenantChangeListener("tenant_changes")
+    listener._deliver("i1", [json.dumps({"op": "DELETE", "tenant_id": "t1"})])
+    assert listener.status()["instances"]["i1"]["error"] == "database is locked"
+    assert set(_rows(sqlite_db)) == {"acme", "beta"}
+    listener._deliver("i1", [])
+    assert listener.status()["instances"]["i1"]["error"] is None
+    assert {row[2] for row in _rows(sqlite_db).values()} == {EXPIRED}
@@ -789,7 +789,7 @@ export default function PortalDashboard({ view = "customers" }: { view?: Dashboa
         await apiFetch(`/api/customers/${createdCustomerId}/neo4j`, {
           method: "POST"
         });
-        setPushMessage("Customer pushed to Neo4j.");
+        setPushMessage("Customer queued for Neo4j push.");
       }
       resetCustomerForm();
       setShowCustomerModal(false);
@@ -11,6 +11,9 @@ export type Instance = {
   neo4j_port?: string | null;
   neo4j_user?: string | null;
   neo4j_password?: string | null;
+  pg_scan_partitions?: number | null;
+  pg_replica_host?: string | null;
+  pg_replica_port?: string | null;
   created_at: string;
   updated_at: string;
 };
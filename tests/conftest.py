@@ -0,0 +1,9 @@
+import sys
+import types
+from unittest import mock
+
+try:
+    import neo4jdata  # noqa: F401
+except ImportError:
+    # userdata imports the internal neo4jdata client at module level; the tests replace Graph anyway
+    sys.modules["neo4jdata"] = types.SimpleNamespace(Graph=mock.Mock)
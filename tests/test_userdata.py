@@ -0,0 +1,101 @@
+import re
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+import userdata
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("INGEST_JOURNAL", str(tmp_path / "journal.db"))
+    monkeypatch.setattr(userdata, "Graph", mock.Mock)
+    monkeypatch.setattr(userdata.pool, "ThreadedConnectionPool", mock.Mock())
+    return userdata.userdata()
+
+
+RECORDS = [
+    {
+        "User Email": "ada@example.com",
+        "Firstname": "Ada",
+        "Lastname": "Lovelace",
+        "Department": "Research",
+        "Job Title": "Analyst",
+        "userlocation": "UK",
+    },
+    {"User Email": "grace@example.com", "Firstname": "Grace"},
+]
+
+
+def test_compact_query_reads_row_keys_per_row_and_the_rest_from_shared(client):
+    query = client.compact_query
+    assert query.startswith("UNWIND $rows AS row\n")
+    parameters = set(re.findall(r"\$(\w+)", query))
+    assert parameters == {"rows", "shared"}
+    for name in set(re.findall(r"\brow\.(\w+)", query)):
+        assert name in userdata.ROW_KEYS
+    for name in set(re.findall(r"\$shared\.(\w+)", query)):
+        assert name not in userdata.ROW_KEYS
+    assert "MERGE (USER_0:USER {id: row.USER_0_id" in query
+    assert "MERGE (TENANT_0:TENANT {id: $shared.TENANT_0_id" in query
+
+
+def test_compact_query_carries_row_through_every_with(client):
+    for clause in re.findall(r"^WITH .*$", client.compact_query, flags=re.MULTILINE):
+        assert clause.startswith("WITH row, TENANT_0")
+
+
+def test_batch_query_reads_every_parameter_per_row(client):
+    assert set(re.findall(r"\$(\w+)", client.batch_query)) == {"rows"}
+    assert len(set(re.findall(r"\brow\.(\w+)", client.batch_query))) == len(
+        set(re.findall(r"\$(\w+)", client.query))
+    )
+
+
+def test_columnar_params_match_per_row_params(client):
+    rows, rejected = client.columnarparams(pd.DataFrame.from_records(RECORDS), "tenant-1")
+    shared = client.sharedparams("tenant-1", "subscriber-1", "instance-1")
+    assert rejected == 0
+    for record, row in zip(RECORDS, rows):
+        expected = client.buildparams("tenant-1", "subscriber-1", record, "instance-1")
+        assert set(row) == set(userdata.ROW_KEYS)
+        assert {**shared, **row} == expected
+
+
+def test_columnar_params_reject_invalid_and_duplicate_rows(client):
+    records = RECORDS + [
+        {"User Email": "not-an-email", "Firstname": "Bad"},
+        {"User Email": "ADA@example.com", "Firstname": "Ada"},
+        {"User Email": "nofirst@example.com"},
+        {"User Email": "vendor@example.com", "Firstname": "V", "vendor": "okta"},
+    ]
+    rows, rejected = client.columnarparams(pd.DataFrame.from_records(records), "tenant-1")
+    assert [row["USER_0_mail"] for row in rows] == ["ada@example.com", "grace@example.com"]
+    assert rejected == 4
+    # the same emails in another chunk of the same tenant are duplicates too
+    rows, rejected = client.columnarparams(pd.DataFrame.from_records(RECORDS), "tenant-1")
+    assert rows == [] and rejected == 2
+    rows, rejected = client.columnarparams(pd.DataFrame.from_records(RECORDS), "tenant-2")
+    assert len(rows) == 2 and rejected == 0
+
+
+def test_both_paths_keep_the_same_vendors(client):
+    records = [
+        {"User Email": "ada@example.com", "Firstname": "Ada", "vendor": "Google"},
+        {"User Email": "okta@example.com", "Firstname": "Okta", "vendor": "okta"},
+    ]
+    rows, rejected, _ = client.buildstatements("tenant-1", "subscriber-1", records, "instance-1", 1)
+    columnar, columnar_rejected = client.columnarparams(pd.DataFrame.from_records(records), "tenant-2")
+    assert rejected == columnar_rejected == 1
+    shared = client.sharedparams("tenant-2", "subscriber-1", "instance-1")
+    assert [row["ACCOUNT_MAIN_0_appName"] for row in rows] == ["google"]
+    assert {**shared, **columnar[0]} == client.buildparams(
+        "tenant-2", "subscriber-1", records[0], "instance-1"
+    )
+
+
+def test_schema_keys_match_the_backend():
+    from backend.app.main import NEO4J_SCHEMA_KEYS
+
+    assert userdata.SCHEMA_KEYS == NEO4J_SCHEMA_KEYS
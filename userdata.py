@@ -1,583 +1,1201 @@
-from uuid import uuid4
-import pandas as pd
-from neo4jdata import Graph
-import requests
-from psycopg2 import pool
-import os
-import bcrypt
-from dotenv import load_dotenv
-
-class userdata:
-    def __init__(self) -> None:
-        self.graph = Graph()
-        self.db_config =  {
-            "minconn":1,
-            "maxconn":5,
-            "host": os.environ.get("PG_HOST"),
-            "port": os.environ.get("PG_PORT"),
-            "dbname": 'quilr',
-            "user": os.environ.get("PG_USER"),
-            "password": os.environ.get("PG_PASSWORD")
-        }
-        self.conn = pool.SimpleConnectionPool(**self.db_config)
-        self.query = '''
-MERGE (TENANT_0:TENANT {id: $TENANT_0_id, subscriber: $TENANT_0_subscriber, tenant: $TENANT_0_tenant})
-ON CREATE
-         SET
-                 TENANT_0.creationTime = $TENANT_0_creationTime,
-                 TENANT_0.subscriber = $TENANT_0_subscriber,
-                 TENANT_0.tenant = $TENANT_0_tenant,
-                 TENANT_0.internalId = randomUUID(),
-                 TENANT_0.new = true,
-                 TENANT_0.timestamp = timestamp()
-ON MATCH
-         SET
-                 TENANT_0.subscriber = $TENANT_0_subscriber,
-                 TENANT_0.tenant = $TENANT_0_tenant,
-                 TENANT_0.new = false,
-                 TENANT_0.timestamp = timestamp()
-WITH TENANT_0
-
-MERGE (INSTANCE_0:INSTANCE {id: $INSTANCE_0_id, subscriber: $INSTANCE_0_subscriber, tenant: $INSTANCE_0_tenant})
-ON CREATE
-         SET
-                 INSTANCE_0.creationTime = $INSTANCE_0_creationTime,
-                 INSTANCE_0.subscriber = $INSTANCE_0_subscriber,
-                 INSTANCE_0.tenant = $INSTANCE_0_tenant,
-                 INSTANCE_0.internalId = randomUUID(),
-                 INSTANCE_0.new = true,
-                 INSTANCE_0.timestamp = timestamp()
-ON MATCH
-         SET
-                 INSTANCE_0.subscriber = $INSTANCE_0_subscriber,
-                 INSTANCE_0.tenant = $INSTANCE_0_tenant,
-                 INSTANCE_0.new = false,
-                 INSTANCE_0.timestamp = timestamp()
-WITH TENANT_0, INSTANCE_0
-
-MERGE (IDP_APPLICATION_0:APPLICATION {id_: $IDP_APPLICATION_0_id_})
-ON CREATE
-         SET
-                 IDP_APPLICATION_0.domain = $IDP_APPLICATION_0_domain,
-                 IDP_APPLICATION_0.newApp = $IDP_APPLICATION_0_newApp,
-                 IDP_APPLICATION_0.globalSyncAllowed = $IDP_APPLICATION_0_globalSyncAllowed,
-                 IDP_APPLICATION_0.internalId = randomUUID(),
-                 IDP_APPLICATION_0.new = true,
-                 IDP_APPLICATION_0.timestamp = timestamp()
-ON MATCH
-         SET
-                 IDP_APPLICATION_0.new = false,
-                 IDP_APPLICATION_0.timestamp = timestamp()
-WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0
-
-MERGE (ACCOUNT_MAIN_0:ACCOUNT {id: $ACCOUNT_MAIN_0_id, subscriber: $ACCOUNT_MAIN_0_subscriber, tenant: $ACCOUNT_MAIN_0_tenant})
-ON CREATE
-         SET
-                 ACCOUNT_MAIN_0.creationTime = $ACCOUNT_MAIN_0_creationTime,
-                 ACCOUNT_MAIN_0.email = $ACCOUNT_MAIN_0_email,
-                 ACCOUNT_MAIN_0.appName = $ACCOUNT_MAIN_0_appName,
-                 ACCOUNT_MAIN_0.subscriber = $ACCOUNT_MAIN_0_subscriber,
-                 ACCOUNT_MAIN_0.tenant = $ACCOUNT_MAIN_0_tenant,
-                 ACCOUNT_MAIN_0.internalId = randomUUID(),
-                 ACCOUNT_MAIN_0.new = true,
-                 ACCOUNT_MAIN_0.timestamp = timestamp()
-ON MATCH
-         SET
-                 ACCOUNT_MAIN_0.email = $ACCOUNT_MAIN_0_email,
-                 ACCOUNT_MAIN_0.appName = $ACCOUNT_MAIN_0_appName,
-                 ACCOUNT_MAIN_0.subscriber = $ACCOUNT_MAIN_0_subscriber,
-                 ACCOUNT_MAIN_0.tenant = $ACCOUNT_MAIN_0_tenant,
-                 ACCOUNT_MAIN_0.new = false,
-                 ACCOUNT_MAIN_0.timestamp = timestamp()
-WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0
-
-MERGE (USER_0:USER {id: $USER_0_id, subscriber: $USER_0_subscriber, tenant: $USER_0_tenant})
-ON CREATE
-         SET
-                 USER_0.extensionDeploymentStatus = $USER_0_extensionDeploymentStatus,
-                 USER_0.copilotStatus = $USER_0_copilotStatus,
-                 USER_0.displayName = $USER_0_displayName,
-                 USER_0.givenName = $USER_0_givenName,
-                 USER_0.middleName = $USER_0_middleName,
-                 USER_0.orgCode = $USER_0_orgCode,
-                 USER_0.empType = $USER_0_empType,
-                 USER_0.workFrom = $USER_0_workFrom,
-                 USER_0.jobTitle = $USER_0_jobTitle,
-                 USER_0.mail = $USER_0_mail,
-                 USER_0.mobilePhone = $USER_0_mobilePhone,
-                 USER_0.preferredLanguage = $USER_0_preferredLanguage,
-                 USER_0.signInActivity = $USER_0_signInActivity,
-                 USER_0.surname = $USER_0_surname,
-                 USER_0.userPrincipalName = $USER_0_userPrincipalName,
-                 USER_0.userType = $USER_0_userType,
-                 USER_0.securityIdentifier = $USER_0_securityIdentifier,
-                 USER_0.businessPhones = $USER_0_businessPhones,
-                 USER_0.street = $USER_0_street,
-                 USER_0.country = $USER_0_country,
-                 USER_0.zipCode = $USER_0_zipCode,
-                 USER_0.city = $USER_0_city,
-                 USER_0.employeeHireDate = $USER_0_employeeHireDate,
-                 USER_0.userCreationTime = $USER_0_userCreationTime,
-                 USER_0.state = $USER_0_state,
-                 USER_0.employeeType = $USER_0_employeeType,
-                 USER_0.companyName = $USER_0_companyName,
-                 USER_0.accountEnabled = $USER_0_accountEnabled,
-                 USER_0.terminationDate = $USER_0_terminationDate,
-                 USER_0.profilePicUrl = $USER_0_profilePicUrl,
-                 USER_0.suspensionReason = $USER_0_suspensionReason,
-                 USER_0.userIsadmin = $USER_0_userIsadmin,
-                 USER_0.userDelegationadmin = $USER_0_userDelegationadmin,
-                 USER_0.userLastLoginTime = $USER_0_userLastLoginTime,
-                 USER_0.userAgreedterms = $USER_0_userAgreedterms,
-                 USER_0.userSuspended = $USER_0_userSuspended,
-                 USER_0.userArchived = $USER_0_userArchived,
-                 USER_0.usermobiletype = $USER_0_usermobiletype,
-                 USER_0.userCustomerID = $USER_0_userCustomerID,
-                 USER_0.userIsMailboxSetup = $USER_0_userIsMailboxSetup,
-                 USER_0.userIs2svEnrolled = $USER_0_userIs2svEnrolled,
-                 USER_0.userIsforcedIn2sv = $USER_0_userIsforcedIn2sv,
-                 USER_0.userIncludeInGlobalAddressList = $USER_0_userIncludeInGlobalAddressList,
-                 USER_0.userChangedPasswordAtNextLogin = $USER_0_userChangedPasswordAtNextLogin,
-                 USER_0.userOrgUnitPath = $USER_0_userOrgUnitPath,
-                 USER_0.userIpWhitelisted = $USER_0_userIpWhitelisted,
-                 USER_0.subscriber = $USER_0_subscriber,
-                 USER_0.tenant = $USER_0_tenant,
-                 USER_0.internalId = randomUUID(),
-                 USER_0.new = true,
-                 USER_0.timestamp = timestamp()
-ON MATCH
-         SET
-                 USER_0.displayName = $USER_0_displayName,
-                 USER_0.givenName = $USER_0_givenName,
-                 USER_0.middleName = $USER_0_middleName,
-                 USER_0.orgCode = $USER_0_orgCode,
-                 USER_0.empType = $USER_0_empType,
-                 USER_0.workFrom = $USER_0_workFrom,
-                 USER_0.jobTitle = $USER_0_jobTitle,
-                 USER_0.mail = $USER_0_mail,
-                 USER_0.mobilePhone = $USER_0_mobilePhone,
-                 USER_0.preferredLanguage = $USER_0_preferredLanguage,
-                 USER_0.signInActivity = $USER_0_signInActivity,
-                 USER_0.surname = $USER_0_surname,
-                 USER_0.userPrincipalName = $USER_0_userPrincipalName,
-                 USER_0.userType = $USER_0_userType,
-                 USER_0.securityIdentifier = $USER_0_securityIdentifier,
-                 USER_0.businessPhones = $USER_0_businessPhones,
-                 USER_0.street = $USER_0_street,
-                 USER_0.country = $USER_0_country,
-                 USER_0.zipCode = $USER_0_zipCode,
-                 USER_0.city = $USER_0_city,
-                 USER_0.employeeHireDate = $USER_0_employeeHireDate,
-                 USER_0.userCreationTime = $USER_0_userCreationTime,
-                 USER_0.state = $USER_0_state,
-                 USER_0.employeeType = $USER_0_employeeType,
-                 USER_0.companyName = $USER_0_companyName,
-                 USER_0.accountEnabled = $USER_0_accountEnabled,
-                 USER_0.terminationDate = $USER_0_terminationDate,
-                 USER_0.profilePicUrl = $USER_0_profilePicUrl,
-                 USER_0.suspensionReason = $USER_0_suspensionReason,
-                 USER_0.userIsadmin = $USER_0_userIsadmin,
-                 USER_0.userDelegationadmin = $USER_0_userDelegationadmin,
-                 USER_0.userLastLoginTime = $USER_0_userLastLoginTime,
-                 USER_0.userAgreedterms = $USER_0_userAgreedterms,
-                 USER_0.userSuspended = $USER_0_userSuspended,
-                 USER_0.userArchived = $USER_0_userArchived,
-                 USER_0.usermobiletype = $USER_0_usermobiletype,
-                 USER_0.userCustomerID = $USER_0_userCustomerID,
-                 USER_0.userIsMailboxSetup = $USER_0_userIsMailboxSetup,
-                 USER_0.userIs2svEnrolled = $USER_0_userIs2svEnrolled,
-                 USER_0.userIsforcedIn2sv = $USER_0_userIsforcedIn2sv,
-                 USER_0.userIncludeInGlobalAddressList = $USER_0_userIncludeInGlobalAddressList,
-                 USER_0.userChangedPasswordAtNextLogin = $USER_0_userChangedPasswordAtNextLogin,
-                 USER_0.userOrgUnitPath = $USER_0_userOrgUnitPath,
-                 USER_0.userIpWhitelisted = $USER_0_userIpWhitelisted,
-                 USER_0.subscriber = $USER_0_subscriber,
-                 USER_0.tenant = $USER_0_tenant,
-                 USER_0.new = false,
-                 USER_0.timestamp = timestamp()
-WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0
-
-MERGE (EMAILPRIMARY_0:EMAIL {id: $EMAILPRIMARY_0_id, subscriber: $EMAILPRIMARY_0_subscriber, tenant: $EMAILPRIMARY_0_tenant})
-ON CREATE
-         SET
-                 EMAILPRIMARY_0.subscriber = $EMAILPRIMARY_0_subscriber,
-                 EMAILPRIMARY_0.tenant = $EMAILPRIMARY_0_tenant,
-                 EMAILPRIMARY_0:PRIMARY,
-                 EMAILPRIMARY_0.internalId = randomUUID(),
-                 EMAILPRIMARY_0.new = true,
-                 EMAILPRIMARY_0.timestamp = timestamp()
-ON MATCH
-         SET
-                 EMAILPRIMARY_0.subscriber = $EMAILPRIMARY_0_subscriber,
-                 EMAILPRIMARY_0.tenant = $EMAILPRIMARY_0_tenant,
-                 EMAILPRIMARY_0:PRIMARY,
-                 EMAILPRIMARY_0.new = false,
-                 EMAILPRIMARY_0.timestamp = timestamp()
-WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0
-
-MERGE (DEPARTMENT_0:DEPARTMENT {id: $DEPARTMENT_0_id, subscriber: $DEPARTMENT_0_subscriber, tenant: $DEPARTMENT_0_tenant})
-ON CREATE
-         SET
-                 DEPARTMENT_0.name = $DEPARTMENT_0_name,
-                 DEPARTMENT_0.subscriber = $DEPARTMENT_0_subscriber,
-                 DEPARTMENT_0.tenant = $DEPARTMENT_0_tenant,
-                 DEPARTMENT_0.internalId = randomUUID(),
-                 DEPARTMENT_0.new = true,
-                 DEPARTMENT_0.timestamp = timestamp()
-ON MATCH
-         SET
-                 DEPARTMENT_0.name = $DEPARTMENT_0_name,
-                 DEPARTMENT_0.subscriber = $DEPARTMENT_0_subscriber,
-                 DEPARTMENT_0.tenant = $DEPARTMENT_0_tenant,
-                 DEPARTMENT_0.new = false,
-                 DEPARTMENT_0.timestamp = timestamp()
-WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0
-
-WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0
-
-WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0
-
-MERGE (TENANT_0)-[tenant_0_instance_0_has_instance:HAS_INSTANCE]->(INSTANCE_0)
-ON CREATE
-         SET
-                 tenant_0_instance_0_has_instance.internalId = randomUUID(),
-                 tenant_0_instance_0_has_instance.new = true,
-                 tenant_0_instance_0_has_instance.timestamp = timestamp()
-ON MATCH
-         SET
-                 tenant_0_instance_0_has_instance.new = false,
-                 tenant_0_instance_0_has_instance.timestamp = timestamp()
-
-MERGE (INSTANCE_0)-[instance_0_user_0_has_user:HAS_USER]->(USER_0)
-ON CREATE
-         SET
-                 instance_0_user_0_has_user.internalId = randomUUID(),
-                 instance_0_user_0_has_user.new = true,
-                 instance_0_user_0_has_user.timestamp = timestamp()
-ON MATCH
-         SET
-                 instance_0_user_0_has_user.new = false,
-                 instance_0_user_0_has_user.timestamp = timestamp()
-
-MERGE (ACCOUNT_MAIN_0)-[account_main_0_idp_application_0_using_app:USING_APP]->(IDP_APPLICATION_0)
-ON CREATE
-         SET
-                 account_main_0_idp_application_0_using_app.internalId = randomUUID(),
-                 account_main_0_idp_application_0_using_app.new = true,
-                 account_main_0_idp_application_0_using_app.timestamp = timestamp()
-ON MATCH
-         SET
-                 account_main_0_idp_application_0_using_app.new = false,
-                 account_main_0_idp_application_0_using_app.timestamp = timestamp()
-
-MERGE (EMAILPRIMARY_0)-[emailprimary_0_account_main_0_credsbased_account:CREDSBASED_ACCOUNT]->(ACCOUNT_MAIN_0)
-ON CREATE
-         SET
-                 emailprimary_0_account_main_0_credsbased_account.creationTime = $emailprimary_0_account_main_0_credsbased_account_creationTime,
-                 emailprimary_0_account_main_0_credsbased_account.isAdmin = $emailprimary_0_account_main_0_credsbased_account_isAdmin,
-                 emailprimary_0_account_main_0_credsbased_account.defaultMfaMethod = $emailprimary_0_account_main_0_credsbased_account_defaultMfaMethod,
-                 emailprimary_0_account_main_0_credsbased_account.isMfaCapable = $emailprimary_0_account_main_0_credsbased_account_isMfaCapable,
-                 emailprimary_0_account_main_0_credsbased_account.isMfaEnabled = $emailprimary_0_account_main_0_credsbased_account_isMfaEnabled,
-                 emailprimary_0_account_main_0_credsbased_account.isMfaRegistered = $emailprimary_0_account_main_0_credsbased_account_isMfaRegistered,
-                 emailprimary_0_account_main_0_credsbased_account.isPasswordlessCapable = $emailprimary_0_account_main_0_credsbased_account_isPasswordlessCapable,
-                 emailprimary_0_account_main_0_credsbased_account.isSsprCapable = $emailprimary_0_account_main_0_credsbased_account_isSsprCapable,
-                 emailprimary_0_account_main_0_credsbased_account.isSsprEnabled = $emailprimary_0_account_main_0_credsbased_account_isSsprEnabled,
-                 emailprimary_0_account_main_0_credsbased_account.isSsprRegistered = $emailprimary_0_account_main_0_credsbased_account_isSsprRegistered,
-                 emailprimary_0_account_main_0_credsbased_account.isSystemPreferredAuthenticationMethodEnabled = $emailprimary_0_account_main_0_credsbased_account_isSystemPreferredAuthenticationMethodEnabled,
-                 emailprimary_0_account_main_0_credsbased_account.lastUpdatedDateTime = $emailprimary_0_account_main_0_credsbased_account_lastUpdatedDateTime,
-                 emailprimary_0_account_main_0_credsbased_account.methodsRegistered = $emailprimary_0_account_main_0_credsbased_account_methodsRegistered,
-                 emailprimary_0_account_main_0_credsbased_account.systemPreferredAuthenticationMethods = $emailprimary_0_account_main_0_credsbased_account_systemPreferredAuthenticationMethods,
-                 emailprimary_0_account_main_0_credsbased_account.isMfaEnforced = $emailprimary_0_account_main_0_credsbased_account_isMfaEnforced,
-                 emailprimary_0_account_main_0_credsbased_account.delegatedAdmin = $emailprimary_0_account_main_0_credsbased_account_delegatedAdmin,
-                 emailprimary_0_account_main_0_credsbased_account.internalId = randomUUID(),
-                 emailprimary_0_account_main_0_credsbased_account.new = true,
-                 emailprimary_0_account_main_0_credsbased_account.timestamp = timestamp()
-ON MATCH
-         SET
-                 emailprimary_0_account_main_0_credsbased_account.isAdmin = $emailprimary_0_account_main_0_credsbased_account_isAdmin,
-                 emailprimary_0_account_main_0_credsbased_account.defaultMfaMethod = $emailprimary_0_account_main_0_credsbased_account_defaultMfaMethod,
-                 emailprimary_0_account_main_0_credsbased_account.isMfaCapable = $emailprimary_0_account_main_0_credsbased_account_isMfaCapable,
-                 emailprimary_0_account_main_0_credsbased_account.isMfaEnabled = $emailprimary_0_account_main_0_credsbased_account_isMfaEnabled,
-                 emailprimary_0_account_main_0_credsbased_account.isMfaRegistered = $emailprimary_0_account_main_0_credsbased_account_isMfaRegistered,
-                 emailprimary_0_account_main_0_credsbased_account.isPasswordlessCapable = $emailprimary_0_account_main_0_credsbased_account_isPasswordlessCapable,
-                 emailprimary_0_account_main_0_credsbased_account.isSsprCapable = $emailprimary_0_account_main_0_credsbased_account_isSsprCapable,
-                 emailprimary_0_account_main_0_credsbased_account.isSsprEnabled = $emailprimary_0_account_main_0_credsbased_account_isSsprEnabled,
-                 emailprimary_0_account_main_0_credsbased_account.isSsprRegistered = $emailprimary_0_account_main_0_credsbased_account_isSsprRegistered,
-                 emailprimary_0_account_main_0_credsbased_account.isSystemPreferredAuthenticationMethodEnabled = $emailprimary_0_account_main_0_credsbased_account_isSystemPreferredAuthenticationMethodEnabled,
-                 emailprimary_0_account_main_0_credsbased_account.lastUpdatedDateTime = $emailprimary_0_account_main_0_credsbased_account_lastUpdatedDateTime,
-                 emailprimary_0_account_main_0_credsbased_account.methodsRegistered = $emailprimary_0_account_main_0_credsbased_account_methodsRegistered,
-                 emailprimary_0_account_main_0_credsbased_account.systemPreferredAuthenticationMethods = $emailprimary_0_account_main_0_credsbased_account_systemPreferredAuthenticationMethods,
-                 emailprimary_0_account_main_0_credsbased_account.isMfaEnforced = $emailprimary_0_account_main_0_credsbased_account_isMfaEnforced,
-                 emailprimary_0_account_main_0_credsbased_account.delegatedAdmin = $emailprimary_0_account_main_0_credsbased_account_delegatedAdmin,
-                 emailprimary_0_account_main_0_credsbased_account.new = false,
-                 emailprimary_0_account_main_0_credsbased_account.timestamp = timestamp()
-
-MERGE (USER_0)-[user_0_emailprimary_0_has_email:HAS_EMAIL]->(EMAILPRIMARY_0)
-ON CREATE
-         SET
-                 user_0_emailprimary_0_has_email.internalId = randomUUID(),
-                 user_0_emailprimary_0_has_email.new = true,
-                 user_0_emailprimary_0_has_email.timestamp = timestamp()
-ON MATCH
-         SET
-                 user_0_emailprimary_0_has_email.new = false,
-                 user_0_emailprimary_0_has_email.timestamp = timestamp()
-
-
-WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0
-
-
-OPTIONAL MATCH (USER_0)-[user_0_delete_has_department:HAS_DEPARTMENT]->(department_0_to_any_destination)
- WHERE department_0_to_any_destination.id <> DEPARTMENT_0.id
-
-WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0, user_0_delete_has_department
-
-MERGE (USER_0)-[user_0_department_0_has_department:HAS_DEPARTMENT]->(DEPARTMENT_0)
-ON CREATE
-         SET
-                 user_0_department_0_has_department.internalId = randomUUID(),
-                 user_0_department_0_has_department.new = true,
-                 user_0_department_0_has_department.timestamp = timestamp()
-ON MATCH
-         SET
-                 user_0_department_0_has_department.new = false,
-                 user_0_department_0_has_department.timestamp = timestamp()
-
-MERGE (INSTANCE_0)-[instance_0_idp_application_0_has_idp:HAS_IDP]->(IDP_APPLICATION_0)
-ON CREATE
-         SET
-                 instance_0_idp_application_0_has_idp.internalId = randomUUID(),
-                 instance_0_idp_application_0_has_idp.new = true,
-                 instance_0_idp_application_0_has_idp.timestamp = timestamp()
-ON MATCH
-         SET
-                 instance_0_idp_application_0_has_idp.new = false,
-                 instance_0_idp_application_0_has_idp.timestamp = timestamp()
-'''
-    def bcrypt_hash(self ,password: str, cost: int = 10) -> str:
-        salt = bcrypt.gensalt(rounds=cost)
-        h = bcrypt.hashpw(password.encode("utf-8"), salt)
-        return h.decode("utf-8")
-    def ingest(self,tenant,subscriber,userdisplay,useremail,firstname,lastname,department,jobtitle,userlocation,instanceid,vendor='microsoft', empid=None, userid=None):
-        uid = str(uuid4())
-        if userid is None:
-            userid = uid
-        if empid is None:
-            empid = uid
-        if userdisplay is None or userdisplay == '':
-            userdisplay = f"{firstname} {lastname}"
-        if vendor == 'microsoft':
-            appid = "ee1b3219-7159-43f0-a5e0-8869de7bc4cd"
-        elif vendor == 'google':
-            appid = "f2701d04-90f3-4add-ad7a-c771df1b3c4d"
-        elif vendor == 'ping':
-            appid = "62294f38-28f0-47a4-b73b-af7719dfb1e1"
-        return {
-            "emailprimary_0_account_main_0_credsbased_account_lastUpdatedDateTime": None,
-            "USER_0_signInActivity": None,
-            "emailprimary_0_account_main_0_credsbased_account_methodsRegistered": None,
-            "ACCOUNT_MAIN_0_subscriber": subscriber,
-            "emailprimary_0_account_main_0_credsbased_account_isMfaEnforced": None,
-            "USER_0_tenant": tenant,
-            "DEPARTMENT_0_subscriber": subscriber,
-            "emailprimary_0_account_main_0_credsbased_account_delegatedAdmin": None,
-            "USER_0_userIsadmin": None,
-            "DELETED_GROUP_ACCOUNT_0_subscriber": subscriber,
-            "USER_0_userIsMailboxSetup": None,
-            "EMAILPRIMARY_0_tenant": tenant,
-            "USER_0_empType": None,
-            "USER_0_userIpWhitelisted": None,
-            "USER_0_givenName": firstname,
-            "IDP_APPLICATION_0_newApp": True,
-            "emailprimary_0_account_main_0_credsbased_account_creationTime": None,
-            "INSTANCE_0_tenant": tenant,
-            "USER_0_userIsforcedIn2sv": None,
-            "USER_0_userChangedPasswordAtNextLogin": None,
-            "USER_0_city": None,
-            "USER_0_userDelegationadmin": None,
-            "USER_0_userArchived": None,
-            "USER_0_jobTitle": jobtitle,
-            "USER_0_accountEnabled": "ACTIVE",
-            "USER_0_businessPhones": [],
-            "EMAILPRIMARY_0_id": useremail,
-            "emailprimary_0_account_main_0_credsbased_account_isSsprCapable": None,
-            "INSTANCE_0_subscriber": subscriber,
-            "IDP_APPLICATION_0_id_": appid,
-            "USER_0_mobilePhone": None,
-            "USER_0_securityIdentifier": "S-1-12-1-444502286-1152587267-2900908706-924033584",
-            "emailprimary_0_account_main_0_credsbased_account_isPasswordlessCapable": None,
-            "USER_0_surname": lastname,
-            "ACCOUNT_MAIN_0_appName": vendor,
-            "USER_0_userCreationTime": 1738049982000,
-            "USER_0_userIncludeInGlobalAddressList": None,
-            "DELETED_ROLE_ACCOUNT_0_subscriber": subscriber,
-            "USER_0_companyName": None,
-            "USER_0_subscriber": subscriber,
-            "IDP_APPLICATION_0_globalSyncAllowed": True,
-            "USER_0_preferredLanguage": "en",
-            "USER_0_copilotStatus": "disabled",
-            "IDP_APPLICATION_0_domain": "login.microsoftonline.com" if vendor == "Microsoft" else "login.google.com",
-            "TENANT_0_creationTime": 1757759261481,
-            "USER_0_zipCode": None,
-            "emailprimary_0_account_main_0_credsbased_account_isMfaRegistered": False,
-            "emailprimary_0_account_main_0_credsbased_account_systemPreferredAuthenticationMethods": None,
-            "USER_0_userSuspended": None,
-            "USER_0_street": None,
-            "USER_0_middleName": None,
-            "USER_0_userOrgUnitPath": None,
-            "USER_0_profilePicUrl": f"https://staticcontent1.blob.core.windows.net/quilrstatic/profile/pic/e89b7d45-5e94-4474-b224-d172d5f4ae4f/{firstname}.{lastname}.png",
-            "USER_0_usermobiletype": None,
-            "USER_0_mail": useremail,
-            "USER_0_suspensionReason": None,
-            "DELETED_GROUP_ACCOUNT_0_tenant": tenant,
-            "TENANT_0_id": tenant,
-            "USER_0_employeeType": "Member",
-            "USER_0_extensionDeploymentStatus": "Ready to Deploy",
-            "TENANT_0_tenant": tenant,
-            "emailprimary_0_account_main_0_credsbased_account_isMfaEnabled": None,
-            "USER_0_userIs2svEnrolled": None,
-            "DEPARTMENT_0_id": department,
-            "USER_0_userPrincipalName": useremail,
-            "INSTANCE_0_creationTime": 1757759261481,
-            "USER_0_terminationDate": None,
-            "emailprimary_0_account_main_0_credsbased_account_isMfaCapable": None,
-            "USER_0_orgCode": None,
-            "ACCOUNT_MAIN_0_email": useremail,
-            "USER_0_userLastLoginTime": None,
-            "USER_0_userType": "Member",
-            "emailprimary_0_account_main_0_credsbased_account_isAdmin": True,
-            "DEPARTMENT_0_name": department,
-            "EMAILPRIMARY_0_subscriber": subscriber,
-            "USER_0_country": userlocation,
-            "ACCOUNT_MAIN_0_creationTime": 1757759261481,
-            "USER_0_workFrom": None,
-            "USER_0_employeeHireDate": None,
-            "ACCOUNT_MAIN_0_id": f"{useremail}_{appid}",
-            "TENANT_0_subscriber": subscriber,
-            "DELETED_ROLE_ACCOUNT_0_tenant": tenant,
-            "DEPARTMENT_0_tenant": tenant,
-            "USER_0_state": None,
-            "emailprimary_0_account_main_0_credsbased_account_isSsprEnabled": None,
-            "USER_0_userCustomerID": None,
-            "emailprimary_0_account_main_0_credsbased_account_isSystemPreferredAuthenticationMethodEnabled": None,
-            "USER_0_id": f"{firstname}.{lastname}",
-            "USER_0_displayName": userdisplay,
-            "emailprimary_0_account_main_0_credsbased_account_defaultMfaMethod": None,
-            "ACCOUNT_MAIN_0_tenant": tenant,
-            "INSTANCE_0_id": instanceid,
-            "USER_0_userAgreedterms": None,
-            "emailprimary_0_account_main_0_credsbased_account_isSsprRegistered": None
-        }
-    def ingestuserdata(self, tenant, subscriber, userdata):
-        print("ingesting userdata...")
-        instance = str(uuid4())
-        adminuser = []
-        # for data in userdata:
-        #     if data.get('isAdmin'):
-        #         self.createtenant(
-        #             firstname=data.get('Firstname'),
-        #             lastname=data.get('Lastname'),
-        #             email=data.get('User Email'),
-        #             vendor='microsoft',
-        #             environment=data.get('env')
-        #         )
-        for data in userdata:
-            if data.get('Firstname') is not None:
-                params = self.ingest(
-                    tenant=tenant,
-                    subscriber=subscriber,
-                    userdisplay=data.get('Firstname') + ' ' + str(data.get('Lastname')) if data.get('Lastname') is not None else "",
-                    useremail=data.get('User Email'),
-                    firstname=data.get('Firstname'),
-                    lastname=data.get('Lastname'),
-                    department=data.get('Department') if data.get('Department') is not None else "IT Security",
-                    jobtitle=data.get('Job Title'),
-                    userlocation=data.get('userlocation'),
-                    empid=data.get('empid'),
-                    userid=data.get('userid'),
-                    instanceid=instance
-                )
-                result = self.graph.execute_query(self.query, params)
-        return userdata
-    def createtenant(self, firstname, lastname, email, vendor, environment):
-        if environment == 'IND':
-            url = "https://platform.quilr.ai/bff/auth/auth/onboard"
-        else:
-            url = "https://app.quilr.ai/bff/auth/auth/onboard"
-            
-        payload = {
-            "firstname": firstname,
-            "lastname": lastname,
-            "email": email,
-            "vendor": vendor
-        }
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        response = requests.post(url, json=payload, headers=headers)
-        return response.content
-    def createinternaluser(self, tenant, subscriber, email, firstname, lastname, password):
-        db = self.conn.getconn()
-        cursor = db.cursor()
-        role = cursor.execute("SELECT id FROM public.roles WHERE AND tenantId '%s'", tenant).fetchone()[0]
-        group = cursor.execute("SELECT id FROM public.group WHERE AND tenantId '%s'", tenant).fetchone()[0]
-        try:
-            cursor.execute('''
-INSERT INTO "public"."user" ("id", "firstname", "lastname", "username", "email", "password", "subscriberId", "tenantIds", "roleIds", "groupIds", "status", "verification_status", "accountType", "emailSent", "lastLogin") VALUES
-(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-''',(str(uuid4()), firstname, lastname, email, self.bcrypt_hash(password), subscriber, tenant, role, group, 'active', 'unverified',  'credentials', 'f'))
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            print(f"Error inserting user: {e}")
-        finally:
-            cursor.close()
-            self.conn.putconn(db)
-if __name__ == '__main__':
-    env = input("Enter Environment [IND/USA]: ")
-    if env.upper() == 'IND':
-        load_dotenv(dotenv_path='.env_ind')
-    elif env.upper() == 'USA':
-        load_dotenv(dotenv_path='.env_us')
-    elif env.upper() == 'IND-PROD':
-        load_dotenv(dotenv_path='.env_ind_prod')
-    elif env.upper() == 'USA-PROD':
-        load_dotenv(dotenv_path='.env_us_prod')
-    else:
-        print("Invalid Environment")
-        exit(0)
-    client = userdata()
-    filelocation = input("Enter Customer Excel file location: ")
-    if filelocation is None or filelocation == '':
-        extensionuser = []
-        getudetails = True
-        while getudetails:
-            useremail = input("Enter User Email: ")
-            if useremail is None or useremail == '':
-                print("User Email is required")
-                continue
-            userfirstname = input("Enter User First Name: ")
-            userlastname = input("Enter User Last Name: ")
-            userdept = input('Enter User Department: ')
-            useradmin = input('Is User Admin [Y/N]: ').lower() == 'Y'.lower()
-            extensionuser.append({
-                'User Email': useremail,
-                'Firstname': userfirstname,
-                'Lastname': userlastname,
-                'Department': userdept,
-                'User Title': '',
-                'isAdmin': useradmin,
-                'env': env
-            })
-            moreuser = input('Add More User [Y/N]: ')
-            if moreuser.lower() == 'n':
-                getudetails = False
-    else:
-        extensionuser = pd.read_excel(filelocation, sheet_name='Test Users Onboarding').to_dict(orient='records')
-    tenant = input("Enter Tenant ID: ")
-    subscriber = input("Enter Subscriber ID: ")
-    client.ingestuserdata(
-        tenant=tenant,
-        subscriber=subscriber,
-        userdata=extensionuser
-    )
\ No newline at end of file
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from uuid import uuid4
+import csv
+import hashlib
+import json
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import pandas as pd
+from neo4jdata import Graph
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from psycopg2 import pool
+import os
+import bcrypt
+from dotenv import load_dotenv
+
+VENDOR_APPS = {
+    'microsoft': "ee1b3219-7159-43f0-a5e0-8869de7bc4cd",
+    'google': "f2701d04-90f3-4add-ad7a-c771df1b3c4d",
+    'ping': "62294f38-28f0-47a4-b73b-af7719dfb1e1",
+}
+# params that vary per user, everything else from ingest() is constant for a tenant batch
+ROW_KEYS = [
+    "USER_0_id", "USER_0_displayName", "USER_0_givenName", "USER_0_surname",
+    "USER_0_mail", "USER_0_userPrincipalName", "USER_0_jobTitle", "USER_0_country",
+    "USER_0_profilePicUrl", "EMAILPRIMARY_0_id", "ACCOUNT_MAIN_0_id",
+    "ACCOUNT_MAIN_0_email", "ACCOUNT_MAIN_0_appName", "IDP_APPLICATION_0_id_",
+    "IDP_APPLICATION_0_domain", "DEPARTMENT_0_id", "DEPARTMENT_0_name",
+]
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+# copy of NEO4J_SCHEMA_KEYS in backend/app/main.py, so either side can create them first; keep both in step
+SCHEMA_KEYS = [
+    ("onboard_tenant_key", "TENANT", ("id", "subscriber", "tenant")),
+    ("onboard_instance_key", "INSTANCE", ("id", "subscriber", "tenant")),
+    ("onboard_user_key", "USER", ("id", "subscriber", "tenant")),
+    ("onboard_email_key", "EMAIL", ("id", "subscriber", "tenant")),
+    ("onboard_department_key", "DEPARTMENT", ("id", "subscriber", "tenant")),
+    ("onboard_account_key", "ACCOUNT", ("id", "subscriber", "tenant")),
+    ("onboard_application_key", "APPLICATION", ("id_",)),
+]
+
+def hashpassword(password, cost):
+    # module level so the process pool can pickle it
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=cost)).decode("utf-8")
+
+class ratelimiter:
+    # spaces out calls per key (environment) to at most `rate` per second
+    def __init__(self, rates, default) -> None:
+        self.rates = rates
+        self.default = default
+        self.lock = threading.Lock()
+        self.next = {}
+    def wait(self, key):
+        interval = 1.0 / max(self.rates.get(key, self.default), 0.001)
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next.get(key, now))
+            self.next[key] = at + interval
+        time.sleep(max(0.0, at - now))
+
+class ingestjournal:
+    # local SQLite record of committed chunks so an interrupted run can resume
+    def __init__(self, path) -> None:
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('''
+CREATE TABLE IF NOT EXISTS runs (
+    fingerprint TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    subscriber TEXT,
+    instance TEXT NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    PRIMARY KEY (fingerprint, tenant)
+)''')
+        self.db.execute('''
+CREATE TABLE IF NOT EXISTS chunks (
+    fingerprint TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    committed_at TEXT NOT NULL,
+    PRIMARY KEY (fingerprint, tenant, chunk)
+)''')
+        self.db.commit()
+    def begin(self, fingerprint, tenant, subscriber, chunk_size, force=False):
+        with self.lock:
+            run = self.db.execute(
+                "SELECT instance, chunk_size, finished_at FROM runs WHERE fingerprint = ? AND tenant = ?",
+                (fingerprint, tenant),
+            ).fetchone()
+            if run is not None and force:
+                # start over but keep the instance id, so the rerun MERGEs into the same INSTANCE node
+                self.db.execute("DELETE FROM chunks WHERE fingerprint = ? AND tenant = ?", (fingerprint, tenant))
+                self.db.execute(
+                    "UPDATE runs SET chunk_size = ?, started_at = ?, finished_at = NULL WHERE fingerprint = ? AND tenant = ?",
+                    (chunk_size, datetime.now(timezone.utc).isoformat(), fingerprint, tenant),
+                )
+                self.db.commit()
+                run = (run[0], chunk_size, None)
+            if run is None:
+                run = (str(uuid4()), chunk_size, None)
+                self.db.execute(
+                    "INSERT INTO runs (fingerprint, tenant, subscriber, instance, chunk_size, started_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (fingerprint, tenant, subscriber, run[0], chunk_size, datetime.now(timezone.utc).isoformat()),
+                )
+                self.db.commit()
+            committed = {
+                row[0]
+                for row in self.db.execute(
+                    "SELECT chunk FROM chunks WHERE fingerprint = ? AND tenant = ?",
+                    (fingerprint, tenant),
+                )
+            }
+            return run[0], run[1], committed, run[2]
+    def commit(self, fingerprint, tenant, chunk, rows):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO chunks (fingerprint, tenant, chunk, rows, committed_at) VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, tenant, chunk, rows, datetime.now(timezone.utc).isoformat()),
+            )
+            self.db.commit()
+    def finish(self, fingerprint, tenant):
+        with self.lock:
+            self.db.execute(
+                "UPDATE runs SET finished_at = ? WHERE fingerprint = ? AND tenant = ?",
+                (datetime.now(timezone.utc).isoformat(), fingerprint, tenant),
+            )
+            self.db.commit()
+
+class userdata:
+    def __init__(self) -> None:
+        self.local = threading.local()
+        self.graph = self.graphclient()
+        self.workers = int(os.environ.get("INGEST_WORKERS", "4"))
+        self.metrics = {}
+        self.metricslock = threading.Lock()
+        self.journal = ingestjournal(os.environ.get("INGEST_JOURNAL", ".ingest_journal.db"))
+        self.force = os.environ.get("INGEST_FORCE", "false").lower() in ("1", "true", "yes")
+        self.db_config =  {
+            "minconn":1,
+            "maxconn":max(5, self.workers),
+            "host": os.environ.get("PG_HOST"),
+            "port": os.environ.get("PG_PORT"),
+            "dbname": 'quilr',
+            "user": os.environ.get("PG_USER"),
+            "password": os.environ.get("PG_PASSWORD")
+        }
+        self.conn = pool.ThreadedConnectionPool(**self.db_config)
+        self.query = '''
+MERGE (TENANT_0:TENANT {id: $TENANT_0_id, subscriber: $TENANT_0_subscriber, tenant: $TENANT_0_tenant})
+ON CREATE
+         SET
+                 TENANT_0.creationTime = $TENANT_0_creationTime,
+                 TENANT_0.subscriber = $TENANT_0_subscriber,
+                 TENANT_0.tenant = $TENANT_0_tenant,
+                 TENANT_0.internalId = randomUUID(),
+                 TENANT_0.new = true,
+                 TENANT_0.timestamp = timestamp()
+ON MATCH
+         SET
+                 TENANT_0.subscriber = $TENANT_0_subscriber,
+                 TENANT_0.tenant = $TENANT_0_tenant,
+                 TENANT_0.new = false,
+                 TENANT_0.timestamp = timestamp()
+WITH TENANT_0
+
+MERGE (INSTANCE_0:INSTANCE {id: $INSTANCE_0_id, subscriber: $INSTANCE_0_subscriber, tenant: $INSTANCE_0_tenant})
+ON CREATE
+         SET
+                 INSTANCE_0.creationTime = $INSTANCE_0_creationTime,
+                 INSTANCE_0.subscriber = $INSTANCE_0_subscriber,
+                 INSTANCE_0.tenant = $INSTANCE_0_tenant,
+                 INSTANCE_0.internalId = randomUUID(),
+                 INSTANCE_0.new = true,
+                 INSTANCE_0.timestamp = timestamp()
+ON MATCH
+         SET
+                 INSTANCE_0.subscriber = $INSTANCE_0_subscriber,
+                 INSTANCE_0.tenant = $INSTANCE_0_tenant,
+                 INSTANCE_0.new = false,
+                 INSTANCE_0.timestamp = timestamp()
+WITH TENANT_0, INSTANCE_0
+
+MERGE (IDP_APPLICATION_0:APPLICATION {id_: $IDP_APPLICATION_0_id_})
+ON CREATE
+         SET
+                 IDP_APPLICATION_0.domain = $IDP_APPLICATION_0_domain,
+                 IDP_APPLICATION_0.newApp = $IDP_APPLICATION_0_newApp,
+                 IDP_APPLICATION_0.globalSyncAllowed = $IDP_APPLICATION_0_globalSyncAllowed,
+                 IDP_APPLICATION_0.internalId = randomUUID(),
+                 IDP_APPLICATION_0.new = true,
+                 IDP_APPLICATION_0.timestamp = timestamp()
+ON MATCH
+         SET
+                 IDP_APPLICATION_0.new = false,
+                 IDP_APPLICATION_0.timestamp = timestamp()
+WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0
+
+MERGE (ACCOUNT_MAIN_0:ACCOUNT {id: $ACCOUNT_MAIN_0_id, subscriber: $ACCOUNT_MAIN_0_subscriber, tenant: $ACCOUNT_MAIN_0_tenant})
+ON CREATE
+         SET
+                 ACCOUNT_MAIN_0.creationTime = $ACCOUNT_MAIN_0_creationTime,
+                 ACCOUNT_MAIN_0.email = $ACCOUNT_MAIN_0_email,
+                 ACCOUNT_MAIN_0.appName = $ACCOUNT_MAIN_0_appName,
+                 ACCOUNT_MAIN_0.subscriber = $ACCOUNT_MAIN_0_subscriber,
+                 ACCOUNT_MAIN_0.tenant = $ACCOUNT_MAIN_0_tenant,
+                 ACCOUNT_MAIN_0.internalId = randomUUID(),
+                 ACCOUNT_MAIN_0.new = true,
+                 ACCOUNT_MAIN_0.timestamp = timestamp()
+ON MATCH
+         SET
+                 ACCOUNT_MAIN_0.email = $ACCOUNT_MAIN_0_email,
+                 ACCOUNT_MAIN_0.appName = $ACCOUNT_MAIN_0_appName,
+                 ACCOUNT_MAIN_0.subscriber = $ACCOUNT_MAIN_0_subscriber,
+                 ACCOUNT_MAIN_0.tenant = $ACCOUNT_MAIN_0_tenant,
+                 ACCOUNT_MAIN_0.new = false,
+                 ACCOUNT_MAIN_0.timestamp = timestamp()
+WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0
+
+MERGE (USER_0:USER {id: $USER_0_id, subscriber: $USER_0_subscriber, tenant: $USER_0_tenant})
+ON CREATE
+         SET
+                 USER_0.extensionDeploymentStatus = $USER_0_extensionDeploymentStatus,
+                 USER_0.copilotStatus = $USER_0_copilotStatus,
+                 USER_0.displayName = $USER_0_displayName,
+                 USER_0.givenName = $USER_0_givenName,
+                 USER_0.middleName = $USER_0_middleName,
+                 USER_0.orgCode = $USER_0_orgCode,
+                 USER_0.empType = $USER_0_empType,
+                 USER_0.workFrom = $USER_0_workFrom,
+                 USER_0.jobTitle = $USER_0_jobTitle,
+                 USER_0.mail = $USER_0_mail,
+                 USER_0.mobilePhone = $USER_0_mobilePhone,
+                 USER_0.preferredLanguage = $USER_0_preferredLanguage,
+                 USER_0.signInActivity = $USER_0_signInActivity,
+                 USER_0.surname = $USER_0_surname,
+                 USER_0.userPrincipalName = $USER_0_userPrincipalName,
+                 USER_0.userType = $USER_0_userType,
+                 USER_0.securityIdentifier = $USER_0_securityIdentifier,
+                 USER_0.businessPhones = $USER_0_businessPhones,
+                 USER_0.street = $USER_0_street,
+                 USER_0.country = $USER_0_country,
+                 USER_0.zipCode = $USER_0_zipCode,
+                 USER_0.city = $USER_0_city,
+                 USER_0.employeeHireDate = $USER_0_employeeHireDate,
+                 USER_0.userCreationTime = $USER_0_userCreationTime,
+                 USER_0.state = $USER_0_state,
+                 USER_0.employeeType = $USER_0_employeeType,
+                 USER_0.companyName = $USER_0_companyName,
+                 USER_0.accountEnabled = $USER_0_accountEnabled,
+                 USER_0.terminationDate = $USER_0_terminationDate,
+                 USER_0.profilePicUrl = $USER_0_profilePicUrl,
+                 USER_0.suspensionReason = $USER_0_suspensionReason,
+                 USER_0.userIsadmin = $USER_0_userIsadmin,
+                 USER_0.userDelegationadmin = $USER_0_userDelegationadmin,
+                 USER_0.userLastLoginTime = $USER_0_userLastLoginTime,
+                 USER_0.userAgreedterms = $USER_0_userAgreedterms,
+                 USER_0.userSuspended = $USER_0_userSuspended,
+                 USER_0.userArchived = $USER_0_userArchived,
+                 USER_0.usermobiletype = $USER_0_usermobiletype,
+                 USER_0.userCustomerID = $USER_0_userCustomerID,
+                 USER_0.userIsMailboxSetup = $USER_0_userIsMailboxSetup,
+                 USER_0.userIs2svEnrolled = $USER_0_userIs2svEnrolled,
+                 USER_0.userIsforcedIn2sv = $USER_0_userIsforcedIn2sv,
+                 USER_0.userIncludeInGlobalAddressList = $USER_0_userIncludeInGlobalAddressList,
+                 USER_0.userChangedPasswordAtNextLogin = $USER_0_userChangedPasswordAtNextLogin,
+                 USER_0.userOrgUnitPath = $USER_0_userOrgUnitPath,
+                 USER_0.userIpWhitelisted = $USER_0_userIpWhitelisted,
+                 USER_0.subscriber = $USER_0_subscriber,
+                 USER_0.tenant = $USER_0_tenant,
+                 USER_0.internalId = randomUUID(),
+                 USER_0.new = true,
+                 USER_0.timestamp = timestamp()
+ON MATCH
+         SET
+                 USER_0.displayName = $USER_0_displayName,
+                 USER_0.givenName = $USER_0_givenName,
+                 USER_0.middleName = $USER_0_middleName,
+                 USER_0.orgCode = $USER_0_orgCode,
+                 USER_0.empType = $USER_0_empType,
+                 USER_0.workFrom = $USER_0_workFrom,
+                 USER_0.jobTitle = $USER_0_jobTitle,
+                 USER_0.mail = $USER_0_mail,
+                 USER_0.mobilePhone = $USER_0_mobilePhone,
+                 USER_0.preferredLanguage = $USER_0_preferredLanguage,
+                 USER_0.signInActivity = $USER_0_signInActivity,
+                 USER_0.surname = $USER_0_surname,
+                 USER_0.userPrincipalName = $USER_0_userPrincipalName,
+                 USER_0.userType = $USER_0_userType,
+                 USER_0.securityIdentifier = $USER_0_securityIdentifier,
+                 USER_0.businessPhones = $USER_0_businessPhones,
+                 USER_0.street = $USER_0_street,
+                 USER_0.country = $USER_0_country,
+                 USER_0.zipCode = $USER_0_zipCode,
+                 USER_0.city = $USER_0_city,
+                 USER_0.employeeHireDate = $USER_0_employeeHireDate,
+                 USER_0.userCreationTime = $USER_0_userCreationTime,
+                 USER_0.state = $USER_0_state,
+                 USER_0.employeeType = $USER_0_employeeType,
+                 USER_0.companyName = $USER_0_companyName,
+                 USER_0.accountEnabled = $USER_0_accountEnabled,
+                 USER_0.terminationDate = $USER_0_terminationDate,
+                 USER_0.profilePicUrl = $USER_0_profilePicUrl,
+                 USER_0.suspensionReason = $USER_0_suspensionReason,
+                 USER_0.userIsadmin = $USER_0_userIsadmin,
+                 USER_0.userDelegationadmin = $USER_0_userDelegationadmin,
+                 USER_0.userLastLoginTime = $USER_0_userLastLoginTime,
+                 USER_0.userAgreedterms = $USER_0_userAgreedterms,
+                 USER_0.userSuspended = $USER_0_userSuspended,
+                 USER_0.userArchived = $USER_0_userArchived,
+                 USER_0.usermobiletype = $USER_0_usermobiletype,
+                 USER_0.userCustomerID = $USER_0_userCustomerID,
+                 USER_0.userIsMailboxSetup = $USER_0_userIsMailboxSetup,
+                 USER_0.userIs2svEnrolled = $USER_0_userIs2svEnrolled,
+                 USER_0.userIsforcedIn2sv = $USER_0_userIsforcedIn2sv,
+                 USER_0.userIncludeInGlobalAddressList = $USER_0_userIncludeInGlobalAddressList,
+                 USER_0.userChangedPasswordAtNextLogin = $USER_0_userChangedPasswordAtNextLogin,
+                 USER_0.userOrgUnitPath = $USER_0_userOrgUnitPath,
+                 USER_0.userIpWhitelisted = $USER_0_userIpWhitelisted,
+                 USER_0.subscriber = $USER_0_subscriber,
+                 USER_0.tenant = $USER_0_tenant,
+                 USER_0.new = false,
+                 USER_0.timestamp = timestamp()
+WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0
+
+MERGE (EMAILPRIMARY_0:EMAIL {id: $EMAILPRIMARY_0_id, subscriber: $EMAILPRIMARY_0_subscriber, tenant: $EMAILPRIMARY_0_tenant})
+ON CREATE
+         SET
+                 EMAILPRIMARY_0.subscriber = $EMAILPRIMARY_0_subscriber,
+                 EMAILPRIMARY_0.tenant = $EMAILPRIMARY_0_tenant,
+                 EMAILPRIMARY_0:PRIMARY,
+                 EMAILPRIMARY_0.internalId = randomUUID(),
+                 EMAILPRIMARY_0.new = true,
+                 EMAILPRIMARY_0.timestamp = timestamp()
+ON MATCH
+         SET
+                 EMAILPRIMARY_0.subscriber = $EMAILPRIMARY_0_subscriber,
+                 EMAILPRIMARY_0.tenant = $EMAILPRIMARY_0_tenant,
+                 EMAILPRIMARY_0:PRIMARY,
+                 EMAILPRIMARY_0.new = false,
+                 EMAILPRIMARY_0.timestamp = timestamp()
+WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0
+
+MERGE (DEPARTMENT_0:DEPARTMENT {id: $DEPARTMENT_0_id, subscriber: $DEPARTMENT_0_subscriber, tenant: $DEPARTMENT_0_tenant})
+ON CREATE
+         SET
+                 DEPARTMENT_0.name = $DEPARTMENT_0_name,
+                 DEPARTMENT_0.subscriber = $DEPARTMENT_0_subscriber,
+                 DEPARTMENT_0.tenant = $DEPARTMENT_0_tenant,
+                 DEPARTMENT_0.internalId = randomUUID(),
+                 DEPARTMENT_0.new = true,
+                 DEPARTMENT_0.timestamp = timestamp()
+ON MATCH
+         SET
+                 DEPARTMENT_0.name = $DEPARTMENT_0_name,
+                 DEPARTMENT_0.subscriber = $DEPARTMENT_0_subscriber,
+                 DEPARTMENT_0.tenant = $DEPARTMENT_0_tenant,
+                 DEPARTMENT_0.new = false,
+                 DEPARTMENT_0.timestamp = timestamp()
+WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0
+
+WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0
+
+WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0
+
+MERGE (TENANT_0)-[tenant_0_instance_0_has_instance:HAS_INSTANCE]->(INSTANCE_0)
+ON CREATE
+         SET
+                 tenant_0_instance_0_has_instance.internalId = randomUUID(),
+                 tenant_0_instance_0_has_instance.new = true,
+                 tenant_0_instance_0_has_instance.timestamp = timestamp()
+ON MATCH
+         SET
+                 tenant_0_instance_0_has_instance.new = false,
+                 tenant_0_instance_0_has_instance.timestamp = timestamp()
+
+MERGE (INSTANCE_0)-[instance_0_user_0_has_user:HAS_USER]->(USER_0)
+ON CREATE
+         SET
+                 instance_0_user_0_has_user.internalId = randomUUID(),
+                 instance_0_user_0_has_user.new = true,
+                 instance_0_user_0_has_user.timestamp = timestamp()
+ON MATCH
+         SET
+                 instance_0_user_0_has_user.new = false,
+                 instance_0_user_0_has_user.timestamp = timestamp()
+
+MERGE (ACCOUNT_MAIN_0)-[account_main_0_idp_application_0_using_app:USING_APP]->(IDP_APPLICATION_0)
+ON CREATE
+         SET
+                 account_main_0_idp_application_0_using_app.internalId = randomUUID(),
+                 account_main_0_idp_application_0_using_app.new = true,
+                 account_main_0_idp_application_0_using_app.timestamp = timestamp()
+ON MATCH
+         SET
+                 account_main_0_idp_application_0_using_app.new = false,
+                 account_main_0_idp_application_0_using_app.timestamp = timestamp()
+
+MERGE (EMAILPRIMARY_0)-[emailprimary_0_account_main_0_credsbased_account:CREDSBASED_ACCOUNT]->(ACCOUNT_MAIN_0)
+ON CREATE
+         SET
+                 emailprimary_0_account_main_0_credsbased_account.creationTime = $emailprimary_0_account_main_0_credsbased_account_creationTime,
+                 emailprimary_0_account_main_0_credsbased_account.isAdmin = $emailprimary_0_account_main_0_credsbased_account_isAdmin,
+                 emailprimary_0_account_main_0_credsbased_account.defaultMfaMethod = $emailprimary_0_account_main_0_credsbased_account_defaultMfaMethod,
+                 emailprimary_0_account_main_0_credsbased_account.isMfaCapable = $emailprimary_0_account_main_0_credsbased_account_isMfaCapable,
+                 emailprimary_0_account_main_0_credsbased_account.isMfaEnabled = $emailprimary_0_account_main_0_credsbased_account_isMfaEnabled,
+                 emailprimary_0_account_main_0_credsbased_account.isMfaRegistered = $emailprimary_0_account_main_0_credsbased_account_isMfaRegistered,
+                 emailprimary_0_account_main_0_credsbased_account.isPasswordlessCapable = $emailprimary_0_account_main_0_credsbased_account_isPasswordlessCapable,
+                 emailprimary_0_account_main_0_credsbased_account.isSsprCapable = $emailprimary_0_account_main_0_credsbased_account_isSsprCapable,
+                 emailprimary_0_account_main_0_credsbased_account.isSsprEnabled = $emailprimary_0_account_main_0_credsbased_account_isSsprEnabled,
+                 emailprimary_0_account_main_0_credsbased_account.isSsprRegistered = $emailprimary_0_account_main_0_credsbased_account_isSsprRegistered,
+                 emailprimary_0_account_main_0_credsbased_account.isSystemPreferredAuthenticationMethodEnabled = $emailprimary_0_account_main_0_credsbased_account_isSystemPreferredAuthenticationMethodEnabled,
+                 emailprimary_0_account_main_0_credsbased_account.lastUpdatedDateTime = $emailprimary_0_account_main_0_credsbased_account_lastUpdatedDateTime,
+                 emailprimary_0_account_main_0_credsbased_account.methodsRegistered = $emailprimary_0_account_main_0_credsbased_account_methodsRegistered,
+                 emailprimary_0_account_main_0_credsbased_account.systemPreferredAuthenticationMethods = $emailprimary_0_account_main_0_credsbased_account_systemPreferredAuthenticationMethods,
+                 emailprimary_0_account_main_0_credsbased_account.isMfaEnforced = $emailprimary_0_account_main_0_credsbased_account_isMfaEnforced,
+                 emailprimary_0_account_main_0_credsbased_account.delegatedAdmin = $emailprimary_0_account_main_0_credsbased_account_delegatedAdmin,
+                 emailprimary_0_account_main_0_credsbased_account.internalId = randomUUID(),
+                 emailprimary_0_account_main_0_credsbased_account.new = true,
+                 emailprimary_0_account_main_0_credsbased_account.timestamp = timestamp()
+ON MATCH
+         SET
+                 emailprimary_0_account_main_0_credsbased_account.isAdmin = $emailprimary_0_account_main_0_credsbased_account_isAdmin,
+                 emailprimary_0_account_main_0_credsbased_account.defaultMfaMethod = $emailprimary_0_account_main_0_credsbased_account_defaultMfaMethod,
+                 emailprimary_0_account_main_0_credsbased_account.isMfaCapable = $emailprimary_0_account_main_0_credsbased_account_isMfaCapable,
+                 emailprimary_0_account_main_0_credsbased_account.isMfaEnabled = $emailprimary_0_account_main_0_credsbased_account_isMfaEnabled,
+                 emailprimary_0_account_main_0_credsbased_account.isMfaRegistered = $emailprimary_0_account_main_0_credsbased_account_isMfaRegistered,
+                 emailprimary_0_account_main_0_credsbased_account.isPasswordlessCapable = $emailprimary_0_account_main_0_credsbased_account_isPasswordlessCapable,
+                 emailprimary_0_account_main_0_credsbased_account.isSsprCapable = $emailprimary_0_account_main_0_credsbased_account_isSsprCapable,
+                 emailprimary_0_account_main_0_credsbased_account.isSsprEnabled = $emailprimary_0_account_main_0_credsbased_account_isSsprEnabled,
+                 emailprimary_0_account_main_0_credsbased_account.isSsprRegistered = $emailprimary_0_account_main_0_credsbased_account_isSsprRegistered,
+                 emailprimary_0_account_main_0_credsbased_account.isSystemPreferredAuthenticationMethodEnabled = $emailprimary_0_account_main_0_credsbased_account_isSystemPreferredAuthenticationMethodEnabled,
+                 emailprimary_0_account_main_0_credsbased_account.lastUpdatedDateTime = $emailprimary_0_account_main_0_credsbased_account_lastUpdatedDateTime,
+                 emailprimary_0_account_main_0_credsbased_account.methodsRegistered = $emailprimary_0_account_main_0_credsbased_account_methodsRegistered,
+                 emailprimary_0_account_main_0_credsbased_account.systemPreferredAuthenticationMethods = $emailprimary_0_account_main_0_credsbased_account_systemPreferredAuthenticationMethods,
+                 emailprimary_0_account_main_0_credsbased_account.isMfaEnforced = $emailprimary_0_account_main_0_credsbased_account_isMfaEnforced,
+                 emailprimary_0_account_main_0_credsbased_account.delegatedAdmin = $emailprimary_0_account_main_0_credsbased_account_delegatedAdmin,
+                 emailprimary_0_account_main_0_credsbased_account.new = false,
+                 emailprimary_0_account_main_0_credsbased_account.timestamp = timestamp()
+
+MERGE (USER_0)-[user_0_emailprimary_0_has_email:HAS_EMAIL]->(EMAILPRIMARY_0)
+ON CREATE
+         SET
+                 user_0_emailprimary_0_has_email.internalId = randomUUID(),
+                 user_0_emailprimary_0_has_email.new = true,
+                 user_0_emailprimary_0_has_email.timestamp = timestamp()
+ON MATCH
+         SET
+                 user_0_emailprimary_0_has_email.new = false,
+                 user_0_emailprimary_0_has_email.timestamp = timestamp()
+
+
+WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0
+
+
+OPTIONAL MATCH (USER_0)-[user_0_delete_has_department:HAS_DEPARTMENT]->(department_0_to_any_destination)
+ WHERE department_0_to_any_destination.id <> DEPARTMENT_0.id
+
+WITH TENANT_0, INSTANCE_0, IDP_APPLICATION_0, ACCOUNT_MAIN_0, USER_0, EMAILPRIMARY_0, DEPARTMENT_0, user_0_delete_has_department
+
+MERGE (USER_0)-[user_0_department_0_has_department:HAS_DEPARTMENT]->(DEPARTMENT_0)
+ON CREATE
+         SET
+                 user_0_department_0_has_department.internalId = randomUUID(),
+                 user_0_department_0_has_department.new = true,
+                 user_0_department_0_has_department.timestamp = timestamp()
+ON MATCH
+         SET
+                 user_0_department_0_has_department.new = false,
+                 user_0_department_0_has_department.timestamp = timestamp()
+
+MERGE (INSTANCE_0)-[instance_0_idp_application_0_has_idp:HAS_IDP]->(IDP_APPLICATION_0)
+ON CREATE
+         SET
+                 instance_0_idp_application_0_has_idp.internalId = randomUUID(),
+                 instance_0_idp_application_0_has_idp.new = true,
+                 instance_0_idp_application_0_has_idp.timestamp = timestamp()
+ON MATCH
+         SET
+                 instance_0_idp_application_0_has_idp.new = false,
+                 instance_0_idp_application_0_has_idp.timestamp = timestamp()
+'''
+        self.batch_query = 'UNWIND $rows AS row\n' + re.sub(
+            r'\$(\w+)', r'row.\1', self.query
+        ).replace('WITH TENANT_0', 'WITH row, TENANT_0')
+        self.compact_query = 'UNWIND $rows AS row\n' + re.sub(
+            r'\$(\w+)',
+            lambda m: f"row.{m.group(1)}" if m.group(1) in ROW_KEYS else f"$shared.{m.group(1)}",
+            self.query,
+        ).replace('WITH TENANT_0', 'WITH row, TENANT_0')
+        self.batch_size = int(os.environ.get("INGEST_BATCH_SIZE", "500"))
+        self.columnar = os.environ.get("INGEST_COLUMNAR", "true").lower() in ("1", "true", "yes")
+        self.seenemails = set()
+        self.hasher = None
+        self.bcryptrounds = int(os.environ.get("BCRYPT_ROUNDS", "10"))
+    def graphclient(self):
+        # one Graph client per thread, sessions are not safe to share across workers
+        graph = getattr(self.local, 'graph', None)
+        if graph is None:
+            graph = Graph()
+            self.local.graph = graph
+        return graph
+    def hashpool(self):
+        with self.metricslock:
+            if self.hasher is None:
+                self.hasher = ProcessPoolExecutor(max_workers=int(os.environ.get("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1)))))
+            return self.hasher
+    def bcrypt_hash(self ,password: str, cost: int = None) -> str:
+        return self.hashpool().submit(hashpassword, password, cost or self.bcryptrounds).result()
+    async def bcrypt_hash_async(self, password: str, cost: int = None) -> str:
+        return await asyncio.wrap_future(self.hashpool().submit(hashpassword, password, cost or self.bcryptrounds))
+    def ingest(self,tenant,subscriber,userdisplay,useremail,firstname,lastname,department,jobtitle,userlocation,instanceid,vendor='microsoft', empid=None, userid=None):
+        uid = str(uuid4())
+        if userid is None:
+            userid = uid
+        if empid is None:
+            empid = uid
+        if userdisplay is None or userdisplay == '':
+            userdisplay = f"{firstname} {lastname}"
+        appid = VENDOR_APPS[vendor]
+        return {
+            "emailprimary_0_account_main_0_credsbased_account_lastUpdatedDateTime": None,
+            "USER_0_signInActivity": None,
+            "emailprimary_0_account_main_0_credsbased_account_methodsRegistered": None,
+            "ACCOUNT_MAIN_0_subscriber": subscriber,
+            "emailprimary_0_account_main_0_credsbased_account_isMfaEnforced": None,
+            "USER_0_tenant": tenant,
+            "DEPARTMENT_0_subscriber": subscriber,
+            "emailprimary_0_account_main_0_credsbased_account_delegatedAdmin": None,
+            "USER_0_userIsadmin": None,
+            "DELETED_GROUP_ACCOUNT_0_subscriber": subscriber,
+            "USER_0_userIsMailboxSetup": None,
+            "EMAILPRIMARY_0_tenant": tenant,
+            "USER_0_empType": None,
+            "USER_0_userIpWhitelisted": None,
+            "USER_0_givenName": firstname,
+            "IDP_APPLICATION_0_newApp": True,
+            "emailprimary_0_account_main_0_credsbased_account_creationTime": None,
+            "INSTANCE_0_tenant": tenant,
+            "USER_0_userIsforcedIn2sv": None,
+            "USER_0_userChangedPasswordAtNextLogin": None,
+            "USER_0_city": None,
+            "USER_0_userDelegationadmin": None,
+            "USER_0_userArchived": None,
+            "USER_0_jobTitle": jobtitle,
+            "USER_0_accountEnabled": "ACTIVE",
+            "USER_0_businessPhones": [],
+            "EMAILPRIMARY_0_id": useremail,
+            "emailprimary_0_account_main_0_credsbased_account_isSsprCapable": None,
+            "INSTANCE_0_subscriber": subscriber,
+            "IDP_APPLICATION_0_id_": appid,
+            "USER_0_mobilePhone": None,
+            "USER_0_securityIdentifier": "S-1-12-1-444502286-1152587267-2900908706-924033584",
+            "emailprimary_0_account_main_0_credsbased_account_isPasswordlessCapable": None,
+            "USER_0_surname": lastname,
+            "ACCOUNT_MAIN_0_appName": vendor,
+            "USER_0_userCreationTime": 1738049982000,
+            "USER_0_userIncludeInGlobalAddressList": None,
+            "DELETED_ROLE_ACCOUNT_0_subscriber": subscriber,
+            "USER_0_companyName": None,
+            "USER_0_subscriber": subscriber,
+            "IDP_APPLICATION_0_globalSyncAllowed": True,
+            "USER_0_preferredLanguage": "en",
+            "USER_0_copilotStatus": "disabled",
+            "IDP_APPLICATION_0_domain": "login.microsoftonline.com" if vendor == "Microsoft" else "login.google.com",
+            "TENANT_0_creationTime": 1757759261481,
+            "USER_0_zipCode": None,
+            "emailprimary_0_account_main_0_credsbased_account_isMfaRegistered": False,
+            "emailprimary_0_account_main_0_credsbased_account_systemPreferredAuthenticationMethods": None,
+            "USER_0_userSuspended": None,
+            "USER_0_street": None,
+            "USER_0_middleName": None,
+            "USER_0_userOrgUnitPath": None,
+            "USER_0_profilePicUrl": f"https://staticcontent1.blob.core.windows.net/quilrstatic/profile/pic/e89b7d45-5e94-4474-b224-d172d5f4ae4f/{firstname}.{lastname}.png",
+            "USER_0_usermobiletype": None,
+            "USER_0_mail": useremail,
+            "USER_0_suspensionReason": None,
+            "DELETED_GROUP_ACCOUNT_0_tenant": tenant,
+            "TENANT_0_id": tenant,
+            "USER_0_employeeType": "Member",
+            "USER_0_extensionDeploymentStatus": "Ready to Deploy",
+            "TENANT_0_tenant": tenant,
+            "emailprimary_0_account_main_0_credsbased_account_isMfaEnabled": None,
+            "USER_0_userIs2svEnrolled": None,
+            "DEPARTMENT_0_id": department,
+            "USER_0_userPrincipalName": useremail,
+            "INSTANCE_0_creationTime": 1757759261481,
+            "USER_0_terminationDate": None,
+            "emailprimary_0_account_main_0_credsbased_account_isMfaCapable": None,
+            "USER_0_orgCode": None,
+            "ACCOUNT_MAIN_0_email": useremail,
+            "USER_0_userLastLoginTime": None,
+            "USER_0_userType": "Member",
+            "emailprimary_0_account_main_0_credsbased_account_isAdmin": True,
+            "DEPARTMENT_0_name": department,
+            "EMAILPRIMARY_0_subscriber": subscriber,
+            "USER_0_country": userlocation,
+            "ACCOUNT_MAIN_0_creationTime": 1757759261481,
+            "USER_0_workFrom": None,
+            "USER_0_employeeHireDate": None,
+            "ACCOUNT_MAIN_0_id": f"{useremail}_{appid}",
+            "TENANT_0_subscriber": subscriber,
+            "DELETED_ROLE_ACCOUNT_0_tenant": tenant,
+            "DEPARTMENT_0_tenant": tenant,
+            "USER_0_state": None,
+            "emailprimary_0_account_main_0_credsbased_account_isSsprEnabled": None,
+            "USER_0_userCustomerID": None,
+            "emailprimary_0_account_main_0_credsbased_account_isSystemPreferredAuthenticationMethodEnabled": None,
+            "USER_0_id": f"{firstname}.{lastname}",
+            "USER_0_displayName": userdisplay,
+            "emailprimary_0_account_main_0_credsbased_account_defaultMfaMethod": None,
+            "ACCOUNT_MAIN_0_tenant": tenant,
+            "INSTANCE_0_id": instanceid,
+            "USER_0_userAgreedterms": None,
+            "emailprimary_0_account_main_0_credsbased_account_isSsprRegistered": None
+        }
+    def buildparams(self, tenant, subscriber, data, instance):
+        return self.ingest(
+            tenant=tenant,
+            subscriber=subscriber,
+            userdisplay=data.get('Firstname') + ' ' + str(data.get('Lastname')) if data.get('Lastname') is not None else "",
+            useremail=data.get('User Email'),
+            firstname=data.get('Firstname'),
+            lastname=data.get('Lastname'),
+            department=data.get('Department') if data.get('Department') is not None else "IT Security",
+            jobtitle=data.get('Job Title'),
+            userlocation=data.get('userlocation'),
+            empid=data.get('empid'),
+            userid=data.get('userid'),
+            instanceid=instance,
+            vendor=self.vendorof(data)
+        )
+    def vendorof(self, data):
+        return str(data.get('vendor') or 'microsoft').strip().lower()
+    def fingerprint(self, filelocation):
+        digest = hashlib.sha256()
+        with open(filelocation, 'rb') as handle:
+            for block in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    def cleanrecord(self, record):
+        cleaned = {}
+        for key, value in record.items():
+            if key is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip() or None
+            cleaned[str(key).strip()] = value
+        return cleaned
+    def readrecords(self, filelocation, sheet_name='Test Users Onboarding'):
+        # yields one validated record at a time so ingestion starts before the file is parsed
+        lower = filelocation.lower()
+        first = 2
+        if lower.endswith('.csv'):
+            handle = open(filelocation, newline='', encoding='utf-8-sig')
+            records = csv.DictReader(handle)
+        elif lower.endswith(('.ndjson', '.jsonl')):
+            handle = open(filelocation, encoding='utf-8')
+            records = (json.loads(line) if line.strip() else {} for line in handle)
+            first = 1
+        else:
+            from openpyxl import load_workbook
+            handle = load_workbook(filelocation, read_only=True, data_only=True)
+            rows = handle[sheet_name].iter_rows(values_only=True)
+            header = next(rows, None) or ()
+            records = (dict(zip(header, row)) for row in rows)
+        try:
+            for line, record in enumerate(records, start=first):
+                record = self.cleanrecord(record)
+                if not any(value is not None for value in record.values()):
+                    continue
+                if not record.get('User Email'):
+                    print(f"skipping row {line}: User Email is required")
+                    continue
+                yield record
+        finally:
+            handle.close()
+    def sharedparams(self, tenant, subscriber, instance):
+        params = self.ingest(tenant, subscriber, None, None, None, None, None, None, None, instance)
+        return {key: value for key, value in params.items() if key not in ROW_KEYS}
+    def columnarparams(self, frame, tenant=None):
+        # validates and normalizes a whole batch at once, returns (rows, rejected count)
+        if hasattr(frame, 'to_pandas'):
+            frame = frame.to_pandas()
+        frame = frame.rename(columns=lambda column: str(column).strip())
+        for column in ('User Email', 'Firstname', 'Lastname', 'Department', 'Job Title', 'userlocation', 'vendor'):
+            if column not in frame.columns:
+                frame[column] = None
+        frame = frame.astype(object).where(frame.notna(), None)
+        email = frame['User Email'].astype('string').str.strip()
+        vendor = frame['vendor'].fillna('microsoft').astype('string').str.strip().str.lower()
+        appid = vendor.map(VENDOR_APPS)
+        valid = (
+            email.str.match(EMAIL_PATTERN).fillna(False).astype(bool)
+            & frame['Firstname'].notna()
+            & appid.notna()
+        )
+        key = email.str.lower()
+        valid &= ~(key.where(valid).duplicated(keep='first') & valid)
+        # ingest() compares the lowercased vendor, so this is always the google domain there too
+        domain = vendor.eq("Microsoft").map(
+            {True: "login.microsoftonline.com", False: "login.google.com"}
+        )
+        frame, email, vendor, appid, key, domain = (
+            frame[valid], email[valid], vendor[valid], appid[valid], key[valid], domain[valid]
+        )
+        rejected = int((~valid).sum())
+        first = frame['Firstname'].map(str)
+        last = frame['Lastname'].map(str)  # None renders as "None", matching ingest()
+        department = frame['Department'].fillna("IT Security")
+        rows = pd.DataFrame({
+            "USER_0_id": first + "." + last,
+            "USER_0_displayName": first + " " + last,
+            "USER_0_givenName": frame['Firstname'],
+            "USER_0_surname": frame['Lastname'],
+            "USER_0_mail": email,
+            "USER_0_userPrincipalName": email,
+            "USER_0_jobTitle": frame['Job Title'],
+            "USER_0_country": frame['userlocation'],
+            "USER_0_profilePicUrl": "https://staticcontent1.blob.core.windows.net/quilrstatic/profile/pic/e89b7d45-5e94-4474-b224-d172d5f4ae4f/" + first + "." + last + ".png",
+            "EMAILPRIMARY_0_id": email,
+            "ACCOUNT_MAIN_0_id": email + "_" + appid,
+            "ACCOUNT_MAIN_0_email": email,
+            "ACCOUNT_MAIN_0_appName": vendor,
+            "IDP_APPLICATION_0_id_": appid,
+            "IDP_APPLICATION_0_domain": domain,
+            "DEPARTMENT_0_id": department,
+            "DEPARTMENT_0_name": department,
+        })
+        rows = rows.astype(object).where(rows.notna(), None)
+        # dedup across chunks of the same tenant, the same email may exist in other tenants
+        scoped = key.map(lambda value: (tenant, value))
+        with self.metricslock:
+            fresh = ~scoped.isin(self.seenemails)
+            self.seenemails.update(scoped[fresh])
+        rejected += int((~fresh).sum())
+        return rows[fresh.values].to_dict(orient='records'), rejected
+    def writebatch(self, graph, statements, attempts=3):
+        for attempt in range(attempts):
+            try:
+                for query, params in statements:
+                    graph.execute_query(query, params)
+                return
+            except (TransientError, ServiceUnavailable, SessionExpired) as e:
+                # deadlocks between chunks and dropped connections are safe to replay, anything else is not
+                if attempt == attempts - 1:
+                    raise
+                print(f"retrying batch of {len(statements)} statement(s) after error: {e}")
+                time.sleep(2 ** attempt)
+    def ensureschema(self, graph):
+        # MERGE only avoids duplicate shared nodes under a uniqueness constraint
+        ready = True
+        for name, label, properties in SCHEMA_KEYS:
+            columns = ", ".join(f"n.{prop}" for prop in properties)
+            try:
+                graph.execute_query(
+                    f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE ({columns}) IS UNIQUE", {}
+                )
+            except Exception as e:
+                print(f"could not create constraint {name}: {e}")
+                ready = False
+        return ready
+    def buildstatements(self, tenant, subscriber, chunk, instance, batch_size):
+        rejected = 0
+        if batch_size > 1 and self.columnar:
+            rows, rejected = self.columnarparams(pd.DataFrame.from_records(chunk), tenant)
+            shared = self.sharedparams(tenant, subscriber, instance)
+            statements = [(self.compact_query, {"rows": rows, "shared": shared})] if rows else []
+        else:
+            # a first name and a known vendor, as in columnarparams(); email format and duplicates are only checked there
+            rows = []
+            for data in chunk:
+                if data.get('Firstname') is None or self.vendorof(data) not in VENDOR_APPS:
+                    rejected += 1
+                    continue
+                rows.append(self.buildparams(tenant, subscriber, data, instance))
+            if batch_size > 1:
+                statements = [(self.batch_query, {"rows": rows})] if rows else []
+            else:
+                statements = [(self.query, params) for params in rows]
+        return rows, rejected, statements
+    def ingestchunk(self, tenant, subscriber, chunk, instance, batch_size, fingerprint=None, index=None):
+        started = time.perf_counter()
+        rows, rejected, statements = self.buildstatements(tenant, subscriber, chunk, instance, batch_size)
+        if statements:
+            self.writebatch(self.graphclient(), statements)
+        if fingerprint:
+            self.journal.commit(fingerprint, tenant, index, len(rows))
+        elapsed = time.perf_counter() - started
+        with self.metricslock:
+            worker = self.metrics.setdefault(
+                threading.current_thread().name,
+                {"chunks": 0, "rows": 0, "rejected": 0, "seconds": 0.0},
+            )
+            worker["chunks"] += 1
+            worker["rows"] += len(rows)
+            worker["rejected"] += rejected
+            worker["seconds"] += elapsed
+        return len(rows)
+    def chunks(self, userdata, size):
+        chunk = []
+        for data in userdata:
+            chunk.append(data)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    def ingesttenants(self, jobs, workers=None, batch_size=None):
+        workers = workers or self.workers
+        batch_size = batch_size or self.batch_size
+        chunk_size = batch_size if batch_size > 1 else self.batch_size
+        self.metrics = {}
+        self.seenemails = set()
+        started = time.perf_counter()
+        rows = 0
+        inflight = set()
+        resumed = 0
+        if workers > 1 and not self.ensureschema(self.graphclient()):
+            print("uniqueness constraints are missing, ingesting chunks one at a time to avoid duplicate nodes")
+            workers = 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ingest') as executor:
+            for job in jobs:
+                fingerprint = job.get('fingerprint')
+                size = chunk_size
+                committed = set()
+                if fingerprint:
+                    instance, size, committed, finished = self.journal.begin(
+                        fingerprint, job['tenant'], job['subscriber'], chunk_size, job.get('force', self.force)
+                    )
+                    if finished:
+                        print(f"tenant {job['tenant']}: this file was fully ingested at {finished}, set INGEST_FORCE=true to run it again")
+                    elif committed:
+                        print(f"resuming tenant {job['tenant']}: {len(committed)} chunk(s) already committed")
+                else:
+                    instance = str(uuid4())
+                for index, chunk in enumerate(self.chunks(job['userdata'], size)):
+                    if index in committed:
+                        resumed += len(chunk)
+                        continue
+                    if len(inflight) >= workers * 2:
+                        done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                        rows += sum(future.result() for future in done)
+                    inflight.add(executor.submit(
+                        self.ingestchunk, job['tenant'], job['subscriber'], chunk, instance,
+                        batch_size, fingerprint, index
+                    ))
+            rows += sum(future.result() for future in wait(inflight).done)
+        for job in jobs:
+            if job.get('fingerprint'):
+                self.journal.finish(job['fingerprint'], job['tenant'])
+        if resumed:
+            print(f"skipped {resumed} row(s) from previously committed chunks")
+        elapsed = time.perf_counter() - started
+        print(f"ingested {rows} users across {len(jobs)} tenant(s) with {workers} worker(s) in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.1f} rows/s)")
+        for name, worker in sorted(self.metrics.items()):
+            print(f"  {name}: {worker['chunks']} chunk(s), {worker['rows']} rows, {worker['rejected']} rejected, {worker['seconds']:.2f}s busy")
+        return rows
+    async def ingestasync(self, jobs, batch_size=None, queue_size=None, writers=None):
+        # read -> build params -> Neo4j, bounded queues give backpressure between stages
+        # the Graph client is synchronous, so each writer runs its batches on a thread with its own client
+        batch_size = batch_size or self.batch_size
+        chunk_size = batch_size if batch_size > 1 else self.batch_size
+        queue_size = queue_size or int(os.environ.get("INGEST_QUEUE_SIZE", "4"))
+        writers = writers or self.workers
+        if writers > 1 and not self.ensureschema(self.graphclient()):
+            print("uniqueness constraints are missing, writing chunks one at a time to avoid duplicate nodes")
+            writers = 1
+        self.seenemails = set()
+        chunksq = asyncio.Queue(maxsize=queue_size)
+        paramsq = asyncio.Queue(maxsize=queue_size)
+        stats = {"rows": 0, "rejected": 0, "read": 0.0, "build": 0.0, "neo4j": 0.0}
+        started = time.perf_counter()
+        async def read():
+            for job in jobs:
+                fingerprint = job.get('fingerprint')
+                size = chunk_size
+                committed = set()
+                if fingerprint:
+                    instance, size, committed, finished = self.journal.begin(
+                        fingerprint, job['tenant'], job['subscriber'], chunk_size, job.get('force', self.force)
+                    )
+                    if finished:
+                        print(f"tenant {job['tenant']}: this file was fully ingested at {finished}, set INGEST_FORCE=true to run it again")
+                else:
+                    instance = str(uuid4())
+                chunks = self.chunks(job['userdata'], size)
+                index = 0
+                while True:
+                    begin = time.perf_counter()
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    stats["read"] += time.perf_counter() - begin
+                    if chunk is None:
+                        break
+                    if index not in committed:
+                        await chunksq.put((job, instance, index, chunk))
+                    index += 1
+            await chunksq.put(None)
+        async def build():
+            while (item := await chunksq.get()) is not None:
+                job, instance, index, chunk = item
+                begin = time.perf_counter()
+                rows, rejected, statements = await asyncio.to_thread(
+                    self.buildstatements, job['tenant'], job['subscriber'], chunk, instance, batch_size
+                )
+                stats["build"] += time.perf_counter() - begin
+                stats["rejected"] += rejected
+                await paramsq.put((job, index, rows, statements))
+            for _ in range(writers):
+                await paramsq.put(None)
+        async def write():
+            while (item := await paramsq.get()) is not None:
+                job, index, rows, statements = item
+                begin = time.perf_counter()
+                if statements:
+                    await asyncio.to_thread(lambda: self.writebatch(self.graphclient(), statements))
+                stats["neo4j"] += time.perf_counter() - begin
+                # journal only after the write, so a crash replays the chunk instead of skipping it
+                if job.get('fingerprint'):
+                    self.journal.commit(job['fingerprint'], job['tenant'], index, len(rows))
+                stats["rows"] += len(rows)
+        await asyncio.gather(read(), build(), *(write() for _ in range(writers)))
+        for job in jobs:
+            if job.get('fingerprint'):
+                self.journal.finish(job['fingerprint'], job['tenant'])
+        elapsed = time.perf_counter() - started
+        print(f"ingested {stats['rows']} users across {len(jobs)} tenant(s) with {writers} writer(s) in {elapsed:.2f}s ({stats['rows'] / elapsed if elapsed else 0:.1f} rows/s), {stats['rejected']} rejected")
+        print(f"  stage time: read {stats['read']:.2f}s, build {stats['build']:.2f}s, neo4j {stats['neo4j']:.2f}s (summed over writers)")
+        return stats['rows']
+    def ingestuserdata(self, tenant, subscriber, userdata, batch_size=None, workers=None, fingerprint=None):
+        print("ingesting userdata...")
+        adminuser = []
+        # for data in userdata:
+        #     if data.get('isAdmin'):
+        #         self.createtenant(
+        #             firstname=data.get('Firstname'),
+        #             lastname=data.get('Lastname'),
+        #             email=data.get('User Email'),
+        #             vendor='microsoft',
+        #             environment=data.get('env')
+        #         )
+        self.ingesttenants(
+            [{"tenant": tenant, "subscriber": subscriber, "userdata": userdata, "fingerprint": fingerprint}],
+            workers=workers,
+            batch_size=batch_size,
+        )
+        return userdata
+    def tenanturl(self, environment):
+        if environment == 'IND':
+            return "https://platform.quilr.ai/bff/auth/auth/onboard"
+        return "https://app.quilr.ai/bff/auth/auth/onboard"
+    def createtenant(self, firstname, lastname, email, vendor, environment):
+        url = self.tenanturl(environment)
+        payload = {
+            "firstname": firstname,
+            "lastname": lastname,
+            "email": email,
+            "vendor": vendor
+        }
+        headers = {
+            'Content-Type': 'application/json'
+        }
+        response = requests.post(url, json=payload, headers=headers)
+        return response.content
+    def isadmin(self, data):
+        value = data.get('isAdmin')
+        if isinstance(value, str):
+            return value.strip().lower() in ('y', 'yes', 'true', '1')
+        return value is True or value == 1
+    def tenantsession(self, workers):
+        # one keep-alive session shared by all workers; the onboard POST is not idempotent, so only
+        # replay it when it never reached the server (connect errors) or was throttled (429)
+        retries = int(os.environ.get("TENANT_RETRIES", "3"))
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            other=0,
+            backoff_factor=1,
+            status_forcelist=(429,),
+            raise_on_status=False,
+            allowed_methods=frozenset(['POST']),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=workers, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.headers.update({'Content-Type': 'application/json'})
+        return session
+    def tenantids(self, body):
+        data = body.get('data') if isinstance(body, dict) and isinstance(body.get('data'), dict) else body
+        if not isinstance(data, dict):
+            return None, None
+        tenant = data.get('tenantId') or data.get('tenant_id') or data.get('tenant')
+        subscriber = data.get('subscriberId') or data.get('subscriber_id') or data.get('subscriber')
+        return tenant, subscriber
+    def createtenantentry(self, session, limiter, admin, environment):
+        email = admin.get('User Email')
+        entry = {
+            "email": email,
+            "firstname": admin.get('Firstname'),
+            "lastname": admin.get('Lastname'),
+            "vendor": admin.get('vendor') or 'microsoft',
+            "environment": environment,
+            "ok": False,
+            "status_code": None,
+            "tenant": None,
+            "subscriber": None,
+            "response": None,
+        }
+        limiter.wait(environment)
+        try:
+            response = session.post(
+                self.tenanturl(environment),
+                json={
+                    "firstname": entry["firstname"],
+                    "lastname": entry["lastname"],
+                    "email": email,
+                    "vendor": entry["vendor"],
+                },
+                timeout=float(os.environ.get("TENANT_TIMEOUT_SECONDS", "30")),
+            )
+        except requests.RequestException as e:
+            entry["response"] = str(e)
+            return entry
+        entry["status_code"] = response.status_code
+        entry["ok"] = response.status_code < 400
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        entry["response"] = body
+        entry["tenant"], entry["subscriber"] = self.tenantids(body)
+        return entry
+    def createtenants(self, admins, environment=None, manifest='tenant_manifest.json', workers=None):
+        workers = workers or int(os.environ.get("TENANT_WORKERS", "8"))
+        rates = {}
+        for item in os.environ.get("TENANT_RATE_LIMITS", "").split(','):
+            if '=' in item:
+                key, value = item.split('=', 1)
+                rates[key.strip()] = float(value)
+        limiter = ratelimiter(rates, float(os.environ.get("TENANT_RATE_PER_SECOND", "5")))
+        started = time.perf_counter()
+        with self.tenantsession(workers) as session:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tenant') as executor:
+                results = list(executor.map(
+                    lambda admin: self.createtenantentry(
+                        session, limiter, admin, admin.get('env') or environment
+                    ),
+                    admins,
+                ))
+        with open(manifest, 'w') as handle:
+            json.dump(results, handle, indent=2, default=str)
+        created = sum(1 for entry in results if entry["ok"])
+        print(f"created {created}/{len(results)} tenant(s) in {time.perf_counter() - started:.2f}s, manifest written to {manifest}")
+        return manifest
+    def recordtenant(self, data, lookup):
+        # the Tenant column names the tenant id or its admin's email; admins without it belong to their own row
+        column = os.environ.get("INGEST_TENANT_COLUMN", "Tenant")
+        value = str(data.get(column) or '').strip().lower()
+        if not value:
+            value = str(data.get('User Email') or '').strip().lower()
+        return lookup.get(value)
+    def spilledrecords(self, path):
+        try:
+            yield from self.readrecords(path)
+        finally:
+            os.remove(path)
+    def jobsfrommanifest(self, manifest, records, fingerprint=None):
+        # one ingestion job per created tenant, users assigned by their Tenant column
+        with open(manifest) as handle:
+            entries = json.load(handle)
+        created = {}
+        lookup = {}
+        for entry in entries:
+            if not entry.get("ok") or not entry.get("tenant") or not entry.get("subscriber"):
+                print(f"skipping {entry.get('email')}: tenant was not created or ids are missing")
+                continue
+            created.setdefault(entry["tenant"], entry)
+            lookup[str(entry["tenant"]).lower()] = entry["tenant"]
+            if entry.get("email"):
+                lookup[entry["email"].strip().lower()] = entry["tenant"]
+        # a single pass over the input, each tenant's users spilled to NDJSON and read back as its job runs
+        spill = tempfile.mkdtemp(prefix='ingest-')
+        paths = {}
+        handles = {}
+        unmatched = []
+        try:
+            for data in records():
+                tenant = self.recordtenant(data, lookup)
+                if tenant is None:
+                    unmatched.append(data.get('User Email'))
+                    continue
+                if tenant not in handles:
+                    paths[tenant] = os.path.join(spill, f"{len(paths)}.ndjson")
+                    handles[tenant] = open(paths[tenant], 'w', encoding='utf-8')
+                handles[tenant].write(json.dumps(data, default=str) + '\n')
+        finally:
+            for handle in handles.values():
+                handle.close()
+        if unmatched:
+            print(f"{len(unmatched)} user(s) match no created tenant: {', '.join(map(str, unmatched[:20]))}{' ...' if len(unmatched) > 20 else ''}")
+            if os.environ.get("INGEST_ALLOW_UNMATCHED", "false").lower() not in ("1", "true", "yes"):
+                shutil.rmtree(spill, ignore_errors=True)
+                raise ValueError("every user needs a Tenant column naming a created tenant id or admin email, set INGEST_ALLOW_UNMATCHED=true to ingest the rest anyway")
+        return [
+            {
+                "tenant": entry["tenant"],
+                "subscriber": entry["subscriber"],
+                "userdata": self.spilledrecords(paths[tenant]) if tenant in paths else [],
+                "fingerprint": fingerprint,
+            }
+            for tenant, entry in created.items()
+        ]
+    def createinternaluser(self, tenant, subscriber, email, firstname, lastname, password):
+        db = self.conn.getconn()
+        cursor = db.cursor()
+        role = cursor.execute("SELECT id FROM public.roles WHERE AND tenantId '%s'", tenant).fetchone()[0]
+        group = cursor.execute("SELECT id FROM public.group WHERE AND tenantId '%s'", tenant).fetchone()[0]
+        try:
+            cursor.execute('''
+INSERT INTO "public"."user" ("id", "firstname", "lastname", "username", "email", "password", "subscriberId", "tenantIds", "roleIds", "groupIds", "status", "verification_status", "accountType", "emailSent", "lastLogin") VALUES
+(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+''',(str(uuid4()), firstname, lastname, email, self.bcrypt_hash(password), subscriber, tenant, role, group, 'active', 'unverified',  'credentials', 'f'))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error inserting user: {e}")
+        finally:
+            cursor.close()
+            self.conn.putconn(db)
+if __name__ == '__main__':
+    env = input("Enter Environment [IND/USA]: ")
+    if env.upper() == 'IND':
+        load_dotenv(dotenv_path='.env_ind')
+    elif env.upper() == 'USA':
+        load_dotenv(dotenv_path='.env_us')
+    elif env.upper() == 'IND-PROD':
+        load_dotenv(dotenv_path='.env_ind_prod')
+    elif env.upper() == 'USA-PROD':
+        load_dotenv(dotenv_path='.env_us_prod')
+    else:
+        print("Invalid Environment")
+        exit(0)
+    client = userdata()
+    filelocation = input("Enter Customer Excel file location: ")
+    fingerprint = None
+    if filelocation is None or filelocation == '':
+        extensionuser = []
+        getudetails = True
+        while getudetails:
+            useremail = input("Enter User Email: ")
+            if useremail is None or useremail == '':
+                print("User Email is required")
+                continue
+            userfirstname = input("Enter User First Name: ")
+            userlastname = input("Enter User Last Name: ")
+            userdept = input('Enter User Department: ')
+            useradmin = input('Is User Admin [Y/N]: ').lower() == 'Y'.lower()
+            usertenant = '' if useradmin else input("Enter User's Tenant (tenant id or admin email, blank if none): ")
+            extensionuser.append({
+                'User Email': useremail,
+                'Firstname': userfirstname,
+                'Lastname': userlastname,
+                'Department': userdept,
+                'User Title': '',
+                'isAdmin': useradmin,
+                'Tenant': usertenant,
+                'env': env
+            })
+            moreuser = input('Add More User [Y/N]: ')
+            if moreuser.lower() == 'n':
+                getudetails = False
+    else:
+        extensionuser = client.readrecords(filelocation)
+        fingerprint = client.fingerprint(filelocation)
+    records = (lambda: client.readrecords(filelocation)) if filelocation else (lambda: extensionuser)
+    manifest = os.environ.get("TENANT_MANIFEST")
+    if not manifest and input('Create tenants for admin users first [Y/N]: ').lower() == 'y':
+        manifest = client.createtenants([data for data in records() if client.isadmin(data)], environment=env)
+    if manifest:
+        jobs = client.jobsfrommanifest(manifest, records, fingerprint)
+    else:
+        tenant = input("Enter Tenant ID: ")
+        subscriber = input("Enter Subscriber ID: ")
+        jobs = [{"tenant": tenant, "subscriber": subscriber, "userdata": extensionuser, "fingerprint": fingerprint}]
+    if os.environ.get("INGEST_ASYNC", "false").lower() in ("1", "true", "yes"):
+        asyncio.run(client.ingestasync(jobs))
+    else:
+        client.ingesttenants(jobs)
\ No newline at end of file